@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Worker pool that runs queued AI jobs for FitAI Backend
+"""
+
+import os
+import sys
+import time
+import signal
+import socket
+import importlib.util
+import multiprocessing
+from datetime import timedelta
+
+# Add the current directory to Python path
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BACKEND_DIR)
+
+# backend/app.py and the backend/app/ package share a name, and a plain
+# import picks the module, so app.services would not resolve. Load app.py
+# as the 'app' package, as benchmarks/seed_data.py does.
+if 'app' not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        'app', os.path.join(BACKEND_DIR, 'app.py'),
+        submodule_search_locations=[os.path.join(BACKEND_DIR, 'app')]
+    )
+    sys.modules['app'] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules['app'])
+
+from app import app, db
+from app.services.job_queue import claim_next_job, run_job, requeue_stale_jobs
+
+def worker_loop(worker_id, interactive_only, poll_interval, stop_event):
+    """Claim and run jobs until asked to stop"""
+    # Never share pooled connections inherited from the parent process
+    with app.app_context():
+        db.engine.dispose()
+        lane = 'interactive' if interactive_only else 'general'
+        print(f"👷 Worker {worker_id} started ({lane})")
+        
+        while not stop_event.is_set():
+            job = claim_next_job(worker_id, interactive_only=interactive_only)
+            if job is None:
+                stop_event.wait(poll_interval)
+                continue
+            
+            started = time.perf_counter()
+            job = run_job(job)
+            print(f"{'✅' if job.status == 'succeeded' else '⚠️ '} {job.kind} {job.id} "
+                  f"{job.status} in {time.perf_counter() - started:.2f}s")
+            db.session.remove()
+
+def drain(worker_id):
+    """Run queued jobs in this process until the queue is empty"""
+    processed = 0
+    with app.app_context():
+        while True:
+            job = claim_next_job(worker_id)
+            if job is None:
+                break
+            job = run_job(job)
+            processed += 1
+            print(f"{'✅' if job.status == 'succeeded' else '⚠️ '} {job.kind} {job.id} {job.status}")
+    print(f"📭 Queue empty after {processed} jobs")
+
+def run_pool(workers, interactive_workers, poll_interval, stale_after):
+    """Start the worker processes and supervise them"""
+    ctx = multiprocessing.get_context('spawn')
+    stop_event = ctx.Event()
+    host = f'{socket.gethostname()}-{os.getpid()}'
+    
+    def start(index):
+        # The first interactive_workers processes only take chat so it is never
+        # stuck behind a pool full of long plan generations
+        process = ctx.Process(
+            target=worker_loop,
+            args=(f'{host}-{index}', index < interactive_workers, poll_interval, stop_event),
+            daemon=True
+        )
+        process.start()
+        return process
+    
+    def shutdown(signum, frame):
+        raise KeyboardInterrupt
+    
+    signal.signal(signal.SIGTERM, shutdown)
+    processes = [start(i) for i in range(workers)]
+    print(f"🚀 Running {workers} AI workers ({interactive_workers} reserved for chat)")
+    
+    try:
+        while True:
+            with app.app_context():
+                requeued = requeue_stale_jobs(stale_after)
+            if requeued:
+                print(f"🔄 Requeued {requeued} stale jobs")
+            
+            for i, process in enumerate(processes):
+                if not process.is_alive():
+                    print(f"⚠️  Worker {i} exited, restarting")
+                    processes[i] = start(i)
+            time.sleep(5)
+    except KeyboardInterrupt:
+        print("🛑 Stopping AI workers...")
+        stop_event.set()
+        for process in processes:
+            process.join(timeout=30)
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='FitAI AI Job Workers')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('AI_WORKERS', '2')),
+                        help='Maximum number of AI calls running at once')
+    parser.add_argument('--interactive-workers', type=int, default=int(os.getenv('AI_INTERACTIVE_WORKERS', '1')),
+                        help='Workers reserved for chat jobs')
+    parser.add_argument('--poll-interval', type=float, default=0.5, help='Seconds to wait when the queue is empty')
+    parser.add_argument('--stale-after', type=int, default=60,
+                        help='Seconds without a heartbeat before a running job is requeued')
+    parser.add_argument('--drain', action='store_true', help='Run queued jobs in this process and exit')
+    
+    args = parser.parse_args()
+    
+    if args.drain:
+        drain(f'{socket.gethostname()}-{os.getpid()}-drain')
+        sys.exit(0)
+    
+    if args.interactive_workers >= args.workers:
+        parser.error('--interactive-workers must leave at least one general worker')
+    
+    run_pool(args.workers, args.interactive_workers, args.poll_interval,
+             timedelta(seconds=args.stale_after))
@@ -11,6 +11,8 @@ from dotenv import load_dotenv
 # Add current directory to Python path for imports
 sys.path.append(os.path.dirname(__file__))
 
+from db_profiles import get_profile_name, get_engine_options, configure_engine
+
 # Load environment variables
 load_dotenv()
 
@@ -21,11 +23,17 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///fitness_tracker.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['DB_ENGINE_PROFILE'] = get_profile_name()
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = get_engine_options(
+    app.config['SQLALCHEMY_DATABASE_URI'], app.config['DB_ENGINE_PROFILE']
+)
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'jwt-secret-string')
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=7)
 
 # Initialize extensions
 db = SQLAlchemy(app)
+with app.app_context():
+    configure_engine(db.engine, app.config['DB_ENGINE_PROFILE'])
 migrate = Migrate(app, db)
 jwt = JWTManager(app)
 CORS(app)
@@ -33,9 +41,10 @@ CORS(app)
 # Import models
 try:
     from app.models.user import User
-    from app.models.workout import Workout, Exercise, WorkoutSession
-    from app.models.meal import Meal, MealPlan, NutritionLog
+    from app.models.workout import Workout, Exercise, WorkoutSession, WorkoutPlan, WorkoutDay
+    from app.models.meal import Meal, MealPlan, NutritionLog, DailyNutritionRollup
     from app.models.progress import Progress, WeightProgress, BmiProgress
+    from app.models.job import AIJob
     print("✅ Models loaded successfully!")
 except ImportError as e:
     # If running from parent directory, models might not be available
@@ -50,6 +59,8 @@ try:
     from app.api.nutrition import nutrition_bp
     from app.api.progress import progress_bp
     from app.api.ai_simple import ai_bp
+    from app.api.jobs import jobs_bp
+    from app.services.nutrition_cache import NUTRITION_CACHE
     print("✅ API routes loaded successfully!")
 except ImportError as e:
     print(f"⚠️ Some API routes not available - running in minimal mode: {e}")
@@ -62,6 +73,8 @@ except ImportError as e:
     nutrition_bp = Blueprint('nutrition', __name__)
     progress_bp = Blueprint('progress', __name__)
     ai_bp = Blueprint('ai', __name__)
+    jobs_bp = Blueprint('jobs', __name__)
+    NUTRITION_CACHE = None
 
 # Register blueprints
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -71,6 +84,7 @@ app.register_blueprint(meal_bp, url_prefix='/api/meals')
 app.register_blueprint(nutrition_bp, url_prefix='/api/nutrition')
 app.register_blueprint(progress_bp, url_prefix='/api/progress')
 app.register_blueprint(ai_bp, url_prefix='/api/ai')
+app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
 
 # Error handlers
 @app.errorhandler(404)
@@ -99,7 +113,8 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'message': 'FitAI API is running',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'nutrition_cache': NUTRITION_CACHE.stats() if NUTRITION_CACHE else {'enabled': False}
     })
 
 # Root endpoint
@@ -1,24 +1,62 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.ai_service import AIService
+from app.services.job_queue import enqueue_job, job_accepted_response, QueueFullError
+from app.services.resilience import GEMINI_BREAKER
+import json
+import os
+import threading
 
 ai_bp = Blueprint('ai', __name__)
 ai_service = AIService()
 
+# Each open stream holds a server thread for the whole generation
+MAX_CHAT_STREAMS = int(os.getenv('AI_MAX_CHAT_STREAMS', '16'))
+_chat_stream_slots = threading.BoundedSemaphore(MAX_CHAT_STREAMS)
+
+def _sse(event, data):
+    """Format one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @ai_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint for AI service"""
     try:
-        if ai_service.model:
+        cache = ai_service.cache.stats() if ai_service.cache else {'enabled': False}
+        coalescing = ai_service.flights.stats()
+        breaker = GEMINI_BREAKER.snapshot()
+        if ai_service.cache:
+            breaker['processes'] = ai_service.cache.breaker_states()
+        breaker_open = breaker['state'] == 'open' or any(
+            process['state'] == 'open' for process in breaker.get('processes', [])
+        )
+        
+        if ai_service.model and breaker_open:
+            return jsonify({
+                'status': 'degraded',
+                'ai_service': 'circuit_open',
+                'message': 'Gemini is failing; serving default plans until the breaker resets',
+                'model': 'gemini-2.5-flash',
+                'circuit_breaker': breaker,
+                'cache': cache,
+                'coalescing': coalescing
+            }), 200
+        elif ai_service.model:
             return jsonify({
                 'status': 'healthy',
                 'ai_service': 'available',
-                'model': 'gemini-2.5-flash'
+                'model': 'gemini-2.5-flash',
+                'circuit_breaker': breaker,
+                'cache': cache,
+                'coalescing': coalescing
             }), 200
         else:
             return jsonify({
                 'status': 'degraded',
                 'ai_service': 'unavailable',
-                'message': 'AI model not initialized'
+                'message': 'AI model not initialized',
+                'cache': cache,
+                'coalescing': coalescing
             }), 200
     except Exception as e:
         return jsonify({
@@ -28,6 +66,7 @@ def health_check():
         }), 500
 
 @ai_bp.route('/chat', methods=['POST'])
+@jwt_required(optional=True)
 def chat_with_ai():
     """Chat with AI assistant"""
     try:
@@ -39,6 +78,11 @@ def chat_with_ai():
         message = data['message']
         context = data.get('context', 'fitness_nutrition_assistant')
         
+        # Clients that send `Prefer: respond-async` get a queued job instead of waiting
+        if 'respond-async' in request.headers.get('Prefer', ''):
+            job = enqueue_job('chat', {'message': message, 'context': context}, user_id=get_jwt_identity())
+            return jsonify(job_accepted_response(job)), 202
+        
         # Generate AI response
         response = ai_service.chat_with_ai(message, context)
         
@@ -47,10 +91,58 @@ def chat_with_ai():
             'status': 'success'
         }), 200
         
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@ai_bp.route('/chat/stream', methods=['POST'])
+@jwt_required(optional=True)
+def stream_chat_with_ai():
+    """Chat with AI assistant, streaming the reply as Server-Sent Events"""
+    try:
+        data = request.get_json()
+        
+        if not data or 'message' not in data:
+            return jsonify({'error': 'Message is required'}), 400
+        
+        if not _chat_stream_slots.acquire(blocking=False):
+            return jsonify({'error': 'Too many open chat streams, try again shortly'}), 503
+        
+        message = data['message']
+        context = data.get('context', 'fitness_nutrition_assistant')
+        # The generator runs after the request context is gone
+        logger = current_app.logger
+        
+        def generate():
+            # The server pulls one frame at a time, so Gemini is only read as
+            # fast as the client drains the socket
+            chunks = ai_service.stream_chat_with_ai(message, context)
+            sent = 0
+            try:
+                for text in chunks:
+                    sent += 1
+                    yield _sse('message', {'delta': text})
+                yield _sse('done', {'chunks': sent})
+            except GeneratorExit:
+                logger.debug('Chat stream closed by client after %d chunks', sent)
+                raise
+            finally:
+                chunks.close()
+        
+        response = Response(generate(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+        # Runs even if the client disconnects before the first frame
+        response.call_on_close(_chat_stream_slots.release)
+        return response
+        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @ai_bp.route('/workout-plan', methods=['POST'])
+@jwt_required(optional=True)
 def generate_workout():
     """Generate personalized workout plan"""
     try:
@@ -74,14 +166,17 @@ def generate_workout():
             'difficulty': data.get('difficulty', 'beginner')
         }
         
-        workout_plan = ai_service.generate_workout_plan(user_data)
+        job = enqueue_job('workout_plan', {'user_data': user_data}, user_id=get_jwt_identity())
         
-        return jsonify(workout_plan), 200
+        return jsonify(job_accepted_response(job)), 202
         
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @ai_bp.route('/meal-plan', methods=['POST'])
+@jwt_required(optional=True)
 def generate_meal_plan():
     """Generate personalized meal plan"""
     try:
@@ -101,14 +196,17 @@ def generate_meal_plan():
             'cooking_skill': data.get('cooking_skill', 'beginner')
         }
         
-        meal_plan = ai_service.generate_meal_plan(user_data)
+        job = enqueue_job('meal_plan', {'user_data': user_data}, user_id=get_jwt_identity())
         
-        return jsonify(meal_plan), 200
+        return jsonify(job_accepted_response(job)), 202
         
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @ai_bp.route('/nutrition-analysis', methods=['POST'])
+@jwt_required(optional=True)
 def analyze_nutrition():
     """Analyze nutrition data"""
     try:
@@ -133,9 +231,11 @@ def analyze_nutrition():
             'target_fat': data.get('target_fat', 67)
         }
         
-        analysis = ai_service.analyze_nutrition(nutrition_data)
+        job = enqueue_job('nutrition_analysis', {'nutrition_data': nutrition_data}, user_id=get_jwt_identity())
         
-        return jsonify(analysis), 200
+        return jsonify(job_accepted_response(job)), 202
         
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -3,8 +3,8 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 from werkzeug.security import generate_password_hash, check_password_hash
 from app.models.user import User, UserGoals, UserPreferences
 from app import db
+from app.utils.ids import new_id
 from datetime import datetime
-import uuid
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -26,7 +26,7 @@ def register():
         
         # Create new user
         user = User(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             email=data['email'],
             password_hash=generate_password_hash(data['password']),
             name=data['name'],
@@ -42,7 +42,7 @@ def register():
         
         # Create default goals
         goals = UserGoals(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=user.id,
             fitness_goal=data.get('fitness_goal', 'general_fitness'),
             target_weight=data.get('target_weight', data['weight']),
@@ -54,7 +54,7 @@ def register():
         
         # Create default preferences
         preferences = UserPreferences(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=user.id,
             dietary_preference=data.get('dietary_preference', 'balanced'),
             allergies=data.get('allergies', []),
@@ -0,0 +1,25 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.models.job import AIJob
+from app import db
+
+jobs_bp = Blueprint('jobs', __name__)
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+@jwt_required(optional=True)
+def get_job(job_id):
+    """Get the status and, once finished, the result of a queued AI job"""
+    try:
+        job = db.session.get(AIJob, job_id)
+        
+        # Jobs created by a signed-in user are only visible to that user
+        if not job or (job.user_id and job.user_id != get_jwt_identity()):
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'data': job.to_dict()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
\ No newline at end of file
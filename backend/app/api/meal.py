@@ -1,15 +1,18 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.meal import Meal, MealPlan, NutritionLog
+from app.models.meal import Meal, MealPlan, NutritionLog, DailyNutritionRollup
 from app.models.user import User
-from app.services.ai_service import AIService
+from app.services.job_queue import enqueue_job, job_accepted_response, QueueFullError
+from app.services.meal_optimizer import user_data_from_goals
+from app.services.nutrition_cache import NUTRITION_CACHE
+from app.utils.pagination import paginate_query, InvalidCursorError
+from app.utils.etag import not_modified, with_etag
+from app.utils.json_filters import json_array_contains, list_arg
 from app import db
+from app.utils.ids import new_id
 from datetime import datetime, date
-import uuid
-import json
 
 meal_bp = Blueprint('meal', __name__)
-ai_service = AIService()
 
 @meal_bp.route('/generate', methods=['POST'])
 @jwt_required()
@@ -17,84 +20,38 @@ def generate_meal_plan():
     """Generate AI-powered meal plan"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = User.query.options(*User.profile_options()).get(user_id)
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
         data = request.get_json()
+        # Saved goals supply the calorie and macro targets the request leaves out
+        targets = user_data_from_goals(user.goals)
         
         # Prepare user data for AI
         user_data = {
-            'target_calories': data.get('calorie_target', 2000),
+            'target_calories': data.get('calorie_target', targets.get('target_calories') or 2000),
+            'target_protein': data.get('protein_target', targets.get('target_protein')),
+            'target_carbs': data.get('carbs_target', targets.get('target_carbs')),
+            'target_fat': data.get('fat_target', targets.get('target_fat')),
             'dietary_preference': data.get('dietary_preferences', ['balanced']),
             'allergies': data.get('allergies', []),
             'meal_types': data.get('meals_per_day', 3),
             'days': data.get('days', 7),
             'cooking_time': data.get('cooking_time', '30 minutes'),
-            'cooking_skill': data.get('skill_level', 'beginner'),
-            'current_weight': user.weight,
-            'height': user.height,
-            'age': user.age,
-            'activity_level': user.activity_level
+            'cooking_skill': data.get('skill_level', 'beginner')
         }
+        if user.goals:
+            user_data.update(user.goals.body_stats())
         
-        # Generate meal plan using AI
-        ai_plan = ai_service.generate_meal_plan(user_data)
+        # Generation runs on the AI worker pool; poll the job for the saved plan
+        job = enqueue_job('meal_plan', {'user_data': user_data, 'persist': True}, user_id=user_id)
         
-        # Create meal plan in database
-        meal_plan = MealPlan(
-            id=str(uuid.uuid4()),
-            name=ai_plan.get('plan_name', 'AI Generated Meal Plan'),
-            description=ai_plan.get('description', ''),
-            user_id=user_id,
-            target_calories=ai_plan.get('target_calories', 2000),
-            dietary_preference=ai_plan.get('dietary_preference', 'balanced'),
-            total_days=len(ai_plan.get('days', [])),
-            created_at=datetime.utcnow(),
-            is_active=True
-        )
-        
-        db.session.add(meal_plan)
-        db.session.flush()  # Get the ID
-        
-        # Create meals for each day
-        for day_data in ai_plan.get('days', []):
-            for meal_data in day_data.get('meals', []):
-                meal = Meal(
-                    id=str(uuid.uuid4()),
-                    plan_id=meal_plan.id,
-                    day_number=day_data.get('day_number', 1),
-                    meal_type=meal_data.get('meal_type', 'breakfast'),
-                    name=meal_data.get('name', ''),
-                    calories=meal_data.get('calories', 0),
-                    protein=meal_data.get('protein', 0),
-                    carbs=meal_data.get('carbs', 0),
-                    fat=meal_data.get('fat', 0),
-                    ingredients=json.dumps(meal_data.get('ingredients', [])),
-                    instructions=json.dumps(meal_data.get('instructions', [])),
-                    prep_time=meal_data.get('prep_time', 0),
-                    cook_time=meal_data.get('cook_time', 0),
-                    created_at=datetime.utcnow()
-                )
-                db.session.add(meal)
-        
-        db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'message': 'Meal plan generated successfully',
-            'data': {
-                'plan_id': meal_plan.id,
-                'plan_name': meal_plan.name,
-                'description': meal_plan.description,
-                'target_calories': meal_plan.target_calories,
-                'dietary_preference': meal_plan.dietary_preference,
-                'total_days': meal_plan.total_days,
-                'ai_plan': ai_plan
-            }
-        }), 201
+        return jsonify(job_accepted_response(job)), 202
         
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -105,15 +62,14 @@ def get_meal_plans():
     """Get user's meal plans"""
     try:
         user_id = get_jwt_identity()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         
-        meal_plans = MealPlan.query.filter_by(user_id=user_id)\
-            .order_by(MealPlan.created_at.desc())\
-            .paginate(page=page, per_page=per_page, error_out=False)
+        meal_plans, pagination = paginate_query(
+            MealPlan.query.filter_by(user_id=user_id),
+            MealPlan, 'created_at', request.args
+        )
         
         plan_list = []
-        for plan in meal_plans.items:
+        for plan in meal_plans:
             plan_list.append({
                 'id': plan.id,
                 'name': plan.name,
@@ -129,17 +85,47 @@ def get_meal_plans():
             'success': True,
             'data': {
                 'meal_plans': plan_list,
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': meal_plans.total,
-                    'pages': meal_plans.pages,
-                    'has_next': meal_plans.has_next,
-                    'has_prev': meal_plans.has_prev
-                }
+                'pagination': pagination
             }
         }), 200
         
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@meal_bp.route('/library', methods=['GET'])
+@jwt_required()
+def get_meal_library():
+    """Get catalog meals and the user's custom meals, filtered by type, tags and allergens"""
+    try:
+        user_id = get_jwt_identity()
+        
+        query = Meal.query.filter(
+            Meal.plan_id.is_(None),
+            db.or_(Meal.is_custom.is_(False), Meal.is_custom.is_(None), Meal.created_by == user_id)
+        )
+        meal_type = request.args.get('type')
+        if meal_type:
+            query = query.filter(Meal.type == meal_type.lower())
+        # Tag and allergen predicates run in the database, not over decoded rows
+        for tag in list_arg(request.args, 'tags'):
+            query = query.filter(json_array_contains(Meal.dietary_tags, tag))
+        for allergen in list_arg(request.args, 'exclude_allergens'):
+            query = query.filter(~json_array_contains(Meal.allergens, allergen))
+        
+        meals, pagination = paginate_query(query, Meal, 'created_at', request.args)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'meals': [meal.to_dict() for meal in meals],
+                'pagination': pagination
+            }
+        }), 200
+    
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -149,6 +135,11 @@ def get_meal_plan(plan_id):
     """Get specific meal plan"""
     try:
         user_id = get_jwt_identity()
+        # The meals are part of the representation, so their edits must change the ETag too
+        cached = not_modified('meal_plan', MealPlan, child_key=Meal.plan_id, id=plan_id, user_id=user_id)
+        if cached:
+            return cached
+        
         plan = MealPlan.query.filter_by(id=plan_id, user_id=user_id).first()
         
         if not plan:
@@ -168,14 +159,14 @@ def get_meal_plan(plan_id):
                 'protein': meal.protein,
                 'carbs': meal.carbs,
                 'fat': meal.fat,
-                'ingredients': json.loads(meal.ingredients) if meal.ingredients else [],
-                'instructions': json.loads(meal.instructions) if meal.instructions else [],
+                'ingredients': meal.get_ingredients(),
+                'instructions': meal.get_instructions(),
                 'prep_time': meal.prep_time,
                 'cook_time': meal.cook_time,
                 'created_at': meal.created_at.isoformat()
             })
         
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
             'data': {
                 'id': plan.id,
@@ -188,7 +179,7 @@ def get_meal_plan(plan_id):
                 'created_at': plan.created_at.isoformat(),
                 'meals': meals_data
             }
-        }), 200
+        }), 'meal_plan', plan, children=meals), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -208,7 +199,7 @@ def log_meal(meal_id):
         
         # Create nutrition log entry
         nutrition_log = NutritionLog(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=user_id,
             meal_id=meal_id,
             consumed_at=datetime.fromisoformat(data.get('consumed_at', datetime.utcnow().isoformat())),
@@ -222,7 +213,16 @@ def log_meal(meal_id):
         )
         
         db.session.add(nutrition_log)
+        DailyNutritionRollup.record(
+            user_id,
+            nutrition_log.consumed_at.date(),
+            nutrition_log.calories,
+            nutrition_log.protein,
+            nutrition_log.carbs,
+            nutrition_log.fat
+        )
         db.session.commit()
+        NUTRITION_CACHE.invalidate_days(user_id, nutrition_log.consumed_at.date())
         
         return jsonify({
             'success': True,
@@ -249,8 +249,6 @@ def get_nutrition_logs():
     try:
         user_id = get_jwt_identity()
         date_filter = request.args.get('date')
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         
         query = NutritionLog.query.filter_by(user_id=user_id)
         
@@ -259,11 +257,10 @@ def get_nutrition_logs():
             query = query.filter(NutritionLog.consumed_at >= filter_date)\
                         .filter(NutritionLog.consumed_at < filter_date.replace(day=filter_date.day + 1))
         
-        logs = query.order_by(NutritionLog.consumed_at.desc())\
-            .paginate(page=page, per_page=per_page, error_out=False)
+        logs, pagination = paginate_query(query, NutritionLog, 'consumed_at', request.args)
         
         log_list = []
-        for log in logs.items:
+        for log in logs:
             log_list.append({
                 'id': log.id,
                 'meal_id': log.meal_id,
@@ -281,16 +278,11 @@ def get_nutrition_logs():
             'success': True,
             'data': {
                 'logs': log_list,
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': logs.total,
-                    'pages': logs.pages,
-                    'has_next': logs.has_next,
-                    'has_prev': logs.has_prev
-                }
+                'pagination': pagination
             }
         }), 200
         
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -1,15 +1,71 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.meal import NutritionLog
-from app.models.user import User
+from app.models.meal import NutritionLog, DailyNutritionRollup
+from app.models.user import User, UserGoals
 from app.services.ai_service import AIService
+from app.services.nutrition_cache import NUTRITION_CACHE
 from app import db
+from app.utils.ids import new_id
 from datetime import datetime, date, timedelta
-import uuid
+from sqlalchemy import func, select
 
 nutrition_bp = Blueprint('nutrition', __name__)
 ai_service = AIService()
 
+# Upper bound on entries accepted by a single batch request
+MAX_BATCH_SIZE = 500
+
+def _get_daily_totals(user_id, filter_date):
+    """Read the day's calorie and macro totals from the rollup row"""
+    rollup = DailyNutritionRollup.query.get((user_id, filter_date))
+    
+    if not rollup:
+        return {'calories': 0, 'protein': 0, 'carbs': 0, 'fat': 0, 'entries': 0}
+    
+    return {
+        'calories': rollup.calories,
+        'protein': rollup.protein,
+        'carbs': rollup.carbs,
+        'fat': rollup.fat,
+        'entries': rollup.entry_count
+    }
+
+def _get_daily_targets(user_id):
+    """Daily calorie and macro targets from the user's goals"""
+    goals = UserGoals.query.filter_by(user_id=user_id).first()
+    target_calories = (goals.target_calories if goals else None) or 2000
+    
+    # Macros the goals leave unset take 25/45/30% of the calories
+    return {
+        'calories': target_calories,
+        'protein': (goals.target_protein if goals else None) or target_calories * 0.25 / 4,
+        'carbs': (goals.target_carbs if goals else None) or target_calories * 0.45 / 4,
+        'fat': (goals.target_fat if goals else None) or target_calories * 0.30 / 9
+    }
+
+def _get_summary_versions(user_id, filter_date):
+    """Versions of the day's rollup row and of the goals, in one round trip
+    
+    Every write to either changes them, whichever process makes it, so the
+    summary cache only serves entries built from the rows as they are now.
+    Read them before loading, so a write in between costs a miss, not a
+    stale hit.
+    """
+    if not NUTRITION_CACHE.enabled:
+        return None, None
+    day = (DailyNutritionRollup.user_id == user_id, DailyNutritionRollup.date == filter_date)
+    rollup_updated_at, entry_count, goals_updated_at = db.session.execute(select(
+        select(DailyNutritionRollup.updated_at).where(*day).scalar_subquery(),
+        select(DailyNutritionRollup.entry_count).where(*day).scalar_subquery(),
+        select(func.max(UserGoals.updated_at)).where(UserGoals.user_id == user_id).scalar_subquery()
+    )).one()
+    return (rollup_updated_at, entry_count), goals_updated_at
+
+def _get_cached_totals(user_id, filter_date, version):
+    """The day's totals through the per-user summary cache"""
+    return NUTRITION_CACHE.daily_totals(user_id, filter_date, lambda: _get_daily_totals(user_id, filter_date),
+                                        version)
+
 @nutrition_bp.route('/daily', methods=['GET'])
 @jwt_required()
 def get_daily_nutrition():
@@ -17,6 +73,7 @@ def get_daily_nutrition():
     try:
         user_id = get_jwt_identity()
         target_date = request.args.get('date')
+        include_meals = request.args.get('include_meals', 'true').lower() != 'false'
         
         if target_date:
             filter_date = datetime.fromisoformat(target_date).date()
@@ -27,63 +84,49 @@ def get_daily_nutrition():
         start_datetime = datetime.combine(filter_date, datetime.min.time())
         end_datetime = start_datetime + timedelta(days=1)
         
-        logs = NutritionLog.query.filter(
-            NutritionLog.user_id == user_id,
-            NutritionLog.consumed_at >= start_datetime,
-            NutritionLog.consumed_at < end_datetime
-        ).all()
+        # Read the maintained daily rollup, and the goals, through the summary cache
+        totals_version, targets_version = _get_summary_versions(user_id, filter_date)
+        totals = _get_cached_totals(user_id, filter_date, totals_version)
+        targets = NUTRITION_CACHE.targets(user_id, lambda: _get_daily_targets(user_id), targets_version)
         
-        # Calculate totals
-        total_calories = sum(log.calories for log in logs)
-        total_protein = sum(log.protein for log in logs)
-        total_carbs = sum(log.carbs for log in logs)
-        total_fat = sum(log.fat for log in logs)
+        summary = {
+            'date': filter_date.isoformat(),
+            'nutrition': {
+                nutrient: {
+                    'consumed': totals[nutrient],
+                    'target': targets[nutrient],
+                    'remaining': max(0, targets[nutrient] - totals[nutrient])
+                }
+                for nutrient in ('calories', 'protein', 'carbs', 'fat')
+            }
+        }
         
-        # Get user goals for comparison
-        user = User.query.get(user_id)
-        target_calories = 2000  # Default, should come from user goals
+        # Only hydrate the individual log rows when the client asks for them
+        if include_meals:
+            logs = NutritionLog.query.filter(
+                NutritionLog.user_id == user_id,
+                NutritionLog.consumed_at >= start_datetime,
+                NutritionLog.consumed_at < end_datetime
+            ).order_by(NutritionLog.consumed_at).all()
+            
+            summary['meals'] = [
+                {
+                    'id': log.id,
+                    'meal_id': log.meal_id,
+                    'consumed_at': log.consumed_at.isoformat(),
+                    'serving_size': log.serving_size,
+                    'calories': log.calories,
+                    'protein': log.protein,
+                    'carbs': log.carbs,
+                    'fat': log.fat,
+                    'notes': log.notes
+                }
+                for log in logs
+            ]
         
         return jsonify({
             'success': True,
-            'data': {
-                'date': filter_date.isoformat(),
-                'nutrition': {
-                    'calories': {
-                        'consumed': total_calories,
-                        'target': target_calories,
-                        'remaining': max(0, target_calories - total_calories)
-                    },
-                    'protein': {
-                        'consumed': total_protein,
-                        'target': target_calories * 0.25 / 4,  # 25% of calories from protein
-                        'remaining': max(0, (target_calories * 0.25 / 4) - total_protein)
-                    },
-                    'carbs': {
-                        'consumed': total_carbs,
-                        'target': target_calories * 0.45 / 4,  # 45% of calories from carbs
-                        'remaining': max(0, (target_calories * 0.45 / 4) - total_carbs)
-                    },
-                    'fat': {
-                        'consumed': total_fat,
-                        'target': target_calories * 0.30 / 9,  # 30% of calories from fat
-                        'remaining': max(0, (target_calories * 0.30 / 9) - total_fat)
-                    }
-                },
-                'meals': [
-                    {
-                        'id': log.id,
-                        'meal_id': log.meal_id,
-                        'consumed_at': log.consumed_at.isoformat(),
-                        'serving_size': log.serving_size,
-                        'calories': log.calories,
-                        'protein': log.protein,
-                        'carbs': log.carbs,
-                        'fat': log.fat,
-                        'notes': log.notes
-                    }
-                    for log in logs
-                ]
-            }
+            'data': summary
         }), 200
         
     except Exception as e:
@@ -105,7 +148,7 @@ def log_nutrition():
         
         # Create nutrition log entry
         nutrition_log = NutritionLog(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=user_id,
             meal_id=None,  # Custom entry
             consumed_at=datetime.fromisoformat(data.get('consumed_at', datetime.utcnow().isoformat())),
@@ -119,7 +162,16 @@ def log_nutrition():
         )
         
         db.session.add(nutrition_log)
+        DailyNutritionRollup.record(
+            user_id,
+            nutrition_log.consumed_at.date(),
+            nutrition_log.calories,
+            nutrition_log.protein,
+            nutrition_log.carbs,
+            nutrition_log.fat
+        )
         db.session.commit()
+        NUTRITION_CACHE.invalidate_days(user_id, nutrition_log.consumed_at.date())
         
         return jsonify({
             'success': True,
@@ -133,6 +185,115 @@ def log_nutrition():
                 'consumed_at': nutrition_log.consumed_at.isoformat()
             }
         }), 201
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def _validate_log_entry(entry):
+    """Return the validation errors for one nutrition log entry"""
+    if not isinstance(entry, dict):
+        return ['Entry must be an object']
+    
+    errors = []
+    for field in ['calories', 'protein', 'carbs', 'fat']:
+        if field not in entry:
+            errors.append(f'{field} is required')
+        elif not isinstance(entry[field], (int, float)) or isinstance(entry[field], bool) or entry[field] < 0:
+            errors.append(f'{field} must be a non-negative number')
+    
+    serving_size = entry.get('serving_size', 1.0)
+    if not isinstance(serving_size, (int, float)) or isinstance(serving_size, bool) or serving_size <= 0:
+        errors.append('serving_size must be a positive number')
+    
+    if 'consumed_at' in entry:
+        try:
+            datetime.fromisoformat(entry['consumed_at'])
+        except (TypeError, ValueError):
+            errors.append('consumed_at must be an ISO 8601 datetime')
+    
+    return errors
+
+@nutrition_bp.route('/log/batch', methods=['POST'])
+@jwt_required()
+def log_nutrition_batch():
+    """Log several custom nutrition entries in one transaction"""
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json()
+        entries = data.get('entries') if isinstance(data, dict) else data
+        
+        if not isinstance(entries, list) or not entries:
+            return jsonify({'error': 'entries must be a non-empty list'}), 400
+        if len(entries) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} entries per batch'}), 400
+        
+        # Validate everything before writing anything
+        invalid = []
+        for index, entry in enumerate(entries):
+            errors = _validate_log_entry(entry)
+            if errors:
+                invalid.append({'index': index, 'success': False, 'errors': errors})
+        
+        if invalid:
+            return jsonify({
+                'error': 'Some entries are invalid; nothing was logged',
+                'results': invalid
+            }), 400
+        
+        now = datetime.utcnow()
+        rows = []
+        daily_totals = {}
+        for entry in entries:
+            consumed_at = datetime.fromisoformat(entry['consumed_at']) if 'consumed_at' in entry else now
+            rows.append({
+                'id': new_id(),
+                'user_id': user_id,
+                'meal_id': None,  # Custom entry
+                'meal_name': entry.get('meal_name', 'Custom entry'),
+                'meal_type': entry.get('meal_type', 'snack'),
+                'quantity': entry.get('serving_size', 1.0),
+                'unit': entry.get('unit', 'serving'),
+                'calories': entry['calories'],
+                'protein': entry['protein'],
+                'carbs': entry['carbs'],
+                'fat': entry['fat'],
+                'logged_at': consumed_at,
+                'notes': entry.get('notes', ''),
+                'created_at': now,
+                'updated_at': now
+            })
+            
+            totals = daily_totals.setdefault(consumed_at.date(), [0, 0, 0, 0, 0])
+            totals[0] += entry['calories']
+            totals[1] += entry['protein']
+            totals[2] += entry['carbs']
+            totals[3] += entry['fat']
+            totals[4] += 1
+        
+        # One executemany for the logs and one rollup upsert per day touched
+        db.session.execute(NutritionLog.__table__.insert(), rows)
+        for day, (calories, protein, carbs, fat, count) in daily_totals.items():
+            DailyNutritionRollup.record(user_id, day, calories, protein, carbs, fat, entries=count)
+        db.session.commit()
+        NUTRITION_CACHE.invalidate_days(user_id, *daily_totals)
+        
+        return jsonify({
+            'success': True,
+            'message': f'{len(rows)} nutrition entries logged successfully',
+            'data': {
+                'logged': len(rows),
+                'results': [
+                    {
+                        'index': index,
+                        'success': True,
+                        'log_id': row['id'],
+                        'consumed_at': row['logged_at'].isoformat()
+                    }
+                    for index, row in enumerate(rows)
+                ]
+            }
+        }), 201
         
     except Exception as e:
         db.session.rollback()
@@ -151,21 +312,13 @@ def get_macro_breakdown():
         else:
             filter_date = date.today()
         
-        # Get nutrition logs for the date
-        start_datetime = datetime.combine(filter_date, datetime.min.time())
-        end_datetime = start_datetime + timedelta(days=1)
-        
-        logs = NutritionLog.query.filter(
-            NutritionLog.user_id == user_id,
-            NutritionLog.consumed_at >= start_datetime,
-            NutritionLog.consumed_at < end_datetime
-        ).all()
-        
-        # Calculate macro breakdown
-        total_calories = sum(log.calories for log in logs)
-        total_protein = sum(log.protein for log in logs)
-        total_carbs = sum(log.carbs for log in logs)
-        total_fat = sum(log.fat for log in logs)
+        # Calculate macro breakdown from the daily rollup
+        totals_version, _ = _get_summary_versions(user_id, filter_date)
+        totals = _get_cached_totals(user_id, filter_date, totals_version)
+        total_calories = totals['calories']
+        total_protein = totals['protein']
+        total_carbs = totals['carbs']
+        total_fat = totals['fat']
         
         # Calculate percentages
         protein_calories = total_protein * 4
@@ -1,12 +1,20 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.progress import Progress, WeightProgress, BmiProgress, CalorieProgress
+from app.models.meal import DailyNutritionRollup
 from app import db
+from app.utils.ids import new_id
+from app.utils.serializer import FieldPlan, json_response
 from datetime import datetime, date, timedelta
-import uuid
 
 progress_bp = Blueprint('progress', __name__)
 
+# Same fields as each model's to_dict, read as column tuples and encoded in one pass
+WEIGHT_PROGRESS = FieldPlan(WeightProgress)
+BMI_PROGRESS = FieldPlan(BmiProgress)
+CALORIE_PROGRESS = FieldPlan(CalorieProgress, computed=('calories_progress', 'remaining_calories'))
+NUTRITION_PROGRESS = FieldPlan(DailyNutritionRollup)
+
 @progress_bp.route('/weight', methods=['GET'])
 @jwt_required()
 def get_weight_progress():
@@ -23,10 +31,8 @@ def get_weight_progress():
         if end_date:
             query = query.filter(WeightProgress.date <= datetime.strptime(end_date, '%Y-%m-%d').date())
         
-        progress = query.order_by(WeightProgress.date.desc()).all()
-        
-        return jsonify({
-            'weight_progress': [p.to_dict() for p in progress]
+        return json_response({
+            'weight_progress': WEIGHT_PROGRESS.rows(query.order_by(WeightProgress.date.desc()))
         }), 200
         
     except Exception as e:
@@ -45,7 +51,7 @@ def log_weight():
         
         # Create weight progress entry
         weight_progress = WeightProgress(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             user_id=user_id,
             date=datetime.strptime(data.get('date', date.today().isoformat()), '%Y-%m-%d').date(),
             weight=data['weight'],
@@ -57,9 +63,9 @@ def log_weight():
         db.session.add(weight_progress)
         db.session.commit()
         
-        return jsonify({
+        return json_response({
             'message': 'Weight logged successfully',
-            'weight_progress': weight_progress.to_dict()
+            'weight_progress': WEIGHT_PROGRESS.dump(weight_progress)
         }), 200
         
     except Exception as e:
@@ -82,10 +88,8 @@ def get_bmi_progress():
         if end_date:
             query = query.filter(BmiProgress.date <= datetime.strptime(end_date, '%Y-%m-%d').date())
         
-        progress = query.order_by(BmiProgress.date.desc()).all()
-        
-        return jsonify({
-            'bmi_progress': [p.to_dict() for p in progress]
+        return json_response({
+            'bmi_progress': BMI_PROGRESS.rows(query.order_by(BmiProgress.date.desc()))
         }), 200
         
     except Exception as e:
@@ -107,11 +111,32 @@ def get_calorie_progress():
         if end_date:
             query = query.filter(CalorieProgress.date <= datetime.strptime(end_date, '%Y-%m-%d').date())
         
-        progress = query.order_by(CalorieProgress.date.desc()).all()
-        
-        return jsonify({
-            'calorie_progress': [p.to_dict() for p in progress]
+        return json_response({
+            'calorie_progress': CALORIE_PROGRESS.rows(query.order_by(CalorieProgress.date.desc()))
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@progress_bp.route('/nutrition', methods=['GET'])
+@jwt_required()
+def get_nutrition_progress():
+    """Get daily nutrition totals from the rollup table"""
+    try:
+        user_id = get_jwt_identity()
+        start_date = request.args.get('start_date')
+        end_date = request.args.get('end_date')
+        
+        query = DailyNutritionRollup.query.filter(DailyNutritionRollup.user_id == user_id)
+        
+        if start_date:
+            query = query.filter(DailyNutritionRollup.date >= datetime.strptime(start_date, '%Y-%m-%d').date())
+        if end_date:
+            query = query.filter(DailyNutritionRollup.date <= datetime.strptime(end_date, '%Y-%m-%d').date())
+        
+        return json_response({
+            'nutrition_progress': NUTRITION_PROGRESS.rows(query.order_by(DailyNutritionRollup.date.desc()))
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
\ No newline at end of file
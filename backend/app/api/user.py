@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User, UserGoals, UserPreferences
+from app.services.nutrition_cache import NUTRITION_CACHE
+from app.utils.etag import not_modified, with_etag
 from app import db
 from datetime import datetime
 import uuid
@@ -13,12 +15,16 @@ def get_profile():
     """Get user profile"""
     try:
         user_id = get_jwt_identity()
+        cached = not_modified('profile', User, id=user_id)
+        if cached:
+            return cached
+        
         user = User.query.get(user_id)
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
             'data': {
                 'user_id': user.id,
@@ -32,7 +38,7 @@ def get_profile():
                 'created_at': user.created_at.isoformat(),
                 'updated_at': user.updated_at.isoformat() if user.updated_at else None
             }
-        }), 200
+        }), 'profile', user), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -91,12 +97,16 @@ def get_goals():
     """Get user goals"""
     try:
         user_id = get_jwt_identity()
+        cached = not_modified('goals', UserGoals, user_id=user_id)
+        if cached:
+            return cached
+        
         goals = UserGoals.query.filter_by(user_id=user_id).first()
         
         if not goals:
             return jsonify({'error': 'Goals not found'}), 404
         
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
             'data': {
                 'goals_id': goals.id,
@@ -108,7 +118,7 @@ def get_goals():
                 'created_at': goals.created_at.isoformat(),
                 'updated_at': goals.updated_at.isoformat() if goals.updated_at else None
             }
-        }), 200
+        }), 'goals', goals), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -137,9 +147,13 @@ def update_goals():
             goals.workout_frequency = data['workout_frequency']
         if 'preferred_workout_types' in data:
             goals.preferred_workout_types = data['preferred_workout_types']
+        for field in ('target_calories', 'target_protein', 'target_carbs', 'target_fat'):
+            if field in data:
+                setattr(goals, field, data[field])
         
         goals.updated_at = datetime.utcnow()
         db.session.commit()
+        NUTRITION_CACHE.invalidate_targets(user_id)
         
         return jsonify({
             'success': True,
@@ -151,6 +165,10 @@ def update_goals():
                 'target_date': goals.target_date.isoformat() if goals.target_date else None,
                 'workout_frequency': goals.workout_frequency,
                 'preferred_workout_types': goals.preferred_workout_types,
+                'target_calories': goals.target_calories,
+                'target_protein': goals.target_protein,
+                'target_carbs': goals.target_carbs,
+                'target_fat': goals.target_fat,
                 'updated_at': goals.updated_at.isoformat()
             }
         }), 200
@@ -165,12 +183,16 @@ def get_preferences():
     """Get user preferences"""
     try:
         user_id = get_jwt_identity()
+        cached = not_modified('preferences', UserPreferences, user_id=user_id)
+        if cached:
+            return cached
+        
         preferences = UserPreferences.query.filter_by(user_id=user_id).first()
         
         if not preferences:
             return jsonify({'error': 'Preferences not found'}), 404
         
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
             'data': {
                 'preferences_id': preferences.id,
@@ -180,7 +202,7 @@ def get_preferences():
                 'created_at': preferences.created_at.isoformat(),
                 'updated_at': preferences.updated_at.isoformat() if preferences.updated_at else None
             }
-        }), 200
+        }), 'preferences', preferences), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -2,14 +2,17 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.workout import Workout, Exercise, WorkoutSession, WorkoutPlan, WorkoutDay
 from app.models.user import User
-from app.services.ai_service import AIService
+from app.services.job_queue import enqueue_job, job_accepted_response, QueueFullError
+from app.services.workout_engine import user_data_from_preferences
+from app.utils.pagination import paginate_query, InvalidCursorError
+from app.utils.etag import not_modified, with_etag
+from app.utils.json_filters import json_array_contains, list_arg
 from app import db
+from app.utils.ids import new_id
+from sqlalchemy.orm import selectinload
 from datetime import datetime
-import uuid
-import json
 
 workout_bp = Blueprint('workout', __name__)
-ai_service = AIService()
 
 @workout_bp.route('/generate', methods=['POST'])
 @jwt_required()
@@ -17,74 +20,35 @@ def generate_workout_plan():
     """Generate AI-powered workout plan"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = User.query.options(*User.profile_options()).get(user_id)
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
         data = request.get_json()
+        # Saved preferences fill in whatever the request leaves out
+        preferences = user_data_from_preferences(user.preferences)
         
         # Prepare user data for AI
         user_data = {
             'fitness_goal': data.get('goal', 'general_fitness'),
-            'difficulty': data.get('difficulty', 'beginner'),
-            'duration': data.get('duration', 30),
-            'equipment': data.get('equipment', []),
+            'difficulty': data.get('difficulty', preferences.get('difficulty') or 'beginner'),
+            'duration': data.get('duration', preferences.get('workout_duration') or 30),
+            'equipment': data.get('equipment', preferences.get('available_equipment', [])),
+            'workout_types': data.get('workout_types', preferences.get('workout_types', [])),
             'body_parts': data.get('body_parts', []),
-            'days_per_week': data.get('days_per_week', 3),
-            'current_weight': user.weight,
-            'height': user.height,
-            'age': user.age,
-            'activity_level': user.activity_level
+            'days_per_week': data.get('days_per_week', 3)
         }
+        if user.goals:
+            user_data.update(user.goals.body_stats())
         
-        # Generate workout plan using AI
-        ai_plan = ai_service.generate_workout_plan(user_data)
+        # Generation runs on the AI worker pool; poll the job for the saved plan
+        job = enqueue_job('workout_plan', {'user_data': user_data, 'persist': True}, user_id=user_id)
         
-        # Create workout plan in database
-        workout_plan = WorkoutPlan(
-            id=str(uuid.uuid4()),
-            name=ai_plan.get('plan_name', 'AI Generated Workout Plan'),
-            description=ai_plan.get('description', ''),
-            user_id=user_id,
-            total_weeks=ai_plan.get('total_weeks', 4),
-            difficulty=ai_plan.get('difficulty', 'beginner'),
-            created_at=datetime.utcnow(),
-            is_active=True
-        )
-        
-        db.session.add(workout_plan)
-        db.session.flush()  # Get the ID
-        
-        # Create workout days
-        for week_data in ai_plan.get('weeks', []):
-            for day_data in week_data.get('days', []):
-                workout_day = WorkoutDay(
-                    id=str(uuid.uuid4()),
-                    plan_id=workout_plan.id,
-                    day_number=day_data.get('day_number', 1),
-                    name=day_data.get('day_name', 'Workout Day'),
-                    is_rest_day=day_data.get('workout_type', '').lower() == 'rest',
-                    notes=json.dumps(day_data.get('exercises', [])),
-                    created_at=datetime.utcnow()
-                )
-                db.session.add(workout_day)
-        
-        db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'message': 'Workout plan generated successfully',
-            'data': {
-                'plan_id': workout_plan.id,
-                'plan_name': workout_plan.name,
-                'description': workout_plan.description,
-                'total_weeks': workout_plan.total_weeks,
-                'difficulty': workout_plan.difficulty,
-                'ai_plan': ai_plan
-            }
-        }), 201
+        return jsonify(job_accepted_response(job)), 202
         
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -95,15 +59,14 @@ def get_workouts():
     """Get user's workout plans"""
     try:
         user_id = get_jwt_identity()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         
-        workouts = WorkoutPlan.query.filter_by(user_id=user_id)\
-            .order_by(WorkoutPlan.created_at.desc())\
-            .paginate(page=page, per_page=per_page, error_out=False)
+        workouts, pagination = paginate_query(
+            WorkoutPlan.query.filter_by(user_id=user_id),
+            WorkoutPlan, 'created_at', request.args
+        )
         
         workout_list = []
-        for workout in workouts.items:
+        for workout in workouts:
             workout_list.append({
                 'id': workout.id,
                 'name': workout.name,
@@ -118,17 +81,47 @@ def get_workouts():
             'success': True,
             'data': {
                 'workouts': workout_list,
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': workouts.total,
-                    'pages': workouts.pages,
-                    'has_next': workouts.has_next,
-                    'has_prev': workouts.has_prev
-                }
+                'pagination': pagination
             }
         }), 200
         
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@workout_bp.route('/library', methods=['GET'])
+@jwt_required()
+def get_workout_library():
+    """Get catalog workouts and the user's custom workouts, filtered by body parts and muscles"""
+    try:
+        user_id = get_jwt_identity()
+        include_exercises = request.args.get('include_exercises', 'true').lower() != 'false'
+        
+        query = Workout.query.filter(
+            db.or_(Workout.is_custom == False, Workout.created_by == user_id)
+        )
+        # Body part and muscle predicates run in the database, not over decoded rows
+        for body_part in list_arg(request.args, 'body_parts'):
+            query = query.filter(json_array_contains(Workout.body_parts, body_part))
+        for muscle in list_arg(request.args, 'muscles'):
+            query = query.filter(Workout.exercises.any(json_array_contains(Exercise.muscles, muscle)))
+        if include_exercises:
+            # One extra IN query for the whole page instead of one per workout
+            query = query.options(selectinload(Workout.exercises))
+        
+        workouts, pagination = paginate_query(query, Workout, 'created_at', request.args)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'workouts': [workout.to_dict(include_exercises=include_exercises) for workout in workouts],
+                'pagination': pagination
+            }
+        }), 200
+    
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -138,6 +131,12 @@ def get_workout(workout_id):
     """Get specific workout plan"""
     try:
         user_id = get_jwt_identity()
+        # The days are part of the representation, so their edits must change the ETag too
+        cached = not_modified('workout_plan', WorkoutPlan, child_key=WorkoutDay.plan_id,
+                              id=workout_id, user_id=user_id)
+        if cached:
+            return cached
+        
         workout = WorkoutPlan.query.filter_by(id=workout_id, user_id=user_id).first()
         
         if not workout:
@@ -153,11 +152,11 @@ def get_workout(workout_id):
                 'day_number': day.day_number,
                 'name': day.name,
                 'is_rest_day': day.is_rest_day,
-                'notes': json.loads(day.notes) if day.notes else [],
+                'notes': day.get_notes(),
                 'created_at': day.created_at.isoformat()
             })
         
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
             'data': {
                 'id': workout.id,
@@ -169,7 +168,7 @@ def get_workout(workout_id):
                 'created_at': workout.created_at.isoformat(),
                 'days': days_data
             }
-        }), 200
+        }), 'workout_plan', workout, children=days), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -184,7 +183,7 @@ def complete_workout(workout_id):
         
         # Create workout session
         session = WorkoutSession(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             workout_id=workout_id,
             user_id=user_id,
             start_time=datetime.fromisoformat(data.get('start_time', datetime.utcnow().isoformat())),
@@ -221,15 +220,14 @@ def get_workout_sessions():
     """Get user's workout sessions"""
     try:
         user_id = get_jwt_identity()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
         
-        sessions = WorkoutSession.query.filter_by(user_id=user_id)\
-            .order_by(WorkoutSession.created_at.desc())\
-            .paginate(page=page, per_page=per_page, error_out=False)
+        sessions, pagination = paginate_query(
+            WorkoutSession.query.filter_by(user_id=user_id),
+            WorkoutSession, 'created_at', request.args
+        )
         
         session_list = []
-        for session in sessions.items:
+        for session in sessions:
             session_list.append({
                 'id': session.id,
                 'workout_id': session.workout_id,
@@ -246,16 +244,11 @@ def get_workout_sessions():
             'success': True,
             'data': {
                 'sessions': session_list,
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': sessions.total,
-                    'pages': sessions.pages,
-                    'has_next': sessions.has_next,
-                    'has_prev': sessions.has_prev
-                }
+                'pagination': pagination
             }
         }), 200
         
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,66 @@
+from app import db
+from datetime import datetime
+import json
+
+class AIJob(db.Model):
+    __tablename__ = 'ai_jobs'
+    __table_args__ = (
+        db.Index('ix_ai_jobs_status_priority_created_at', 'status', 'priority', 'created_at'),
+        db.Index('ix_ai_jobs_user_id_created_at', 'user_id', 'created_at'),
+    )
+    
+    id = db.Column(db.String(50), primary_key=True)
+    user_id = db.Column(db.String(50), db.ForeignKey('users.id'))
+    kind = db.Column(db.String(50), nullable=False)  # chat, nutrition_analysis, workout_plan, meal_plan
+    priority = db.Column(db.Integer, nullable=False, default=0)  # lower runs first
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed
+    payload = db.Column(db.Text)  # JSON string of the call arguments
+    result = db.Column(db.Text)  # JSON string of the AI response
+    error = db.Column(db.Text)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    worker_id = db.Column(db.String(100))
+    run_after = db.Column(db.DateTime)  # a retried job is not claimed before this
+    heartbeat_at = db.Column(db.DateTime)  # renewed by the worker while the job runs
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def set_payload(self, payload):
+        """Set payload as JSON string"""
+        self.payload = json.dumps(payload)
+    
+    def get_payload(self):
+        """Get payload as dict"""
+        if self.payload:
+            return json.loads(self.payload)
+        return {}
+    
+    def set_result(self, result):
+        """Set result as JSON string"""
+        self.result = json.dumps(result)
+    
+    def get_result(self):
+        """Get result as dict"""
+        if self.result:
+            return json.loads(self.result)
+        return None
+    
+    def to_dict(self):
+        """Convert job to dictionary"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'priority': self.priority,
+            'status': self.status,
+            'result': self.get_result(),
+            'error': self.error,
+            'attempts': self.attempts,
+            'run_after': self.run_after.isoformat() if self.run_after else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+    
+    def __repr__(self):
+        return f'<AIJob {self.kind} {self.status}>'
@@ -0,0 +1,27 @@
+from sqlalchemy.types import Text, TypeDecorator
+import json
+
+class JSONText(TypeDecorator):
+    """JSON kept in a TEXT column
+    
+    The schema stays TEXT, so existing rows, raw SQL and migrations see
+    the same strings as before. Values are encoded on flush and decoded
+    once, when the row is loaded; an empty string reads as NULL, as the
+    old getters treated it. Wrap it in MutableList.as_mutable (like the
+    native JSON columns) so in-place edits mark the row dirty:
+    
+        ingredients = db.Column(MutableList.as_mutable(JSONText))
+    """
+    
+    impl = Text
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return json.dumps(value)
+    
+    def process_result_value(self, value, dialect):
+        if not value:
+            return None
+        return json.loads(value)
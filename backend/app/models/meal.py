@@ -1,9 +1,14 @@
 from app import db
 from datetime import datetime
-import json
+from app.models.json_text import JSONText
+from app.models.row_version import versioned
+from sqlalchemy.ext.mutable import MutableList
 
 class Meal(db.Model):
     __tablename__ = 'meals'
+    __table_args__ = (
+        db.Index('ix_meals_plan_id_day_number', 'plan_id', 'day_number'),
+    )
     
     id = db.Column(db.String(50), primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -17,60 +22,58 @@ class Meal(db.Model):
     fiber = db.Column(db.Integer, default=0)  # in grams
     sugar = db.Column(db.Integer, default=0)  # in grams
     sodium = db.Column(db.Integer, default=0)  # in mg
-    ingredients = db.Column(db.Text)  # JSON string of list
-    instructions = db.Column(db.Text)  # JSON string of list
+    ingredients = db.Column(MutableList.as_mutable(JSONText))  # list, stored as JSON text
+    instructions = db.Column(MutableList.as_mutable(JSONText))  # list, stored as JSON text
     prep_time = db.Column(db.Integer, nullable=False)  # in minutes
     cook_time = db.Column(db.Integer, nullable=False)  # in minutes
     servings = db.Column(db.Integer, default=1)
-    dietary_tags = db.Column(db.Text)  # JSON string of list
-    allergens = db.Column(db.Text)  # JSON string of list
+    # Native JSON so list endpoints can filter on them in SQL (json_each)
+    dietary_tags = db.Column(MutableList.as_mutable(db.JSON(none_as_null=True)))  # list of tags
+    allergens = db.Column(MutableList.as_mutable(db.JSON(none_as_null=True)))  # list of allergens
     is_custom = db.Column(db.Boolean, default=False)
     created_by = db.Column(db.String(50), db.ForeignKey('users.id'))
+    plan_id = db.Column(db.String(50), db.ForeignKey('meal_plans.id'))  # set for meals of a generated plan
+    day_number = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Name used by the meal plan API
+    meal_type = db.synonym('type')
+    
     # Relationships
     nutrition_logs = db.relationship('NutritionLog', backref='meal', lazy='dynamic')
     
     def set_ingredients(self, ingredients):
-        """Set ingredients as JSON string"""
-        self.ingredients = json.dumps(ingredients)
+        """Set ingredients"""
+        self.ingredients = list(ingredients)
     
     def get_ingredients(self):
         """Get ingredients as list"""
-        if self.ingredients:
-            return json.loads(self.ingredients)
-        return []
+        return self.ingredients if self.ingredients is not None else []
     
     def set_instructions(self, instructions):
-        """Set instructions as JSON string"""
-        self.instructions = json.dumps(instructions)
+        """Set instructions"""
+        self.instructions = list(instructions)
     
     def get_instructions(self):
         """Get instructions as list"""
-        if self.instructions:
-            return json.loads(self.instructions)
-        return []
+        return self.instructions if self.instructions is not None else []
     
     def set_dietary_tags(self, tags):
-        """Set dietary tags as JSON string"""
-        self.dietary_tags = json.dumps(tags)
+        """Set dietary tags"""
+        self.dietary_tags = list(tags)
     
     def get_dietary_tags(self):
         """Get dietary tags as list"""
-        if self.dietary_tags:
-            return json.loads(self.dietary_tags)
-        return []
+        return self.dietary_tags if self.dietary_tags is not None else []
     
     def set_allergens(self, allergens):
-        """Set allergens as JSON string"""
-        self.allergens = json.dumps(allergens)
+        """Set allergens"""
+        self.allergens = list(allergens)
     
     def get_allergens(self):
         """Get allergens as list"""
-        if self.allergens:
-            return json.loads(self.allergens)
-        return []
+        return self.allergens if self.allergens is not None else []
     
     @property
     def protein_percentage(self):
@@ -127,30 +130,34 @@ class Meal(db.Model):
     def __repr__(self):
         return f'<Meal {self.name}>'
 
+@versioned
 class MealPlan(db.Model):
     __tablename__ = 'meal_plans'
+    __table_args__ = (
+        db.Index('ix_meal_plans_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.String(50), primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     user_id = db.Column(db.String(50), db.ForeignKey('users.id'), nullable=False)
-    days_data = db.Column(db.Text)  # JSON string of days
+    days_data = db.Column(MutableList.as_mutable(JSONText))  # list of days, stored as JSON text
     total_days = db.Column(db.Integer, nullable=False)
     target_calories = db.Column(db.Integer, nullable=False)
     dietary_preference = db.Column(db.String(50), nullable=False)
     is_active = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped by every ORM update; part of the plan's ETag
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     def set_days_data(self, days_data):
-        """Set days data as JSON string"""
-        self.days_data = json.dumps(days_data)
+        """Set days data"""
+        self.days_data = list(days_data)
     
     def get_days_data(self):
         """Get days data as list"""
-        if self.days_data:
-            return json.loads(self.days_data)
-        return []
+        return self.days_data if self.days_data is not None else []
     
     def to_dict(self):
         """Convert plan to dictionary"""
@@ -173,14 +180,17 @@ class MealPlan(db.Model):
 
 class NutritionLog(db.Model):
     __tablename__ = 'nutrition_logs'
+    __table_args__ = (
+        db.Index('ix_nutrition_logs_user_id_logged_at_id', 'user_id', 'logged_at', 'id'),
+    )
     
     id = db.Column(db.String(50), primary_key=True)
     user_id = db.Column(db.String(50), db.ForeignKey('users.id'), nullable=False)
-    meal_id = db.Column(db.String(50), db.ForeignKey('meals.id'), nullable=False)
-    meal_name = db.Column(db.String(200), nullable=False)
-    meal_type = db.Column(db.String(50), nullable=False)
-    quantity = db.Column(db.Float, nullable=False)
-    unit = db.Column(db.String(20), nullable=False)  # grams, cups, pieces, etc.
+    meal_id = db.Column(db.String(50), db.ForeignKey('meals.id'))  # empty for custom entries
+    meal_name = db.Column(db.String(200), nullable=False, default='Custom entry')
+    meal_type = db.Column(db.String(50), nullable=False, default='snack')
+    quantity = db.Column(db.Float, nullable=False, default=1.0)
+    unit = db.Column(db.String(20), nullable=False, default='serving')  # grams, cups, pieces, etc.
     calories = db.Column(db.Integer, nullable=False)
     protein = db.Column(db.Integer, nullable=False)
     carbs = db.Column(db.Integer, nullable=False)
@@ -190,6 +200,10 @@ class NutritionLog(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Names used by the nutrition and meal APIs
+    consumed_at = db.synonym('logged_at')
+    serving_size = db.synonym('quantity')
+    
     def to_dict(self):
         """Convert log to dictionary"""
         return {
@@ -212,3 +226,81 @@ class NutritionLog(db.Model):
     
     def __repr__(self):
         return f'<NutritionLog {self.meal_name}>'
+
+class DailyNutritionRollup(db.Model):
+    __tablename__ = 'daily_nutrition_rollups'
+    
+    user_id = db.Column(db.String(50), db.ForeignKey('users.id'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    calories = db.Column(db.Float, nullable=False, default=0)
+    protein = db.Column(db.Float, nullable=False, default=0)  # in grams
+    carbs = db.Column(db.Float, nullable=False, default=0)  # in grams
+    fat = db.Column(db.Float, nullable=False, default=0)  # in grams
+    entry_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @classmethod
+    def record(cls, user_id, day, calories, protein, carbs, fat, entries=1):
+        """Add logged nutrition to the user's rollup row for the day
+        
+        Runs on the caller's session so the rollup commits (or rolls back)
+        together with the log rows that produced it.
+        """
+        table = cls.__table__
+        values = {
+            'user_id': user_id,
+            'date': day,
+            'calories': calories,
+            'protein': protein,
+            'carbs': carbs,
+            'fat': fat,
+            'entry_count': entries,
+            'updated_at': datetime.utcnow()
+        }
+        dialect = db.session.get_bind().dialect.name
+        
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            rollup = db.session.get(cls, (user_id, day), with_for_update=True)
+            if not rollup:
+                db.session.add(cls(**values))
+            else:
+                rollup.calories += calories
+                rollup.protein += protein
+                rollup.carbs += carbs
+                rollup.fat += fat
+                rollup.entry_count += entries
+            return
+        
+        stmt = insert(table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.date],
+            set_={
+                'calories': table.c.calories + stmt.excluded.calories,
+                'protein': table.c.protein + stmt.excluded.protein,
+                'carbs': table.c.carbs + stmt.excluded.carbs,
+                'fat': table.c.fat + stmt.excluded.fat,
+                'entry_count': table.c.entry_count + stmt.excluded.entry_count,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        db.session.execute(stmt)
+    
+    def to_dict(self):
+        """Convert rollup to dictionary"""
+        return {
+            'user_id': self.user_id,
+            'date': self.date.isoformat() if self.date else None,
+            'calories': self.calories,
+            'protein': self.protein,
+            'carbs': self.carbs,
+            'fat': self.fat,
+            'entry_count': self.entry_count,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+    
+    def __repr__(self):
+        return f'<DailyNutritionRollup {self.user_id} - {self.date}>'
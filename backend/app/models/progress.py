@@ -1,9 +1,13 @@
 from app import db
 from datetime import datetime, date
-import json
+from app.models.json_text import JSONText
+from sqlalchemy.ext.mutable import MutableList
 
 class Progress(db.Model):
     __tablename__ = 'progress'
+    __table_args__ = (
+        db.Index('ix_progress_user_id_date', 'user_id', 'date'),
+    )
     
     id = db.Column(db.String(50), primary_key=True)
     user_id = db.Column(db.String(50), db.ForeignKey('users.id'), nullable=False)
@@ -19,19 +23,17 @@ class Progress(db.Model):
     active_minutes = db.Column(db.Integer)
     heart_rate = db.Column(db.Integer)
     notes = db.Column(db.Text)
-    images = db.Column(db.Text)  # JSON string of list
+    images = db.Column(MutableList.as_mutable(JSONText))  # list, stored as JSON text
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def set_images(self, images):
-        """Set images as JSON string"""
-        self.images = json.dumps(images)
+        """Set images"""
+        self.images = list(images)
     
     def get_images(self):
         """Get images as list"""
-        if self.images:
-            return json.loads(self.images)
-        return []
+        return self.images if self.images is not None else []
     
     def to_dict(self):
         """Convert progress to dictionary"""
@@ -60,6 +62,9 @@ class Progress(db.Model):
 
 class WeightProgress(db.Model):
     __tablename__ = 'weight_progress'
+    __table_args__ = (
+        db.Index('ix_weight_progress_user_id_date', 'user_id', 'date'),
+    )
     
     id = db.Column(db.String(50), primary_key=True)
     user_id = db.Column(db.String(50), db.ForeignKey('users.id'), nullable=False)
@@ -88,6 +93,9 @@ class WeightProgress(db.Model):
 
 class BmiProgress(db.Model):
     __tablename__ = 'bmi_progress'
+    __table_args__ = (
+        db.Index('ix_bmi_progress_user_id_date', 'user_id', 'date'),
+    )
     
     id = db.Column(db.String(50), primary_key=True)
     user_id = db.Column(db.String(50), db.ForeignKey('users.id'), nullable=False)
@@ -134,6 +142,9 @@ class BmiProgress(db.Model):
 
 class CalorieProgress(db.Model):
     __tablename__ = 'calorie_progress'
+    __table_args__ = (
+        db.Index('ix_calorie_progress_user_id_date', 'user_id', 'date'),
+    )
     
     id = db.Column(db.String(50), primary_key=True)
     user_id = db.Column(db.String(50), db.ForeignKey('users.id'), nullable=False)
@@ -184,18 +195,16 @@ class WorkoutProgress(db.Model):
     total_workouts = db.Column(db.Integer, nullable=False)
     total_duration = db.Column(db.Integer, nullable=False)  # in minutes
     total_calories_burned = db.Column(db.Integer, nullable=False)
-    workout_types = db.Column(db.Text)  # JSON string of list
+    workout_types = db.Column(MutableList.as_mutable(JSONText))  # list, stored as JSON text
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def set_workout_types(self, types):
-        """Set workout types as JSON string"""
-        self.workout_types = json.dumps(types)
+        """Set workout types"""
+        self.workout_types = list(types)
     
     def get_workout_types(self):
         """Get workout types as list"""
-        if self.workout_types:
-            return json.loads(self.workout_types)
-        return []
+        return self.workout_types if self.workout_types is not None else []
     
     @property
     def completion_rate(self):
@@ -0,0 +1,20 @@
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+
+def versioned(model):
+    """Class decorator: increment model.version in the UPDATE of every ORM change
+    
+    The version only feeds ETags. Unlike SQLAlchemy's version_id_col the
+    UPDATE is not made conditional on the old version, so concurrent
+    writes behave as before (last writer wins) instead of raising
+    StaleDataError. The increment is done in SQL, so two concurrent
+    writes still produce two new versions.
+    """
+    
+    @event.listens_for(model, 'before_update')
+    def bump_version(mapper, connection, target):
+        session = object_session(target)
+        if session is None or session.is_modified(target, include_collections=False):
+            target.version = model.version + 1
+    
+    return model
@@ -2,8 +2,12 @@ from app import db
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_sqlalchemy import SQLAlchemy
-import json
+from sqlalchemy.orm import joinedload
+from app.models.json_text import JSONText
+from app.models.row_version import versioned
+from sqlalchemy.ext.mutable import MutableList
 
+@versioned
 class User(db.Model):
     __tablename__ = 'users'
     
@@ -17,6 +21,8 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_login = db.Column(db.DateTime)
+    # Row version, bumped by every ORM update (see versioned); with updated_at it makes the ETag
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     # Relationships
     goals = db.relationship('UserGoals', backref='user', uselist=False, cascade='all, delete-orphan')
@@ -25,6 +31,11 @@ class User(db.Model):
     meals = db.relationship('NutritionLog', backref='user', lazy='dynamic')
     progress = db.relationship('Progress', backref='user', lazy='dynamic')
     
+    @classmethod
+    def profile_options(cls):
+        """Opt-in loader options that fetch goals and preferences in the same query"""
+        return (joinedload(cls.goals), joinedload(cls.preferences))
+    
     def set_password(self, password):
         """Hash and set the password"""
         self.password_hash = generate_password_hash(password)
@@ -52,6 +63,7 @@ class User(db.Model):
     def __repr__(self):
         return f'<User {self.email}>'
 
+@versioned
 class UserGoals(db.Model):
     __tablename__ = 'user_goals'
     
@@ -70,6 +82,7 @@ class UserGoals(db.Model):
     target_date = db.Column(db.Date, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     @property
     def bmi(self):
@@ -83,6 +96,14 @@ class UserGoals(db.Model):
         height_m = self.height / 100
         return round(self.target_weight / (height_m ** 2), 2)
     
+    def body_stats(self):
+        """Body measurements passed to plan generation"""
+        return {
+            'current_weight': self.current_weight,
+            'height': self.height,
+            'activity_level': self.activity_level
+        }
+    
     def to_dict(self):
         """Convert goals to dictionary"""
         return {
@@ -108,62 +129,56 @@ class UserGoals(db.Model):
     def __repr__(self):
         return f'<UserGoals {self.user_id}>'
 
+@versioned
 class UserPreferences(db.Model):
     __tablename__ = 'user_preferences'
     
     id = db.Column(db.String(50), primary_key=True)
     user_id = db.Column(db.String(50), db.ForeignKey('users.id'), nullable=False)
-    dietary_preferences = db.Column(db.Text)  # JSON string of list
-    workout_types = db.Column(db.Text)  # JSON string of list
-    available_equipment = db.Column(db.Text)  # JSON string of list
+    dietary_preferences = db.Column(MutableList.as_mutable(JSONText))  # list, stored as JSON text
+    workout_types = db.Column(MutableList.as_mutable(JSONText))  # list, stored as JSON text
+    available_equipment = db.Column(MutableList.as_mutable(JSONText))  # list, stored as JSON text
     workout_duration = db.Column(db.Integer, default=30)  # in minutes
     difficulty_level = db.Column(db.String(50), default='beginner')
-    allergies = db.Column(db.Text)  # JSON string of list
+    allergies = db.Column(MutableList.as_mutable(JSONText))  # list, stored as JSON text
     notifications_enabled = db.Column(db.Boolean, default=True)
     language = db.Column(db.String(10), default='en')
     theme = db.Column(db.String(20), default='light')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     def set_dietary_preferences(self, preferences):
-        """Set dietary preferences as JSON string"""
-        self.dietary_preferences = json.dumps(preferences)
+        """Set dietary preferences"""
+        self.dietary_preferences = list(preferences)
     
     def get_dietary_preferences(self):
         """Get dietary preferences as list"""
-        if self.dietary_preferences:
-            return json.loads(self.dietary_preferences)
-        return []
+        return self.dietary_preferences if self.dietary_preferences is not None else []
     
     def set_workout_types(self, types):
-        """Set workout types as JSON string"""
-        self.workout_types = json.dumps(types)
+        """Set workout types"""
+        self.workout_types = list(types)
     
     def get_workout_types(self):
         """Get workout types as list"""
-        if self.workout_types:
-            return json.loads(self.workout_types)
-        return []
+        return self.workout_types if self.workout_types is not None else []
     
     def set_available_equipment(self, equipment):
-        """Set available equipment as JSON string"""
-        self.available_equipment = json.dumps(equipment)
+        """Set available equipment"""
+        self.available_equipment = list(equipment)
     
     def get_available_equipment(self):
         """Get available equipment as list"""
-        if self.available_equipment:
-            return json.loads(self.available_equipment)
-        return []
+        return self.available_equipment if self.available_equipment is not None else []
     
     def set_allergies(self, allergies):
-        """Set allergies as JSON string"""
-        self.allergies = json.dumps(allergies)
+        """Set allergies"""
+        self.allergies = list(allergies)
     
     def get_allergies(self):
         """Get allergies as list"""
-        if self.allergies:
-            return json.loads(self.allergies)
-        return []
+        return self.allergies if self.allergies is not None else []
     
     def to_dict(self):
         """Convert preferences to dictionary"""
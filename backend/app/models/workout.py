@@ -1,6 +1,8 @@
 from app import db
 from datetime import datetime
-import json
+from app.models.json_text import JSONText
+from app.models.row_version import versioned
+from sqlalchemy.ext.mutable import MutableList
 
 class Workout(db.Model):
     __tablename__ = 'workouts'
@@ -10,7 +12,7 @@ class Workout(db.Model):
     description = db.Column(db.Text)
     type = db.Column(db.String(50), nullable=False)  # cardio, strength, yoga, etc.
     difficulty = db.Column(db.String(20), nullable=False)  # beginner, intermediate, advanced
-    body_parts = db.Column(db.Text)  # JSON string of list
+    body_parts = db.Column(MutableList.as_mutable(db.JSON(none_as_null=True)))  # list, filterable in SQL
     duration = db.Column(db.Integer, nullable=False)  # in minutes
     calories_burned = db.Column(db.Integer, default=0)
     image_url = db.Column(db.String(500))
@@ -21,22 +23,21 @@ class Workout(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    exercises = db.relationship('Exercise', backref='workout', lazy='dynamic', cascade='all, delete-orphan')
+    # Plain 'select' loading so list endpoints can opt into selectinload(Workout.exercises)
+    exercises = db.relationship('Exercise', backref='workout', lazy='select', cascade='all, delete-orphan')
     sessions = db.relationship('WorkoutSession', backref='workout', lazy='dynamic')
     
     def set_body_parts(self, body_parts):
-        """Set body parts as JSON string"""
-        self.body_parts = json.dumps(body_parts)
+        """Set body parts"""
+        self.body_parts = list(body_parts)
     
     def get_body_parts(self):
         """Get body parts as list"""
-        if self.body_parts:
-            return json.loads(self.body_parts)
-        return []
+        return self.body_parts if self.body_parts is not None else []
     
-    def to_dict(self):
+    def to_dict(self, include_exercises=True):
         """Convert workout to dictionary"""
-        return {
+        data = {
             'id': self.id,
             'name': self.name,
             'description': self.description,
@@ -50,15 +51,21 @@ class Workout(db.Model):
             'is_custom': self.is_custom,
             'created_by': self.created_by,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'exercises': [exercise.to_dict() for exercise in self.exercises]
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        if include_exercises:
+            data['exercises'] = [exercise.to_dict() for exercise in self.exercises]
+        return data
     
     def __repr__(self):
         return f'<Workout {self.name}>'
 
 class Exercise(db.Model):
     __tablename__ = 'exercises'
+    __table_args__ = (
+        # Backs the per-workout EXISTS of the library's muscle filter
+        db.Index('ix_exercises_workout_id', 'workout_id'),
+    )
     
     id = db.Column(db.String(50), primary_key=True)
     workout_id = db.Column(db.String(50), db.ForeignKey('workouts.id'), nullable=False)
@@ -67,43 +74,37 @@ class Exercise(db.Model):
     category = db.Column(db.String(50), nullable=False)  # strength, cardio, flexibility, etc.
     image_url = db.Column(db.String(500))
     video_url = db.Column(db.String(500))
-    instructions = db.Column(db.Text)  # JSON string of list
-    tips = db.Column(db.Text)  # JSON string of list
-    muscles = db.Column(db.Text)  # JSON string of list
+    instructions = db.Column(MutableList.as_mutable(JSONText))  # list, stored as JSON text
+    tips = db.Column(MutableList.as_mutable(JSONText))  # list, stored as JSON text
+    muscles = db.Column(MutableList.as_mutable(db.JSON(none_as_null=True)))  # list, filterable in SQL
     equipment = db.Column(db.String(100), nullable=False)
     exercise_type = db.Column(db.String(50), nullable=False)  # strength, cardio, flexibility, etc.
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def set_instructions(self, instructions):
-        """Set instructions as JSON string"""
-        self.instructions = json.dumps(instructions)
+        """Set instructions"""
+        self.instructions = list(instructions)
     
     def get_instructions(self):
         """Get instructions as list"""
-        if self.instructions:
-            return json.loads(self.instructions)
-        return []
+        return self.instructions if self.instructions is not None else []
     
     def set_tips(self, tips):
-        """Set tips as JSON string"""
-        self.tips = json.dumps(tips)
+        """Set tips"""
+        self.tips = list(tips)
     
     def get_tips(self):
         """Get tips as list"""
-        if self.tips:
-            return json.loads(self.tips)
-        return []
+        return self.tips if self.tips is not None else []
     
     def set_muscles(self, muscles):
-        """Set muscles as JSON string"""
-        self.muscles = json.dumps(muscles)
+        """Set muscles"""
+        self.muscles = list(muscles)
     
     def get_muscles(self):
         """Get muscles as list"""
-        if self.muscles:
-            return json.loads(self.muscles)
-        return []
+        return self.muscles if self.muscles is not None else []
     
     def to_dict(self):
         """Convert exercise to dictionary"""
@@ -129,6 +130,9 @@ class Exercise(db.Model):
 
 class WorkoutSession(db.Model):
     __tablename__ = 'workout_sessions'
+    __table_args__ = (
+        db.Index('ix_workout_sessions_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.String(50), primary_key=True)
     workout_id = db.Column(db.String(50), db.ForeignKey('workouts.id'), nullable=False)
@@ -137,21 +141,19 @@ class WorkoutSession(db.Model):
     end_time = db.Column(db.DateTime)
     duration = db.Column(db.Integer)  # in minutes
     calories_burned = db.Column(db.Integer, default=0)
-    sets_data = db.Column(db.Text)  # JSON string of sets
+    sets_data = db.Column(MutableList.as_mutable(JSONText))  # list of sets, stored as JSON text
     notes = db.Column(db.Text)
     status = db.Column(db.String(20), default='not_started')  # not_started, in_progress, completed, paused, cancelled
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def set_sets_data(self, sets_data):
-        """Set sets data as JSON string"""
-        self.sets_data = json.dumps(sets_data)
+        """Set sets data"""
+        self.sets_data = list(sets_data)
     
     def get_sets_data(self):
         """Get sets data as list"""
-        if self.sets_data:
-            return json.loads(self.sets_data)
-        return []
+        return self.sets_data if self.sets_data is not None else []
     
     def calculate_duration(self):
         """Calculate duration in minutes"""
@@ -180,29 +182,33 @@ class WorkoutSession(db.Model):
     def __repr__(self):
         return f'<WorkoutSession {self.id}>'
 
+@versioned
 class WorkoutPlan(db.Model):
     __tablename__ = 'workout_plans'
+    __table_args__ = (
+        db.Index('ix_workout_plans_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.String(50), primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     user_id = db.Column(db.String(50), db.ForeignKey('users.id'), nullable=False)
-    days_data = db.Column(db.Text)  # JSON string of days
+    days_data = db.Column(MutableList.as_mutable(JSONText))  # list of days, stored as JSON text
     total_weeks = db.Column(db.Integer, nullable=False)
     difficulty = db.Column(db.String(20), nullable=False)
     is_active = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped by every ORM update; part of the plan's ETag
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     def set_days_data(self, days_data):
-        """Set days data as JSON string"""
-        self.days_data = json.dumps(days_data)
+        """Set days data"""
+        self.days_data = list(days_data)
     
     def get_days_data(self):
         """Get days data as list"""
-        if self.days_data:
-            return json.loads(self.days_data)
-        return []
+        return self.days_data if self.days_data is not None else []
     
     def to_dict(self):
         """Convert plan to dictionary"""
@@ -221,3 +227,42 @@ class WorkoutPlan(db.Model):
     
     def __repr__(self):
         return f'<WorkoutPlan {self.name}>'
+
+class WorkoutDay(db.Model):
+    __tablename__ = 'workout_days'
+    __table_args__ = (
+        db.Index('ix_workout_days_plan_id_day_number', 'plan_id', 'day_number'),
+    )
+    
+    id = db.Column(db.String(50), primary_key=True)
+    plan_id = db.Column(db.String(50), db.ForeignKey('workout_plans.id'), nullable=False)
+    day_number = db.Column(db.Integer, nullable=False)
+    name = db.Column(db.String(200), nullable=False)
+    is_rest_day = db.Column(db.Boolean, default=False)
+    notes = db.Column(MutableList.as_mutable(JSONText))  # list of exercises, stored as JSON text
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def set_notes(self, exercises):
+        """Set exercises"""
+        self.notes = list(exercises)
+    
+    def get_notes(self):
+        """Get exercises as list"""
+        return self.notes if self.notes is not None else []
+    
+    def to_dict(self):
+        """Convert workout day to dictionary"""
+        return {
+            'id': self.id,
+            'plan_id': self.plan_id,
+            'day_number': self.day_number,
+            'name': self.name,
+            'is_rest_day': self.is_rest_day,
+            'notes': self.get_notes(),
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+    
+    def __repr__(self):
+        return f'<WorkoutDay {self.plan_id} - {self.day_number}>'
@@ -0,0 +1,253 @@
+from typing import Any, Dict, List, Optional
+import atexit
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'instance', 'ai_cache.db')
+)
+
+# Bump when the prompts change so stale plans are not served
+CACHE_VERSION = 1
+
+# Hit/miss counts are kept in memory and written at most this often
+STATS_FLUSH_SECONDS = 5.0
+
+# A hit refreshes an entry's LRU position only when it is older than this
+TOUCH_INTERVAL_SECONDS = 60.0
+
+def _normalize(value: Any) -> Any:
+    """Canonical form of user_data so equivalent requests share a key"""
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple, set)):
+        items = [_normalize(v) for v in value]
+        # Order is meaningless for lists like equipment or allergies
+        if all(isinstance(v, (str, int, float, bool)) for v in items):
+            return sorted(items, key=lambda v: (type(v).__name__, v))
+        return items
+    if isinstance(value, str):
+        return value.strip().lower()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def make_cache_key(kind: str, user_data: Dict[str, Any], namespace: str = '') -> str:
+    """SHA-256 of the kind and the normalized user_data
+    
+    `namespace` names the backend and model that produce the response, so
+    fake or replayed plans are never served to a real Gemini deployment
+    sharing the cache file.
+    """
+    canonical = json.dumps(
+        [CACHE_VERSION, namespace, kind, _normalize(user_data)],
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class AIResponseCache:
+    """Size-bounded LRU cache of parsed AI responses in a SQLite file
+    
+    Every worker process opens the same file, so entries and the hit/miss
+    counters are shared and survive restarts. Each process counts hits and
+    misses in memory and adds them to the shared counters every few seconds,
+    so reads do not contend for the stats row.
+    """
+    
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 5000,
+                 namespace: str = ''):
+        self.path = path
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._pending = {'hits': 0, 'misses': 0}
+        self._pending_lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ai_cache (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_ai_cache_last_used_at ON ai_cache (last_used_at)')
+            conn.execute('CREATE TABLE IF NOT EXISTS ai_cache_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS ai_cache_leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS ai_breaker_states '
+                '(process TEXT PRIMARY KEY, state TEXT NOT NULL, retry_at REAL, updated_at REAL NOT NULL)'
+            )
+        atexit.register(self.flush_stats)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread and process; WAL lets readers and the writer overlap"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    def _count(self, name: str):
+        with self._pending_lock:
+            self._pending[name] += 1
+            due = time.monotonic() - self._flushed_at >= STATS_FLUSH_SECONDS
+        if due:
+            self.flush_stats()
+    
+    def flush_stats(self):
+        """Add this process's pending hit/miss counts to the shared counters"""
+        with self._pending_lock:
+            pending = {name: count for name, count in self._pending.items() if count}
+            self._pending = {'hits': 0, 'misses': 0}
+            self._flushed_at = time.monotonic()
+        if not pending:
+            return
+        self._connect().executemany(
+            'INSERT INTO ai_cache_stats (name, value) VALUES (?, ?) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+            list(pending.items())
+        )
+    
+    def get(self, kind: str, user_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a fresh copy of the cached response, or None"""
+        key = make_cache_key(kind, user_data, self.namespace)
+        now = time.time()
+        conn = self._connect()
+        
+        row = conn.execute('SELECT value, created_at, last_used_at FROM ai_cache WHERE key = ?', (key,)).fetchone()
+        if row is None or now - row[1] > self.ttl_seconds:
+            if row is not None:
+                conn.execute('DELETE FROM ai_cache WHERE key = ?', (key,))
+            self._count('misses')
+            return None
+        
+        if now - row[2] >= TOUCH_INTERVAL_SECONDS:
+            conn.execute('UPDATE ai_cache SET last_used_at = ? WHERE key = ?', (now, key))
+        self._count('hits')
+        return json.loads(row[0])
+    
+    def set(self, kind: str, user_data: Dict[str, Any], value: Dict[str, Any]):
+        """Store a response and evict the least recently used entries over the bound"""
+        key = make_cache_key(kind, user_data, self.namespace)
+        now = time.time()
+        conn = self._connect()
+        
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO ai_cache (key, kind, value, created_at, last_used_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, kind, json.dumps(value), now, now)
+            )
+            conn.execute(
+                'DELETE FROM ai_cache WHERE key IN ('
+                'SELECT key FROM ai_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    
+    def acquire_lease(self, key: str, owner: str, lease_seconds: float) -> bool:
+        """Claim the right to generate `key`; False while another process holds it"""
+        now = time.time()
+        conn = self._connect()
+        
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM ai_cache_leases WHERE key = ? AND expires_at < ?', (key, now))
+            claimed = conn.execute(
+                'INSERT OR IGNORE INTO ai_cache_leases (key, owner, expires_at) VALUES (?, ?, ?)',
+                (key, owner, now + lease_seconds)
+            ).rowcount == 1
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return claimed
+    
+    def lease_active(self, key: str) -> bool:
+        """True while an unexpired lease exists for `key`"""
+        row = self._connect().execute(
+            'SELECT 1 FROM ai_cache_leases WHERE key = ? AND expires_at >= ?', (key, time.time())
+        ).fetchone()
+        return row is not None
+    
+    def release_lease(self, key: str, owner: str):
+        """Drop a lease taken with acquire_lease"""
+        self._connect().execute('DELETE FROM ai_cache_leases WHERE key = ? AND owner = ?', (key, owner))
+    
+    def publish_breaker(self, snapshot: Dict[str, Any]):
+        """Record this process's circuit breaker state for the health endpoint"""
+        now = time.time()
+        retry_at = now + snapshot['retry_in_seconds'] if snapshot['retry_in_seconds'] is not None else None
+        self._connect().execute(
+            'INSERT OR REPLACE INTO ai_breaker_states (process, state, retry_at, updated_at) VALUES (?, ?, ?, ?)',
+            (f'{socket.gethostname()}-{os.getpid()}', snapshot['state'], retry_at, now)
+        )
+    
+    def breaker_states(self, max_age: float = 3600) -> List[Dict[str, Any]]:
+        """Breaker states published by every process in the last max_age seconds"""
+        now = time.time()
+        rows = self._connect().execute(
+            'SELECT process, state, retry_at, updated_at FROM ai_breaker_states WHERE updated_at >= ?',
+            (now - max_age,)
+        ).fetchall()
+        states = []
+        for process, state, retry_at, updated_at in rows:
+            # An open breaker whose reset timeout has passed lets the next call through
+            if state == 'open' and retry_at is not None and now >= retry_at:
+                state = 'half_open'
+            states.append({'process': process, 'state': state, 'updated_at': updated_at})
+        return states
+    
+    def stats(self) -> Dict[str, Any]:
+        """Shared hit/miss counters and current size"""
+        self.flush_stats()
+        conn = self._connect()
+        counters = dict(conn.execute('SELECT name, value FROM ai_cache_stats').fetchall())
+        hits = counters.get('hits', 0)
+        misses = counters.get('misses', 0)
+        entries = conn.execute('SELECT COUNT(*) FROM ai_cache').fetchone()[0]
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds
+        }
+    
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._pending_lock:
+            self._pending = {'hits': 0, 'misses': 0}
+        conn = self._connect()
+        conn.execute('DELETE FROM ai_cache')
+        conn.execute('DELETE FROM ai_cache_stats')
+
+def get_ai_cache(namespace: str = '') -> Optional[AIResponseCache]:
+    """Build the cache from the environment; AI_CACHE_ENABLED=false turns it off"""
+    if os.getenv('AI_CACHE_ENABLED', 'true').lower() == 'false':
+        return None
+    return AIResponseCache(
+        path=os.getenv('AI_CACHE_PATH', DEFAULT_CACHE_PATH),
+        ttl_seconds=int(os.getenv('AI_CACHE_TTL', str(7 * 24 * 3600))),
+        max_entries=int(os.getenv('AI_CACHE_MAX_ENTRIES', '5000')),
+        namespace=namespace
+    )
@@ -0,0 +1,165 @@
+from app.services.fake_gemini import FakeResponse
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_CASSETTE_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'instance', 'ai_cassette.db')
+)
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a prompt was never recorded"""
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode()).hexdigest()
+
+class Cassette:
+    """Recorded Gemini exchanges in a SQLite file, zlib-compressed
+    
+    Each row holds the prompt, the response chunks and the delay before
+    each chunk, keyed by the prompt's SHA-256. Recording the same prompt
+    again replaces the earlier take.
+    """
+    
+    def __init__(self, path: str = DEFAULT_CASSETTE_PATH):
+        self.path = path
+        self._local = threading.local()
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ai_cassette (
+                    prompt_hash TEXT PRIMARY KEY,
+                    prompt BLOB NOT NULL,
+                    chunks BLOB NOT NULL,
+                    delays TEXT NOT NULL,
+                    recorded_at REAL NOT NULL
+                )
+            """)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread and process, like the AI cache"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    def record(self, prompt: str, chunks: List[str], delays: List[float]):
+        self._connect().execute(
+            'INSERT OR REPLACE INTO ai_cassette (prompt_hash, prompt, chunks, delays, recorded_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (
+                prompt_hash(prompt),
+                zlib.compress(prompt.encode()),
+                zlib.compress(json.dumps(chunks, separators=(',', ':')).encode()),
+                json.dumps([round(d, 4) for d in delays]),
+                time.time()
+            )
+        )
+    
+    def lookup(self, prompt: str) -> Optional[Tuple[List[str], List[float]]]:
+        row = self._connect().execute(
+            'SELECT chunks, delays FROM ai_cassette WHERE prompt_hash = ?', (prompt_hash(prompt),)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0])), json.loads(row[1])
+    
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Every recording, oldest first: prompt, text, chunks and delays"""
+        rows = self._connect().execute(
+            'SELECT prompt, chunks, delays FROM ai_cassette ORDER BY recorded_at'
+        ).fetchall()
+        for prompt, chunks, delays in rows:
+            chunks = json.loads(zlib.decompress(chunks))
+            yield {
+                'prompt': zlib.decompress(prompt).decode(),
+                'text': ''.join(chunks),
+                'chunks': chunks,
+                'delays': json.loads(delays)
+            }
+    
+    def __len__(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM ai_cassette').fetchone()[0]
+
+class _RecordingStream:
+    """Passes chunks through while timing them, then records the take"""
+    
+    def __init__(self, cassette: Cassette, prompt: str, response, started: float):
+        self._cassette = cassette
+        self._prompt = prompt
+        self._response = response
+        self._started = started
+    
+    def __iter__(self):
+        chunks, delays = [], []
+        last = self._started
+        for chunk in self._response:
+            now = time.perf_counter()
+            chunks.append(chunk.text)
+            delays.append(now - last)
+            last = now
+            yield chunk
+        self._cassette.record(self._prompt, chunks, delays)
+
+class CassetteModel:
+    """Records or replays generate_content calls against a Cassette
+    
+    In 'record' mode every call goes to the wrapped model and the raw
+    reply is stored with its timing. In 'replay' mode the stored reply is
+    served with the recorded delays (times latency_scale; 0 for none), and
+    an unrecorded prompt raises CassetteMissError.
+    """
+    
+    def __init__(self, cassette: Cassette, mode: str = 'replay', model=None, latency_scale: float = 1.0):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f'Unknown cassette mode: {mode}')
+        if mode == 'record' and model is None:
+            raise ValueError('Record mode needs a model to record from')
+        self.cassette = cassette
+        self.mode = mode
+        self.model = model
+        self.latency_scale = latency_scale
+    
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs):
+        if self.mode == 'record':
+            return self._record(prompt, stream, **kwargs)
+        
+        take = self.cassette.lookup(prompt)
+        if take is None:
+            raise CassetteMissError(f'No recording for prompt {prompt_hash(prompt)[:12]}')
+        chunks, delays = take
+        delays = [d * self.latency_scale for d in delays]
+        if stream:
+            return FakeResponse(chunks, delays)
+        
+        # A blocking call returns once the whole recorded reply has arrived
+        time.sleep(sum(delays))
+        return FakeResponse(chunks, [0.0] * len(chunks))
+    
+    def _record(self, prompt: str, stream: bool, **kwargs):
+        started = time.perf_counter()
+        if stream:
+            response = self.model.generate_content(prompt, stream=True, **kwargs)
+            return _RecordingStream(self.cassette, prompt, response, started)
+        
+        response = self.model.generate_content(prompt, **kwargs)
+        self.cassette.record(prompt, [response.text], [time.perf_counter() - started])
+        return response
+
+def cassette_from_env(model=None) -> CassetteModel:
+    """CassetteModel for AI_BACKEND=record or AI_BACKEND=replay"""
+    return CassetteModel(
+        Cassette(os.getenv('AI_CASSETTE_PATH', DEFAULT_CASSETTE_PATH)),
+        mode=os.getenv('AI_BACKEND'),
+        model=model,
+        latency_scale=float(os.getenv('AI_CASSETTE_LATENCY_SCALE', '1'))
+    )
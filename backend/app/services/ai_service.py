@@ -1,40 +1,113 @@
 import google.generativeai as genai
 import os
-from typing import Dict, List, Any
+from app.services.ai_cache import get_ai_cache, make_cache_key
+from app.services.single_flight import SingleFlight
+from app.services.resilience import GEMINI_BREAKER, make_resilient
+from app.services.fake_gemini import FakeGenerativeModel
+from app.services.ai_cassette import cassette_from_env
+from app.services.plan_fanout import WorkoutPlanFanout
+from app.services.workout_engine import WorkoutPlanEngine
+from app.services.meal_optimizer import MealPlanOptimizer
+from app.utils.incremental_json import IncrementalJSONParser, Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Any
 import json
 
+_plan_flights = None
+
+# Plan pieces reported to on_progress while a plan streams in
+WORKOUT_PLAN_UNITS = (('weeks', '*', 'days', '*'), ('weeks', '*'))
+MEAL_PLAN_UNITS = (('days', '*'),)
+
+ProgressCallback = Callable[[Path, Dict[str, Any]], None]
+
+GEMINI_MODEL = 'gemini-2.5-flash'
+
+def _get_plan_flights(cache) -> SingleFlight:
+    """One coalescing layer per process, shared by every AIService instance"""
+    global _plan_flights
+    if _plan_flights is None:
+        _plan_flights = SingleFlight(lease_store=cache)
+    return _plan_flights
+
 class AIService:
     def __init__(self):
         # Configure Gemini API
         api_key = os.getenv('GEMINI_API_KEY')
-        if api_key:
+        backend = os.getenv('AI_BACKEND', 'gemini')
+        if backend == 'fake':
+            # Offline stand-in for load and latency testing; no API key needed
+            self.model = make_resilient(FakeGenerativeModel.from_env())
+            print("🧪 Using offline fake Gemini model")
+        elif backend == 'replay':
+            # Serve recorded Gemini responses with their recorded latency
+            self.model = make_resilient(cassette_from_env())
+            print("📼 Replaying recorded Gemini responses")
+        elif api_key:
             genai.configure(api_key=api_key)
-            # Use Gemini 2.5 Flash model
-            self.model = genai.GenerativeModel('gemini-2.5-flash')
+            # Use Gemini 2.5 Flash model, behind a deadline, retries and the circuit breaker
+            model = genai.GenerativeModel(GEMINI_MODEL)
+            if backend == 'record':
+                model = cassette_from_env(model)
+                print("📼 Recording Gemini responses")
+            self.model = make_resilient(model)
             print("✅ Using Gemini 2.5 Flash model")
         else:
             self.model = None
             print("❌ No Gemini API key found")
     
-    def generate_workout_plan(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate a personalized workout plan using AI"""
-        if not self.model:
+        # Parsed plans shared across workers; None when AI_CACHE_ENABLED=false.
+        # Keyed by backend and model so fake or replayed plans stay separate
+        self.cache_namespace = f'{backend}/{GEMINI_MODEL}'
+        self.cache = get_ai_cache(self.cache_namespace)
+        # Identical concurrent plan requests share one Gemini call
+        self.flights = _get_plan_flights(self.cache)
+        # Rule-based plans from the exercise catalog: the fallback, or with
+        # AI_WORKOUT_ENGINE=fast the only generator
+        self.workout_engine = WorkoutPlanEngine()
+        self.workout_engine_first = os.getenv('AI_WORKOUT_ENGINE', 'fallback').lower() == 'fast'
+        # Meal plans optimized over the meal catalog when AI is unavailable
+        self.meal_optimizer = MealPlanOptimizer()
+        # Skeleton plus concurrent per-week calls instead of one long response
+        self.plan_fanout = None
+        if self.model and os.getenv('AI_PLAN_FANOUT', 'false').lower() == 'true':
+            self.plan_fanout = WorkoutPlanFanout(self.model, self._parse_json)
+        # Let /api/ai/health see breaker trips in the worker processes
+        if self.cache and GEMINI_BREAKER.on_change is None:
+            GEMINI_BREAKER.on_change = self.cache.publish_breaker
+    
+    def generate_workout_plan(self, user_data: Dict[str, Any],
+                              on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Generate a personalized workout plan using AI
+        
+        With on_progress the plan is streamed and each day and week is passed to
+        it as soon as it is complete.
+        """
+        if not self.model or self.workout_engine_first:
             return self._get_default_workout_plan(user_data)
         
+        return self.flights.do(
+            make_cache_key('workout_plan', user_data, self.cache_namespace),
+            lambda: self._generate_workout_plan(user_data, on_progress),
+            lambda: self.cache.get('workout_plan', user_data) if self.cache else None
+        )
+    
+    def _generate_workout_plan(self, user_data: Dict[str, Any],
+                               on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Cached or fresh workout plan; called once per in-flight key"""
+        cached = self.cache.get('workout_plan', user_data) if self.cache else None
+        if cached is not None:
+            return cached
+        
         try:
+            if self.plan_fanout:
+                workout_plan, complete = self.plan_fanout.generate(self._workout_profile(user_data), on_progress)
+                if self.cache and complete:
+                    self.cache.set('workout_plan', user_data, workout_plan)
+                return workout_plan
+            
             prompt = f"""
             Create a personalized workout plan for a user with the following details:
-            - Fitness Goal: {user_data.get('fitness_goal', 'general_fitness')}
-            - Current Weight: {user_data.get('current_weight', 70)} kg
-            - Target Weight: {user_data.get('target_weight', 70)} kg
-            - Height: {user_data.get('height', 170)} cm
-            - Body Type: {user_data.get('body_type', 'mesomorph')}
-            - Activity Level: {user_data.get('activity_level', 'moderate')}
-            - Preferred Workout Types: {user_data.get('workout_types', [])}
-            - Available Equipment: {user_data.get('available_equipment', [])}
-            - Workout Duration: {user_data.get('workout_duration', 30)} minutes
-            - Days Per Week: {user_data.get('days_per_week', 3)}
-            - Difficulty Level: {user_data.get('difficulty', 'beginner')}
+            {self._workout_profile(user_data)}
             
             Please provide a structured workout plan with:
             1. A 4-week plan with daily workouts
@@ -78,20 +151,56 @@ class AIService:
             }}
             """
             
-            response = self.model.generate_content(prompt)
-            # Parse the response and return structured data
-            # Note: In a real implementation, you'd need to parse the JSON response
-            return self._parse_workout_response(response.text)
+            # Unparseable output raises here and falls back to the default plan;
+            # neither that nor a repaired truncated plan is cached
+            workout_plan, complete = self._request_plan(prompt, WORKOUT_PLAN_UNITS, on_progress)
+            if self.cache and complete:
+                self.cache.set('workout_plan', user_data, workout_plan)
+            return workout_plan
             
         except Exception as e:
             print(f"Error generating workout plan: {e}")
             return self._get_default_workout_plan(user_data)
     
-    def generate_meal_plan(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate a personalized meal plan using AI"""
+    def _workout_profile(self, user_data: Dict[str, Any]) -> str:
+        """User details block shared by the single-shot and fan-out workout prompts"""
+        return '\n            '.join([
+            f"- Fitness Goal: {user_data.get('fitness_goal', 'general_fitness')}",
+            f"- Current Weight: {user_data.get('current_weight', 70)} kg",
+            f"- Target Weight: {user_data.get('target_weight', 70)} kg",
+            f"- Height: {user_data.get('height', 170)} cm",
+            f"- Body Type: {user_data.get('body_type', 'mesomorph')}",
+            f"- Activity Level: {user_data.get('activity_level', 'moderate')}",
+            f"- Preferred Workout Types: {user_data.get('workout_types', [])}",
+            f"- Available Equipment: {user_data.get('available_equipment', [])}",
+            f"- Workout Duration: {user_data.get('workout_duration', 30)} minutes",
+            f"- Days Per Week: {user_data.get('days_per_week', 3)}",
+            f"- Difficulty Level: {user_data.get('difficulty', 'beginner')}"
+        ])
+    
+    def generate_meal_plan(self, user_data: Dict[str, Any],
+                           on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Generate a personalized meal plan using AI
+        
+        With on_progress the plan is streamed and each day is passed to
+        it as soon as it is complete.
+        """
         if not self.model:
             return self._get_default_meal_plan(user_data)
         
+        return self.flights.do(
+            make_cache_key('meal_plan', user_data, self.cache_namespace),
+            lambda: self._generate_meal_plan(user_data, on_progress),
+            lambda: self.cache.get('meal_plan', user_data) if self.cache else None
+        )
+    
+    def _generate_meal_plan(self, user_data: Dict[str, Any],
+                            on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Cached or fresh meal plan; called once per in-flight key"""
+        cached = self.cache.get('meal_plan', user_data) if self.cache else None
+        if cached is not None:
+            return cached
+        
         try:
             prompt = f"""
             Create a personalized meal plan for a user with the following details:
@@ -146,8 +255,10 @@ class AIService:
             }}
             """
             
-            response = self.model.generate_content(prompt)
-            return self._parse_meal_response(response.text)
+            meal_plan, complete = self._request_plan(prompt, MEAL_PLAN_UNITS, on_progress)
+            if self.cache and complete:
+                self.cache.set('meal_plan', user_data, meal_plan)
+            return meal_plan
             
         except Exception as e:
             print(f"Error generating meal plan: {e}")
@@ -159,7 +270,38 @@ class AIService:
             return "AI service is not available. Please try again later."
         
         try:
-            prompt = f"""
+            response = self.model.generate_content(self._build_chat_prompt(message, context))
+            return response.text
+        
+        except Exception as e:
+            print(f"Error in AI chat: {e}")
+            return "I'm sorry, I'm having trouble processing your request. Please try again later."
+    
+    def stream_chat_with_ai(self, message: str, context: str = None) -> Iterator[str]:
+        """Chat with AI assistant, yielding text as Gemini produces it
+        
+        Chunks are only pulled from Gemini when the caller asks for the next
+        one, so a slow client slows the read instead of filling a buffer.
+        Closing the generator stops reading the stream.
+        """
+        if not self.model:
+            yield "AI service is not available. Please try again later."
+            return
+        
+        try:
+            response = self.model.generate_content(self._build_chat_prompt(message, context), stream=True)
+            for chunk in response:
+                text = chunk.text
+                if text:
+                    yield text
+        
+        except Exception as e:
+            print(f"Error in AI chat stream: {e}")
+            yield "I'm sorry, I'm having trouble processing your request. Please try again later."
+    
+    def _build_chat_prompt(self, message: str, context: str = None) -> str:
+        """Build the chat prompt shared by the blocking and streaming calls"""
+        return f"""
             You are FitAI, an AI fitness and nutrition assistant. 
             Help the user with their fitness and nutrition questions.
             
@@ -170,13 +312,6 @@ class AIService:
             Please provide a helpful, encouraging, and informative response.
             Keep your response concise but comprehensive.
             """
-            
-            response = self.model.generate_content(prompt)
-            return response.text
-            
-        except Exception as e:
-            print(f"Error in AI chat: {e}")
-            return "I'm sorry, I'm having trouble processing your request. Please try again later."
     
     def analyze_nutrition(self, nutrition_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze nutrition data and provide insights"""
@@ -221,51 +356,18 @@ class AIService:
             return self._get_default_nutrition_analysis(nutrition_data)
     
     def _get_default_workout_plan(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Fallback workout plan when AI is not available"""
-        return {
-            "plan_name": "Basic Fitness Plan",
-            "description": "A beginner-friendly workout plan",
-            "total_weeks": 4,
-            "difficulty": user_data.get('difficulty', 'beginner'),
-            "weeks": [
-                {
-                    "week_number": 1,
-                    "days": [
-                        {
-                            "day_number": 1,
-                            "day_name": "Monday",
-                            "workout_type": "Full Body",
-                            "duration_minutes": 30,
-                            "exercises": [
-                                {
-                                    "name": "Push-ups",
-                                    "sets": 3,
-                                    "reps": "8-12",
-                                    "rest_seconds": 60,
-                                    "instructions": "Keep your body straight and lower until chest nearly touches floor",
-                                    "muscles_targeted": ["chest", "shoulders", "triceps"],
-                                    "equipment": "bodyweight"
-                                },
-                                {
-                                    "name": "Squats",
-                                    "sets": 3,
-                                    "reps": "12-15",
-                                    "rest_seconds": 60,
-                                    "instructions": "Lower until thighs are parallel to floor",
-                                    "muscles_targeted": ["quadriceps", "glutes"],
-                                    "equipment": "bodyweight"
-                                }
-                            ],
-                            "warm_up": ["Arm circles", "Leg swings", "Light jogging in place"],
-                            "cool_down": ["Stretching", "Deep breathing"]
-                        }
-                    ]
-                }
-            ]
-        }
+        """Rule-based workout plan when AI is not available, failing or switched off"""
+        return self.workout_engine.generate(user_data)
     
     def _get_default_meal_plan(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Fallback meal plan when AI is not available"""
+        """Fallback meal plan when AI is not available
+        
+        Optimized over the meal catalog; the fixed single-day plan is only
+        used when the catalog has nothing that fits (or NumPy is missing).
+        """
+        meal_plan = self.meal_optimizer.generate(user_data)
+        if meal_plan is not None:
+            return meal_plan
         return {
             "plan_name": "Balanced Meal Plan",
             "description": "A balanced meal plan for healthy eating",
@@ -310,35 +412,50 @@ class AIService:
             "macro_balance": "Well balanced macros"
         }
     
-    def _parse_workout_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse AI workout response"""
+    def _request_plan(self, prompt: str, units: Tuple[Path, ...],
+                      on_progress: Optional[ProgressCallback]) -> Tuple[Dict[str, Any], bool]:
+        """Call Gemini for a plan; returns the plan and whether it arrived complete"""
+        if on_progress is None:
+            return self._parse_json(self.model.generate_content(prompt).text)
+        
+        parser = IncrementalJSONParser(emit=units)
         try:
-            # Extract JSON from response
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            json_str = response_text[start:end]
-            return json.loads(json_str)
-        except:
-            return self._get_default_workout_plan({})
+            for chunk in self.model.generate_content(prompt, stream=True):
+                for path, value in parser.feed(chunk.text):
+                    on_progress(path, value)
+        except Exception as e:
+            if not parser.started:
+                raise
+            # Keep what arrived before the stream broke
+            print(f"AI plan stream ended early: {e}")
+        return parser.finish(), not parser.repaired
     
-    def _parse_meal_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse AI meal response"""
-        try:
-            # Extract JSON from response
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            json_str = response_text[start:end]
-            return json.loads(json_str)
-        except:
-            return self._get_default_meal_plan({})
+    def _extract_json(self, response_text: str) -> Dict[str, Any]:
+        """Extract the JSON object from an AI response, raising ValueError if there is none"""
+        return self._parse_json(response_text)[0]
+    
+    def _parse_json(self, response_text: str) -> Tuple[Dict[str, Any], bool]:
+        """JSON object from an AI response and whether it needed no repair
+        
+        Well-formed output takes the fast json.loads path; anything else
+        goes through the incremental parser, which drops trailing commas
+        and closes truncated output.
+        """
+        start = response_text.find('{')
+        end = response_text.rfind('}') + 1
+        if start != -1 and end > start:
+            try:
+                return json.loads(response_text[start:end]), True
+            except ValueError:
+                pass
+        
+        parser = IncrementalJSONParser()
+        parser.feed(response_text[start:] if start != -1 else response_text)
+        return parser.finish(), not parser.repaired
     
     def _parse_nutrition_response(self, response_text: str) -> Dict[str, Any]:
         """Parse AI nutrition response"""
         try:
-            # Extract JSON from response
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            json_str = response_text[start:end]
-            return json.loads(json_str)
+            return self._extract_json(response_text)
         except:
             return self._get_default_nutrition_analysis({})
@@ -0,0 +1,290 @@
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import os
+import random
+import re
+import threading
+import time
+
+try:
+    from google.api_core.exceptions import ServiceUnavailable as FakeUpstreamError
+except ImportError:
+    FakeUpstreamError = ConnectionError
+
+EXERCISES = {
+    'strength': [
+        ('Goblet Squat', ['quads', 'glutes'], 'dumbbell'),
+        ('Push-up', ['chest', 'triceps'], 'bodyweight'),
+        ('Bent-over Row', ['back', 'biceps'], 'dumbbell'),
+        ('Romanian Deadlift', ['hamstrings', 'glutes'], 'dumbbell'),
+        ('Overhead Press', ['shoulders', 'triceps'], 'dumbbell'),
+        ('Plank', ['core'], 'bodyweight'),
+    ],
+    'cardio': [
+        ('Jumping Jacks', ['full_body'], 'bodyweight'),
+        ('Mountain Climbers', ['core', 'shoulders'], 'bodyweight'),
+        ('High Knees', ['legs'], 'bodyweight'),
+    ],
+}
+
+MEALS = {
+    'breakfast': [('Overnight Oats', ['Oats', 'Milk', 'Berries']), ('Veggie Omelette', ['Eggs', 'Spinach', 'Tomato'])],
+    'lunch': [('Chicken Quinoa Bowl', ['Chicken breast', 'Quinoa', 'Broccoli']), ('Lentil Soup', ['Lentils', 'Carrot', 'Celery'])],
+    'dinner': [('Salmon and Rice', ['Salmon', 'Brown rice', 'Asparagus']), ('Tofu Stir Fry', ['Tofu', 'Peppers', 'Noodles'])],
+    'snack': [('Greek Yogurt', ['Greek yogurt', 'Honey']), ('Apple and Almonds', ['Apple', 'Almonds'])],
+}
+
+MEAL_SHARE = {'breakfast': 0.25, 'lunch': 0.35, 'dinner': 0.3, 'snack': 0.1}
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+class LatencyDistribution:
+    """Samples latencies in seconds from a spec like 'lognormal:800:0.4'
+    
+    fixed:MS, uniform:LOW_MS:HIGH_MS, normal:MEAN_MS:STDDEV_MS or
+    lognormal:MEDIAN_MS:SIGMA.
+    """
+    
+    def __init__(self, spec: str):
+        kind, *params = spec.split(':')
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        if kind not in ('fixed', 'uniform', 'normal', 'lognormal'):
+            raise ValueError(f'Unknown latency distribution: {spec}')
+    
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == 'fixed':
+            ms = self.params[0]
+        elif self.kind == 'uniform':
+            ms = rng.uniform(self.params[0], self.params[1])
+        elif self.kind == 'normal':
+            ms = rng.gauss(self.params[0], self.params[1])
+        else:
+            ms = rng.lognormvariate(0, self.params[1]) * self.params[0]
+        return max(0.0, ms) / 1000
+
+class FakeChunk:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeResponse:
+    """Quacks like GenerateContentResponse: has .text and iterates chunks when streamed"""
+    
+    def __init__(self, chunks: List[str], token_delays: List[float]):
+        self._chunks = chunks
+        self._token_delays = token_delays
+    
+    def __iter__(self) -> Iterator[FakeChunk]:
+        for text, delay in zip(self._chunks, self._token_delays):
+            time.sleep(delay)
+            yield FakeChunk(text)
+    
+    @property
+    def text(self) -> str:
+        return ''.join(self._chunks)
+
+class FakeGenerativeModel:
+    """Offline stand-in for genai.GenerativeModel
+    
+    Answers the AIService prompts with schema-valid workout, meal and
+    nutrition JSON (and plain text for chat) after a sampled delay.
+    Seeded, so a load test replays the same latencies and failures.
+    """
+    
+    def __init__(self, latency: str = 'lognormal:800:0.4', token_ms: float = 15, error_rate: float = 0.0,
+                 seed: Optional[int] = None, chunk_chars: int = 32):
+        self.latency = LatencyDistribution(latency)
+        self.token_delay = token_ms / 1000
+        self.error_rate = error_rate
+        self.chunk_chars = chunk_chars
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_env(cls) -> 'FakeGenerativeModel':
+        seed = os.getenv('AI_FAKE_SEED')
+        return cls(
+            latency=os.getenv('AI_FAKE_LATENCY', 'lognormal:800:0.4'),
+            token_ms=float(os.getenv('AI_FAKE_TOKEN_MS', '15')),
+            error_rate=float(os.getenv('AI_FAKE_ERROR_RATE', '0')),
+            seed=int(seed) if seed is not None else None
+        )
+    
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs) -> FakeResponse:
+        with self._lock:
+            first_token = self.latency.sample(self._rng)
+            failed = self._rng.random() < self.error_rate
+            seed = self._rng.random()
+        
+        time.sleep(first_token)
+        if failed:
+            raise FakeUpstreamError('Fake Gemini injected failure')
+        
+        text = self._render(prompt, random.Random(seed))
+        chunks = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+        if stream:
+            return FakeResponse(chunks, [0.0] + [self.token_delay] * (len(chunks) - 1))
+        
+        # A blocking call returns once the whole reply has been generated
+        time.sleep(self.token_delay * (len(chunks) - 1))
+        return FakeResponse(chunks, [0.0] * len(chunks))
+    
+    def _render(self, prompt: str, rng: random.Random) -> str:
+        if 'skeleton of a personalized workout plan' in prompt:
+            body = self._workout_plan(prompt, rng, outline_only=True)
+        elif '- Week Number:' in prompt:
+            week = int(self._field(prompt, 'Week Number', '1'))
+            body = self._workout_week(week, self._workout_settings(prompt), rng)
+        elif 'personalized workout plan' in prompt:
+            body = self._workout_plan(prompt, rng)
+        elif 'personalized meal plan' in prompt:
+            body = self._meal_plan(prompt, rng)
+        elif 'Analyze the following nutrition data' in prompt:
+            body = self._nutrition_analysis(prompt)
+        else:
+            return ('Consistency matters more than intensity. Aim for three to four sessions a week, '
+                    'keep protein around 1.6g per kg of body weight, and sleep at least seven hours.')
+        # Gemini usually wraps JSON in a fenced block
+        return '```json\n' + json.dumps(body) + '\n```'
+    
+    @staticmethod
+    def _field(prompt: str, label: str, default: str) -> str:
+        match = re.search(rf'- {re.escape(label)}: ([^\n]+)', prompt)
+        return match.group(1).strip() if match else default
+    
+    def _workout_settings(self, prompt: str) -> Dict[str, Any]:
+        days_per_week = max(1, min(7, int(self._field(prompt, 'Days Per Week', '3'))))
+        difficulty = self._field(prompt, 'Difficulty Level', 'beginner')
+        return {
+            'days_per_week': days_per_week,
+            'difficulty': difficulty,
+            'duration': int(re.sub(r'\D', '', self._field(prompt, 'Workout Duration', '30')) or 30),
+            'goal': self._field(prompt, 'Fitness Goal', 'general_fitness'),
+            'sets': {'beginner': 3, 'intermediate': 4, 'advanced': 5}.get(difficulty, 3),
+            # Spread training days across the week with rest days in between
+            'training_days': {round(i * 7 / days_per_week) for i in range(days_per_week)}
+        }
+    
+    def _workout_plan(self, prompt: str, rng: random.Random, outline_only: bool = False) -> Dict[str, Any]:
+        settings = self._workout_settings(prompt)
+        weeks = []
+        for week in range(1, 5):
+            if outline_only:
+                days = [
+                    {'day_number': index + 1, 'day_name': day_name,
+                     'workout_type': self._workout_type(index, settings['training_days'])}
+                    for index, day_name in enumerate(DAY_NAMES)
+                ]
+                weeks.append({'week_number': week, 'focus': f'Progression block {week}', 'days': days})
+            else:
+                weeks.append(self._workout_week(week, settings, rng))
+        
+        return {
+            'plan_name': f"{settings['goal'].replace('_', ' ').title()} {settings['days_per_week']}-Day Plan",
+            'description': f"A {settings['difficulty']} plan with {settings['days_per_week']} training days per week.",
+            'total_weeks': 4,
+            'difficulty': settings['difficulty'],
+            'weeks': weeks
+        }
+    
+    @staticmethod
+    def _workout_type(index: int, training_days: set) -> str:
+        if index not in training_days:
+            return 'rest'
+        return 'cardio' if index % 3 == 2 else 'strength'
+    
+    def _workout_week(self, week: int, settings: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+        days = []
+        for index, day_name in enumerate(DAY_NAMES):
+            workout_type = self._workout_type(index, settings['training_days'])
+            if workout_type == 'rest':
+                days.append({'day_number': index + 1, 'day_name': day_name, 'workout_type': 'rest',
+                             'duration_minutes': 0, 'exercises': [], 'warm_up': [], 'cool_down': []})
+                continue
+            exercises = rng.sample(EXERCISES[workout_type], k=min(4, len(EXERCISES[workout_type])))
+            days.append({
+                'day_number': index + 1,
+                'day_name': day_name,
+                'workout_type': workout_type,
+                'duration_minutes': settings['duration'],
+                'exercises': [
+                    {
+                        'name': name,
+                        'sets': settings['sets'],
+                        'reps': '10-12' if workout_type == 'strength' else '40s',
+                        'rest_seconds': 60 if workout_type == 'strength' else 20,
+                        'instructions': f'Controlled tempo, week {week} progression.',
+                        'muscles_targeted': muscles,
+                        'equipment': equipment
+                    }
+                    for name, muscles, equipment in exercises
+                ],
+                'warm_up': ['5 min brisk walk', 'Dynamic stretches'],
+                'cool_down': ['Light stretching', 'Deep breathing']
+            })
+        return {'week_number': week, 'days': days}
+    
+    def _meal_plan(self, prompt: str, rng: random.Random) -> Dict[str, Any]:
+        target = int(re.sub(r'\D', '', self._field(prompt, 'Target Calories', '2000').split()[0]) or 2000)
+        total_days = max(1, min(14, int(re.sub(r'\D', '', self._field(prompt, 'Days', '7')) or 7)))
+        preference = self._field(prompt, 'Dietary Preference', 'balanced')
+        
+        days = []
+        for day in range(1, total_days + 1):
+            meals = []
+            for meal_type, share in MEAL_SHARE.items():
+                name, ingredients = rng.choice(MEALS[meal_type])
+                calories = round(target * share)
+                meals.append({
+                    'meal_type': meal_type,
+                    'time': {'breakfast': '08:00', 'lunch': '12:30', 'dinner': '19:00', 'snack': '16:00'}[meal_type],
+                    'name': name,
+                    'calories': calories,
+                    'protein': round(calories * 0.3 / 4),
+                    'carbs': round(calories * 0.45 / 4),
+                    'fat': round(calories * 0.25 / 9),
+                    'ingredients': ingredients,
+                    'instructions': ['Prep the ingredients', 'Cook', 'Serve'],
+                    'prep_time': 10,
+                    'cook_time': 15
+                })
+            days.append({
+                'day_number': day,
+                'date': f'2024-01-{day:02d}',
+                'meals': meals,
+                'total_calories': sum(m['calories'] for m in meals),
+                'total_protein': sum(m['protein'] for m in meals),
+                'total_carbs': sum(m['carbs'] for m in meals),
+                'total_fat': sum(m['fat'] for m in meals)
+            })
+        
+        return {
+            'plan_name': f'{preference.title()} {total_days}-Day Plan',
+            'description': f'{total_days} days at about {target} kcal per day.',
+            'target_calories': target,
+            'dietary_preference': preference,
+            'days': days,
+            'shopping_list': sorted({i for d in days for m in d['meals'] for i in m['ingredients']}),
+            'meal_prep_tips': ['Batch cook grains on Sunday', 'Pre-chop vegetables']
+        }
+    
+    def _nutrition_analysis(self, prompt: str) -> Dict[str, Any]:
+        consumed = float(self._field(prompt, 'Calories Consumed', '0'))
+        target = float(self._field(prompt, 'Target Calories', '2000'))
+        protein = float(self._field(prompt, 'Protein', '0g').rstrip('g'))
+        target_protein = float(self._field(prompt, 'Target Protein', '150g').rstrip('g'))
+        
+        improvements = []
+        if consumed < target * 0.9:
+            improvements.append('Eat closer to your calorie target')
+        elif consumed > target * 1.1:
+            improvements.append('Reduce portion sizes slightly')
+        if protein < target_protein:
+            improvements.append('Increase protein intake')
+        
+        return {
+            'overall_assessment': 'On track' if not improvements else 'Some adjustments needed',
+            'areas_for_improvement': improvements,
+            'recommendations': ['Add a lean protein source to each meal', 'Include more vegetables'],
+            'meal_suggestions': ['Grilled chicken with vegetables', 'Quinoa salad'],
+            'macro_balance': f'{consumed:.0f} of {target:.0f} kcal, {protein:.0f}g of {target_protein:.0f}g protein'
+        }
@@ -0,0 +1,255 @@
+from app import db
+from app.models.job import AIJob
+from app.services.ai_service import AIService
+from app.services.plan_persistence import persist_meal_plan, persist_workout_plan
+from app.utils.ids import new_id
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from typing import Any, Callable, Dict, Optional
+import json
+import os
+import random
+import threading
+
+# Lower numbers are claimed first; chat is interactive so it jumps bulk plan generation
+JOB_PRIORITIES = {
+    'chat': 0,
+    'nutrition_analysis': 10,
+    'meal_plan': 20,
+    'workout_plan': 20,
+}
+
+# Workers started with interactive_only only claim jobs at or below this priority
+INTERACTIVE_MAX_PRIORITY = 0
+
+MAX_ATTEMPTS = 3
+MAX_QUEUED_JOBS = int(os.getenv('AI_JOB_MAX_QUEUED', '1000'))
+
+# A failed job waits RETRY_BACKOFF_SECONDS, then twice that, ... before it is claimed again
+RETRY_BACKOFF_SECONDS = float(os.getenv('AI_JOB_RETRY_BACKOFF_SECONDS', '30'))
+
+# How often a worker renews the lease on the job it is running
+HEARTBEAT_SECONDS = float(os.getenv('AI_JOB_HEARTBEAT_SECONDS', '10'))
+
+_ai_service = None
+
+class QueueFullError(Exception):
+    """Raised when too many jobs are already waiting"""
+
+def get_ai_service() -> AIService:
+    """One AIService per process, created on first use"""
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService()
+    return _ai_service
+
+def enqueue_job(kind: str, payload: Dict[str, Any], user_id: Optional[str] = None) -> AIJob:
+    """Persist a queued job and return it"""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f'Unknown job kind: {kind}')
+    
+    queued = AIJob.query.filter_by(status='queued').count()
+    if queued >= MAX_QUEUED_JOBS:
+        raise QueueFullError('AI job queue is full, try again shortly')
+    
+    job = AIJob(
+        id=new_id(),
+        user_id=user_id,
+        kind=kind,
+        priority=JOB_PRIORITIES[kind],
+        status='queued'
+    )
+    job.set_payload(payload)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+def claim_next_job(worker_id: str, interactive_only: bool = False) -> Optional[AIJob]:
+    """Atomically move the highest-priority queued job to running
+    
+    The conditional UPDATE only succeeds for one worker, so several
+    processes can poll the same table without a separate lock.
+    """
+    for _ in range(5):
+        now = datetime.utcnow()
+        query = AIJob.query.filter_by(status='queued')\
+            .filter(or_(AIJob.run_after.is_(None), AIJob.run_after <= now))
+        if interactive_only:
+            query = query.filter(AIJob.priority <= INTERACTIVE_MAX_PRIORITY)
+        candidate = query.order_by(AIJob.priority, AIJob.created_at, AIJob.id)\
+            .with_entities(AIJob.id).first()
+        if candidate is None:
+            return None
+        
+        claimed = AIJob.query.filter_by(id=candidate.id, status='queued').update({
+            'status': 'running',
+            'worker_id': worker_id,
+            'attempts': AIJob.attempts + 1,
+            'started_at': now,
+            'heartbeat_at': now,
+            'updated_at': now
+        }, synchronize_session=False)
+        db.session.commit()
+        
+        if claimed:
+            return db.session.get(AIJob, candidate.id)
+    return None
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff with jitter, so one upstream outage does not use up every attempt"""
+    return timedelta(seconds=RETRY_BACKOFF_SECONDS * (2 ** (attempts - 1)) * random.uniform(1, 1.5))
+
+class JobHeartbeat:
+    """Renews a running job's heartbeat_at from a background thread
+    
+    requeue_stale_jobs only takes back jobs whose heartbeat has stopped, so
+    a slow job keeps its worker while a job whose worker died is retried.
+    The thread uses its own connection because the job's session belongs
+    to the worker thread.
+    """
+    
+    def __init__(self, job: AIJob, interval: float = HEARTBEAT_SECONDS):
+        self.job_id = job.id
+        self.worker_id = job.worker_id
+        self.interval = interval
+        self._engine = db.engine
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'heartbeat-{job.id}', daemon=True)
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+    
+    def _run(self):
+        table = AIJob.__table__
+        while not self._stopped.wait(self.interval):
+            try:
+                with self._engine.begin() as connection:
+                    connection.execute(
+                        table.update()
+                        .where(table.c.id == self.job_id, table.c.status == 'running',
+                               table.c.worker_id == self.worker_id)
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+            except Exception as e:
+                print(f"Error renewing heartbeat for job {self.job_id}: {e}")
+
+def run_job(job: AIJob) -> AIJob:
+    """Run a claimed job and store its result or error
+    
+    The outcome is only written while this worker still holds the job; if
+    it was requeued in the meantime the other run's outcome wins.
+    """
+    worker_id = job.worker_id
+    with JobHeartbeat(job):
+        try:
+            result = JOB_HANDLERS[job.kind](job, job.get_payload())
+            outcome = {'status': 'succeeded', 'result': json.dumps(result), 'error': None}
+        except Exception as e:
+            db.session.rollback()
+            if job.attempts < MAX_ATTEMPTS:
+                outcome = {'status': 'queued', 'error': str(e), 'worker_id': None,
+                           'run_after': datetime.utcnow() + retry_delay(job.attempts)}
+            else:
+                outcome = {'status': 'failed', 'error': str(e)}
+    
+    now = datetime.utcnow()
+    outcome['updated_at'] = now
+    if outcome['status'] != 'queued':
+        outcome['finished_at'] = now
+    owned = AIJob.query.filter_by(id=job.id, status='running', worker_id=worker_id)\
+        .update(outcome, synchronize_session=False)
+    db.session.commit()
+    if not owned:
+        print(f"Job {job.id} was requeued while {worker_id} ran it; dropping this outcome")
+    db.session.refresh(job)
+    return job
+
+def requeue_stale_jobs(stale_after: timedelta) -> int:
+    """Put running jobs whose worker stopped renewing the heartbeat back on the queue"""
+    cutoff = datetime.utcnow() - stale_after
+    requeued = AIJob.query.filter(
+        AIJob.status == 'running',
+        db.func.coalesce(AIJob.heartbeat_at, AIJob.started_at) < cutoff
+    ).update({'status': 'queued', 'worker_id': None}, synchronize_session=False)
+    db.session.commit()
+    return requeued
+
+def _run_chat(job: AIJob, payload: Dict[str, Any]) -> Dict[str, Any]:
+    response = get_ai_service().chat_with_ai(payload['message'], payload.get('context'))
+    return {'response': response}
+
+def _run_nutrition_analysis(job: AIJob, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return get_ai_service().analyze_nutrition(payload['nutrition_data'])
+
+def _partial_plan_recorder(job: AIJob, unit: str) -> Callable[[tuple, Dict[str, Any]], None]:
+    """Store each completed week or day on the running job so GET /api/jobs/<id> shows it"""
+    partial = {'partial': True, 'days_completed': 0, unit: []}
+    
+    def record(path: tuple, value: Dict[str, Any]):
+        if path[-2] == 'days':
+            partial['days_completed'] += 1
+        if len(path) == 2 and path[0] == unit:
+            partial[unit].append(value)
+        job.set_result(partial)
+        job.updated_at = datetime.utcnow()
+        db.session.commit()
+    return record
+
+def _run_workout_plan(job: AIJob, payload: Dict[str, Any]) -> Dict[str, Any]:
+    ai_plan = get_ai_service().generate_workout_plan(
+        payload['user_data'], on_progress=_partial_plan_recorder(job, 'weeks')
+    )
+    if not payload.get('persist'):
+        return ai_plan
+    
+    workout_plan = persist_workout_plan(job.user_id, ai_plan)
+    return {
+        'plan_id': workout_plan['id'],
+        'plan_name': workout_plan['name'],
+        'description': workout_plan['description'],
+        'total_weeks': workout_plan['total_weeks'],
+        'difficulty': workout_plan['difficulty'],
+        'ai_plan': ai_plan
+    }
+
+def _run_meal_plan(job: AIJob, payload: Dict[str, Any]) -> Dict[str, Any]:
+    ai_plan = get_ai_service().generate_meal_plan(
+        payload['user_data'], on_progress=_partial_plan_recorder(job, 'days')
+    )
+    if not payload.get('persist'):
+        return ai_plan
+    
+    meal_plan = persist_meal_plan(job.user_id, ai_plan)
+    return {
+        'plan_id': meal_plan['id'],
+        'plan_name': meal_plan['name'],
+        'description': meal_plan['description'],
+        'target_calories': meal_plan['target_calories'],
+        'dietary_preference': meal_plan['dietary_preference'],
+        'total_days': meal_plan['total_days'],
+        'ai_plan': ai_plan
+    }
+
+JOB_HANDLERS: Dict[str, Callable[[AIJob, Dict[str, Any]], Dict[str, Any]]] = {
+    'chat': _run_chat,
+    'nutrition_analysis': _run_nutrition_analysis,
+    'workout_plan': _run_workout_plan,
+    'meal_plan': _run_meal_plan,
+}
+
+def job_accepted_response(job: AIJob) -> Dict[str, Any]:
+    """Body returned with 202 when a job has been queued"""
+    return {
+        'success': True,
+        'message': 'Job queued',
+        'data': {
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f'/api/jobs/{job.id}'
+        }
+    }
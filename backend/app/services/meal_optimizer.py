@@ -0,0 +1,308 @@
+from app import db
+from app.models.meal import Meal
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+import re
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MEAL_TIMES = {'breakfast': '08:00', 'lunch': '12:30', 'dinner': '19:00', 'snack': '16:00'}
+
+# Meal slots per day by meals-per-day count, with each slot's share of the day's calories
+MEAL_SLOTS = {
+    1: [('dinner', 1.0)],
+    2: [('lunch', 0.45), ('dinner', 0.55)],
+    3: [('breakfast', 0.25), ('lunch', 0.35), ('dinner', 0.40)],
+    4: [('breakfast', 0.25), ('lunch', 0.30), ('snack', 0.10), ('dinner', 0.35)],
+    5: [('breakfast', 0.20), ('snack', 0.10), ('lunch', 0.30), ('snack', 0.10), ('dinner', 0.30)],
+}
+
+# Preferences that do not narrow the catalog
+NO_RESTRICTION = {'', 'balanced', 'none', 'no preference', 'any'}
+
+# Macro split used when the user has no protein/carbs/fat targets (share of calories)
+DEFAULT_MACRO_SPLIT = {'protein': 0.30, 'carbs': 0.40, 'fat': 0.30}
+
+# Squared relative error weights for calories, protein, carbs, fat
+MACRO_WEIGHTS = (4.0, 2.0, 1.0, 1.0)
+# Score added per earlier use of a meal in the plan, and for yesterday's meals
+REPEAT_PENALTY = 0.05
+YESTERDAY_PENALTY = 0.2
+
+CATALOG_TTL_SECONDS = 300
+
+class MealCatalog:
+    """Column arrays over the catalog meals
+    
+    Allergens and dietary tags are bitmasks over the catalog's own
+    vocabulary, so filtering tens of thousands of meals is a couple of
+    array operations.
+    """
+    
+    def __init__(self, rows: List[tuple]):
+        rows = [tuple(row) for row in rows]
+        self.ids = [row[0] for row in rows]
+        self.names = [row[1] for row in rows]
+        self.details = [row[7:11] for row in rows]  # ingredients, instructions, prep_time, cook_time
+        self.types = np.array([(row[2] or '').lower() for row in rows], dtype=object)
+        self.macros = np.array([row[3:7] for row in rows], dtype=np.float64).reshape(len(rows), 4)
+        self.minutes = np.array([(row[9] or 0) + (row[10] or 0) for row in rows], dtype=np.int64)
+        self.tag_bits: Dict[str, int] = {}
+        self.allergen_bits: Dict[str, int] = {}
+        self.tags = self._bitmask([row[11] for row in rows], self.tag_bits)
+        self.allergens = self._bitmask([row[12] for row in rows], self.allergen_bits)
+        self.by_type = {meal_type: np.flatnonzero(self.types == meal_type) for meal_type in MEAL_TIMES}
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @staticmethod
+    def _bitmask(values: List[Optional[List[str]]], bits: Dict[str, int]):
+        # Python ints until the vocabulary is known to fit in 64 bits
+        masks = []
+        for value in values:
+            mask = 0
+            for item in value or []:
+                item = str(item).strip().lower()
+                if item not in bits:
+                    bits[item] = 1 << len(bits)
+                mask |= bits[item]
+            masks.append(mask)
+        if len(bits) > 63:
+            raise ValueError(f'Too many distinct meal tags for a bitmask: {len(bits)}')
+        return np.array(masks, dtype=np.int64)
+
+_catalog_lock = threading.Lock()
+_catalog: Optional[MealCatalog] = None
+_catalog_loaded_at = 0.0
+
+def load_meal_catalog() -> MealCatalog:
+    """Library meals (not copies in generated plans, not users' custom meals), cached per process"""
+    global _catalog, _catalog_loaded_at
+    with _catalog_lock:
+        if _catalog is not None and time.monotonic() - _catalog_loaded_at < CATALOG_TTL_SECONDS:
+            return _catalog
+        
+        rows = db.session.query(
+            Meal.id, Meal.name, Meal.type, Meal.calories, Meal.protein, Meal.carbs, Meal.fat,
+            Meal.ingredients, Meal.instructions, Meal.prep_time, Meal.cook_time,
+            Meal.dietary_tags, Meal.allergens
+        ).filter(
+            Meal.plan_id.is_(None),
+            db.or_(Meal.is_custom.is_(False), Meal.is_custom.is_(None))
+        ).order_by(Meal.id).all()
+        _catalog = MealCatalog(rows)
+        _catalog_loaded_at = time.monotonic()
+        return _catalog
+
+def macro_targets(user_data: Dict[str, Any]) -> Dict[str, float]:
+    """Daily calorie and macro targets, splitting the calories when macros are missing"""
+    calories = float(user_data.get('target_calories') or 2000)
+    targets = {'calories': calories}
+    for macro, share in DEFAULT_MACRO_SPLIT.items():
+        grams = user_data.get(f'target_{macro}')
+        targets[macro] = float(grams) if grams else calories * share / (9 if macro == 'fat' else 4)
+    return targets
+
+def user_data_from_goals(goals) -> Dict[str, Any]:
+    """Optimizer targets stored on UserGoals"""
+    if goals is None:
+        return {}
+    return {
+        'target_calories': goals.target_calories,
+        'target_protein': goals.target_protein,
+        'target_carbs': goals.target_carbs,
+        'target_fat': goals.target_fat,
+    }
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [str(item).strip().lower() for item in value if str(item).strip()]
+
+class MealPlanOptimizer:
+    """Deterministic meal plans from the Meal catalog that track the user's macro targets
+    
+    Meals with one of the user's allergens, or without every requested
+    dietary tag, are masked out. Each day is filled slot by slot with the
+    meal whose macros bring the day closest to the targets scaled to that
+    point of the day, scored over all candidates at once; a second pass
+    revisits every slot with the rest of the day fixed. Repeats across the
+    plan, and meals eaten the day before, are penalised for variety.
+    """
+    
+    def __init__(self, catalog: Optional[MealCatalog] = None):
+        self._catalog = catalog
+    
+    def catalog(self) -> Optional[MealCatalog]:
+        if self._catalog is not None:
+            return self._catalog
+        if np is None:
+            return None
+        try:
+            return load_meal_catalog()
+        except Exception as e:
+            print(f"Error loading meal catalog: {e}")
+            return None
+    
+    def generate(self, user_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build a plan in the same shape as the AI plans; None if the catalog has nothing that fits"""
+        catalog = self.catalog()
+        if catalog is None or not len(catalog):
+            return None
+        
+        days = max(1, min(31, int(user_data.get('days') or 7)))
+        targets = macro_targets(user_data)
+        target = np.array([targets['calories'], targets['protein'], targets['carbs'], targets['fat']])
+        weights = np.array(MACRO_WEIGHTS) / np.maximum(target, 1.0) ** 2
+        slots = self._slots(user_data.get('meal_types'))
+        candidates = self._candidates(catalog, user_data, {meal_type for meal_type, _ in slots})
+        if any(len(candidates[meal_type]) == 0 for meal_type, _ in slots):
+            return None
+        # Per meal type: catalog indices, their macros and the weighted squared macros,
+        # so scoring a slot is one matrix-vector product
+        pools = {
+            meal_type: (indices, catalog.macros[indices], (catalog.macros[indices] ** 2) @ weights)
+            for meal_type, indices in candidates.items()
+        }
+        
+        uses = np.zeros(len(catalog))
+        yesterday: List[int] = []
+        plan_days = []
+        for day_number in range(1, days + 1):
+            picks = self._fill_day(catalog, slots, pools, target, weights, uses, yesterday)
+            uses[picks] += 1
+            yesterday = picks
+            plan_days.append(self._day(catalog, day_number, slots, picks))
+        
+        shopping_list = sorted({
+            item for day in plan_days for meal in day['meals'] for item in meal['ingredients']
+        })
+        preference = user_data.get('dietary_preference', 'balanced')
+        return {
+            'plan_name': f"{days}-Day {int(targets['calories'])} kcal Meal Plan",
+            'description': 'Meals from the recipe library chosen to match your daily calorie and macro targets.',
+            'target_calories': int(targets['calories']),
+            'dietary_preference': ', '.join(preference) if isinstance(preference, list) else preference,
+            'days': plan_days,
+            'shopping_list': shopping_list,
+            'meal_prep_tips': ['Batch-cook meals that repeat during the week', 'Prep snacks in advance']
+        }
+    
+    @staticmethod
+    def _slots(meal_types) -> List[tuple]:
+        if isinstance(meal_types, (list, tuple)) and meal_types:
+            named = [str(t).lower() for t in meal_types if str(t).lower() in MEAL_TIMES]
+            if named:
+                share = 1.0 / len(named)
+                return [(meal_type, share) for meal_type in named]
+        try:
+            count = int(meal_types)
+        except (TypeError, ValueError):
+            count = 3
+        return MEAL_SLOTS[max(1, min(5, count))]
+    
+    @staticmethod
+    def _candidates(catalog: MealCatalog, user_data: Dict[str, Any], meal_types: set) -> Dict[str, Any]:
+        """Allowed catalog indices per meal type"""
+        forbidden = 0
+        for allergen in _as_list(user_data.get('allergies')):
+            for name, bit in catalog.allergen_bits.items():
+                if allergen in name or name in allergen:
+                    forbidden |= bit
+        required = [tag for tag in _as_list(user_data.get('dietary_preference')) if tag not in NO_RESTRICTION]
+        required_bits = 0
+        for tag in required:
+            if tag not in catalog.tag_bits:
+                # Nobody can be served a diet the catalog does not know about
+                return {meal_type: np.array([], dtype=np.int64) for meal_type in meal_types}
+            required_bits |= catalog.tag_bits[tag]
+        
+        allowed = ((catalog.allergens & forbidden) == 0) & ((catalog.tags & required_bits) == required_bits)
+        match = re.search(r'\d+', str(user_data.get('cooking_time') or ''))
+        quick = catalog.minutes <= int(match.group()) if match else None
+        
+        candidates = {}
+        for meal_type in meal_types:
+            indices = catalog.by_type[meal_type]
+            indices = indices[allowed[indices]]
+            # Cooking time is a preference; ignore it rather than leave a slot empty
+            if quick is not None and quick[indices].any():
+                indices = indices[quick[indices]]
+            candidates[meal_type] = indices
+        return candidates
+    
+    @staticmethod
+    def _fill_day(catalog: MealCatalog, slots: List[tuple], pools: Dict[str, tuple], target, weights,
+                  uses, yesterday: List[int]) -> List[int]:
+        """Catalog index for every slot of one day"""
+        penalty = REPEAT_PENALTY * uses
+        penalty[yesterday] += YESTERDAY_PENALTY
+        day_penalty = {meal_type: pool[2] + penalty[pool[0]] for meal_type, pool in pools.items()}
+        
+        def best(slot: int, base, goal, picks: List[int]) -> int:
+            meal_type = slots[slot][0]
+            indices, macros, _ = pools[meal_type]
+            # sum(w * (base + m - goal)^2) without the constant term: w.m^2 - 2 m.(w * (goal - base))
+            error = day_penalty[meal_type] - 2 * (macros @ (weights * (goal - base)))
+            # Never the same meal twice in a day while there is an alternative
+            taken = [p for i, p in enumerate(picks) if i != slot and p >= 0]
+            positions = [
+                pos for pos in np.searchsorted(indices, taken) if pos < len(indices) and indices[pos] in taken
+            ]
+            if len(positions) < len(indices):
+                error[positions] = np.inf
+            return int(indices[np.argmin(error)])
+        
+        # Greedy: each slot aims for the targets scaled to the day so far
+        picks = [-1] * len(slots)
+        total = np.zeros(4)
+        share = 0.0
+        for slot, (_, slot_share) in enumerate(slots):
+            share += slot_share
+            picks[slot] = best(slot, total, target * share, picks)
+            total += catalog.macros[picks[slot]]
+        
+        # Refine: swap each slot for the best meal given the rest of the day
+        for slot in range(len(slots)):
+            rest = total - catalog.macros[picks[slot]]
+            picks[slot] = best(slot, rest, target, picks)
+            total = rest + catalog.macros[picks[slot]]
+        return picks
+    
+    @staticmethod
+    def _day(catalog: MealCatalog, day_number: int, slots: List[tuple], picks: List[int]) -> Dict[str, Any]:
+        meals = []
+        for (meal_type, _), index in zip(slots, picks):
+            ingredients, instructions, prep_time, cook_time = catalog.details[index]
+            calories, protein, carbs, fat = (int(value) for value in catalog.macros[index])
+            meals.append({
+                'meal_type': meal_type,
+                'time': MEAL_TIMES[meal_type],
+                'name': catalog.names[index],
+                'meal_id': catalog.ids[index],
+                'calories': calories,
+                'protein': protein,
+                'carbs': carbs,
+                'fat': fat,
+                'ingredients': list(ingredients or []),
+                'instructions': list(instructions or []),
+                'prep_time': prep_time or 0,
+                'cook_time': cook_time or 0
+            })
+        return {
+            'day_number': day_number,
+            'date': (date.today() + timedelta(days=day_number - 1)).isoformat(),
+            'meals': meals,
+            'total_calories': sum(meal['calories'] for meal in meals),
+            'total_protein': sum(meal['protein'] for meal in meals),
+            'total_carbs': sum(meal['carbs'] for meal in meals),
+            'total_fat': sum(meal['fat'] for meal in meals)
+        }
@@ -0,0 +1,147 @@
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Optional
+import os
+import threading
+import time
+
+class _UserEntry:
+    __slots__ = ('generation', 'targets', 'days')
+    
+    def __init__(self):
+        self.generation = 0
+        # (value, stored_at, version) tuples
+        self.targets: Optional[tuple] = None
+        self.days: 'OrderedDict[date, tuple]' = OrderedDict()
+
+class NutritionSummaryCache:
+    """Per-process cache of each user's daily nutrition totals and targets
+    
+    The nutrition endpoints read the same rollup row and goals on every
+    app open. Each entry is stored with the version of the rows it was
+    built from, and a read only gets it back while the caller's version,
+    read from the database first, still matches; writes in any worker
+    process change that version, so no process serves a stale summary.
+    Writes in this process also drop the entries right after they commit.
+    A load that overlaps an invalidation is not stored, so a reader never
+    puts back the value a writer just replaced.
+    """
+    
+    def __init__(self, ttl_seconds: float = 300, max_users: int = 10000, max_days_per_user: int = 62):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self.max_days_per_user = max_days_per_user
+        self._lock = threading.Lock()
+        self._users: 'OrderedDict[str, _UserEntry]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+    
+    @classmethod
+    def from_env(cls) -> 'NutritionSummaryCache':
+        """NUTRITION_CACHE_TTL=0 turns the cache off"""
+        return cls(
+            ttl_seconds=float(os.getenv('NUTRITION_CACHE_TTL', '300')),
+            max_users=int(os.getenv('NUTRITION_CACHE_MAX_USERS', '10000'))
+        )
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_users > 0
+    
+    def daily_totals(self, user_id: str, day: date, load: Callable[[], Dict[str, Any]],
+                     version: Hashable) -> Dict[str, Any]:
+        """The day's totals, calling load on a miss or when version has moved on"""
+        return self._get(user_id, day, load, version)
+    
+    def targets(self, user_id: str, load: Callable[[], Dict[str, Any]], version: Hashable) -> Dict[str, Any]:
+        """The user's daily targets, calling load on a miss or when version has moved on"""
+        return self._get(user_id, None, load, version)
+    
+    def _get(self, user_id: str, day: Optional[date], load: Callable[[], Dict[str, Any]],
+             version: Hashable) -> Dict[str, Any]:
+        if not self.enabled:
+            return load()
+        
+        now = time.monotonic()
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None:
+                self._users.move_to_end(user_id)
+                cached = entry.targets if day is None else entry.days.get(day)
+                if cached is not None and cached[2] == version and now - cached[1] < self.ttl_seconds:
+                    self._hits += 1
+                    return dict(cached[0])
+            self._misses += 1
+            generation = entry.generation if entry is not None else 0
+        
+        value = load()
+        
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                if generation != 0:
+                    # Evicted and invalidated while loading
+                    return value
+                entry = self._new_entry(user_id)
+            if entry.generation != generation:
+                return value
+            if day is None:
+                entry.targets = (dict(value), now, version)
+            else:
+                entry.days[day] = (dict(value), now, version)
+                entry.days.move_to_end(day)
+                while len(entry.days) > self.max_days_per_user:
+                    entry.days.popitem(last=False)
+        return value
+    
+    def _new_entry(self, user_id: str) -> _UserEntry:
+        entry = self._users[user_id] = _UserEntry()
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        return entry
+    
+    def invalidate_days(self, user_id: str, *days: date):
+        """Drop the user's totals for the given days after a logging write"""
+        self._invalidate(user_id, days, targets=False)
+    
+    def invalidate_targets(self, user_id: str):
+        """Drop the user's targets after a goals write"""
+        self._invalidate(user_id, (), targets=True)
+    
+    def _invalidate(self, user_id: str, days, targets: bool):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                # A load may be in flight for a new user; make sure it is not stored
+                entry = self._new_entry(user_id)
+            entry.generation += 1
+            self._invalidations += 1
+            if targets:
+                entry.targets = None
+            for day in days:
+                entry.days.pop(day, None)
+    
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._users.clear()
+            self._hits = self._misses = self._invalidations = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size, in this process"""
+        with self._lock:
+            hits, misses = self._hits, self._misses
+            return {
+                'enabled': self.enabled,
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                'invalidations': self._invalidations,
+                'users': len(self._users),
+                'days': sum(len(entry.days) for entry in self._users.values()),
+                'ttl_seconds': self.ttl_seconds
+            }
+
+# One per process, shared by every request thread
+NUTRITION_CACHE = NutritionSummaryCache.from_env()
@@ -0,0 +1,82 @@
+from app import db
+from app.models.meal import NutritionLog, DailyNutritionRollup
+from sqlalchemy import func
+from datetime import datetime, date
+from typing import Dict, List, Any, Optional
+
+# Rollup and log sums may differ by float rounding only
+DRIFT_TOLERANCE = 0.01
+
+def _aggregate_logs(user_id: Optional[str] = None):
+    """Sum the raw nutrition log per user and day"""
+    day = func.date(NutritionLog.consumed_at)
+    query = db.session.query(
+        NutritionLog.user_id,
+        day.label('day'),
+        func.coalesce(func.sum(NutritionLog.calories), 0).label('calories'),
+        func.coalesce(func.sum(NutritionLog.protein), 0).label('protein'),
+        func.coalesce(func.sum(NutritionLog.carbs), 0).label('carbs'),
+        func.coalesce(func.sum(NutritionLog.fat), 0).label('fat'),
+        func.count(NutritionLog.id).label('entry_count')
+    )
+    if user_id:
+        query = query.filter(NutritionLog.user_id == user_id)
+    return query.group_by(NutritionLog.user_id, day).all()
+
+def _as_date(value) -> date:
+    """SQLite returns date() results as ISO strings"""
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    return value
+
+def rebuild_rollups(user_id: Optional[str] = None) -> int:
+    """Recompute rollup rows from the nutrition log and return how many were written"""
+    delete_query = DailyNutritionRollup.query
+    if user_id:
+        delete_query = delete_query.filter(DailyNutritionRollup.user_id == user_id)
+    delete_query.delete(synchronize_session=False)
+    
+    now = datetime.utcnow()
+    rows = [
+        {
+            'user_id': row.user_id,
+            'date': _as_date(row.day),
+            'calories': row.calories,
+            'protein': row.protein,
+            'carbs': row.carbs,
+            'fat': row.fat,
+            'entry_count': row.entry_count,
+            'updated_at': now
+        }
+        for row in _aggregate_logs(user_id)
+    ]
+    if rows:
+        db.session.execute(DailyNutritionRollup.__table__.insert(), rows)
+    db.session.commit()
+    return len(rows)
+
+def find_drift(user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Compare rollup rows against the nutrition log and list every mismatch"""
+    expected = {(row.user_id, _as_date(row.day)): row for row in _aggregate_logs(user_id)}
+    
+    rollup_query = DailyNutritionRollup.query
+    if user_id:
+        rollup_query = rollup_query.filter(DailyNutritionRollup.user_id == user_id)
+    actual = {(rollup.user_id, rollup.date): rollup for rollup in rollup_query.all()}
+    
+    drift = []
+    for key in sorted(set(expected) | set(actual), key=lambda k: (k[0], k[1])):
+        log_row = expected.get(key)
+        rollup = actual.get(key)
+        for field in ('calories', 'protein', 'carbs', 'fat', 'entry_count'):
+            log_value = getattr(log_row, field) if log_row else 0
+            rollup_value = getattr(rollup, field) if rollup else 0
+            if abs((log_value or 0) - (rollup_value or 0)) > DRIFT_TOLERANCE:
+                drift.append({
+                    'user_id': key[0],
+                    'date': key[1].isoformat(),
+                    'field': field,
+                    'log_value': log_value,
+                    'rollup_value': rollup_value
+                })
+    return drift
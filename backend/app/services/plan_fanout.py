@@ -0,0 +1,192 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import copy
+import os
+
+# Bounded per process, shared by every plan being generated
+PLAN_FANOUT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv('AI_PLAN_FANOUT_WORKERS', '4')),
+    thread_name_prefix='plan-fanout'
+)
+
+DAY_SCHEMA = """{
+                "day_number": 1,
+                "day_name": "Monday",
+                "workout_type": "string",
+                "duration_minutes": 30,
+                "exercises": [
+                    {
+                        "name": "string",
+                        "sets": 3,
+                        "reps": "12-15",
+                        "rest_seconds": 60,
+                        "instructions": "string",
+                        "muscles_targeted": ["string"],
+                        "equipment": "string"
+                    }
+                ],
+                "warm_up": ["string"],
+                "cool_down": ["string"]
+            }"""
+
+class WorkoutPlanFanout:
+    """Generates a workout plan as a small skeleton call plus one call per week
+    
+    The skeleton fixes the name, weekly focus and day-by-day schedule; the
+    weeks are then written concurrently on a bounded pool, so latency is
+    roughly skeleton + slowest week instead of the whole 4-week response.
+    A week that fails repeats the nearest week that succeeded.
+    """
+    
+    def __init__(self, model, parse: Callable[[str], Tuple[Dict[str, Any], bool]],
+                 executor: ThreadPoolExecutor = PLAN_FANOUT_EXECUTOR):
+        self.model = model
+        self.parse = parse
+        self.executor = executor
+    
+    def generate(self, profile: str, on_progress: Optional[Callable] = None) -> Tuple[Dict[str, Any], bool]:
+        """Return the merged plan and whether every piece arrived complete"""
+        skeleton, complete = self.parse(self.model.generate_content(self._skeleton_prompt(profile)).text)
+        outline = self._outline(skeleton)
+        
+        futures = {
+            self.executor.submit(self._generate_week, profile, skeleton, week): index
+            for index, week in enumerate(outline)
+        }
+        weeks: List[Optional[Dict[str, Any]]] = [None] * len(outline)
+        # Progress is reported from the calling thread, which owns the DB session
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                week, week_complete = future.result()
+            except Exception as e:
+                print(f"Error generating week {outline[index]['week_number']}: {e}")
+                complete = False
+                continue
+            weeks[index] = self._merge_week(outline[index], week)
+            complete = complete and week_complete
+            if on_progress:
+                for day_index, day in enumerate(weeks[index]['days']):
+                    on_progress(('weeks', index, 'days', day_index), day)
+                on_progress(('weeks', index), weeks[index])
+        
+        if not any(weeks):
+            raise ValueError('No week of the workout plan could be generated')
+        for index, week in enumerate(weeks):
+            if week is None:
+                weeks[index] = self._repeat_nearest_week(weeks, index, outline[index]['week_number'])
+        
+        return {
+            'plan_name': skeleton.get('plan_name', 'AI Workout Plan'),
+            'description': skeleton.get('description', ''),
+            'total_weeks': len(weeks),
+            'difficulty': skeleton.get('difficulty', 'beginner'),
+            'weeks': weeks
+        }, complete
+    
+    def _generate_week(self, profile: str, skeleton: Dict[str, Any], week: Dict[str, Any]):
+        return self.parse(self.model.generate_content(self._week_prompt(profile, skeleton, week)).text)
+    
+    @staticmethod
+    def _outline(skeleton: Dict[str, Any]) -> List[Dict[str, Any]]:
+        weeks = skeleton.get('weeks')
+        if not isinstance(weeks, list) or not weeks:
+            raise ValueError('Workout plan skeleton has no weeks')
+        outline = []
+        for number, week in enumerate(weeks, start=1):
+            days = week.get('days') if isinstance(week, dict) else None
+            if not isinstance(days, list) or not days:
+                raise ValueError(f'Skeleton week {number} has no days')
+            outline.append({
+                'week_number': week.get('week_number', number),
+                'focus': week.get('focus', ''),
+                'days': [
+                    {
+                        'day_number': day.get('day_number', position),
+                        'day_name': day.get('day_name', f'Day {position}'),
+                        'workout_type': day.get('workout_type', 'rest')
+                    }
+                    for position, day in enumerate(days, start=1)
+                ]
+            })
+        return outline
+    
+    @staticmethod
+    def _merge_week(planned: Dict[str, Any], generated: Dict[str, Any]) -> Dict[str, Any]:
+        """Lay the generated days over the skeleton schedule so every planned day is present"""
+        generated_days = generated.get('days') if isinstance(generated, dict) else None
+        by_number = {
+            day.get('day_number'): day
+            for day in (generated_days if isinstance(generated_days, list) else [])
+            if isinstance(day, dict)
+        }
+        days = []
+        for slot in planned['days']:
+            day = dict(by_number.get(slot['day_number'], {}))
+            for key, value in slot.items():
+                day.setdefault(key, value)
+            if not isinstance(day.get('exercises'), list):
+                day['exercises'] = []
+            days.append(day)
+        return {'week_number': planned['week_number'], 'days': days}
+    
+    @staticmethod
+    def _repeat_nearest_week(weeks: List[Optional[Dict[str, Any]]], index: int, week_number: int) -> Dict[str, Any]:
+        for distance in range(1, len(weeks)):
+            for candidate in (index - distance, index + distance):
+                if 0 <= candidate < len(weeks) and weeks[candidate] is not None:
+                    week = copy.deepcopy(weeks[candidate])
+                    week['week_number'] = week_number
+                    return week
+    
+    @staticmethod
+    def _skeleton_prompt(profile: str) -> str:
+        return f"""
+            Create the skeleton of a personalized workout plan for a user with the following details:
+            {profile}
+            
+            Only outline the plan: a 4-week plan with the focus of each week and,
+            for every day of each week, the day name and workout type. Use "rest"
+            as the workout type for rest days. Do not list exercises.
+            
+            Format the response as a JSON object with the following structure:
+            {{
+                "plan_name": "string",
+                "description": "string",
+                "total_weeks": 4,
+                "difficulty": "string",
+                "weeks": [
+                    {{
+                        "week_number": 1,
+                        "focus": "string",
+                        "days": [
+                            {{"day_number": 1, "day_name": "Monday", "workout_type": "string"}}
+                        ]
+                    }}
+                ]
+            }}
+            """
+    
+    @staticmethod
+    def _week_prompt(profile: str, skeleton: Dict[str, Any], week: Dict[str, Any]) -> str:
+        schedule = ', '.join(f"{day['day_name']}: {day['workout_type']}" for day in week['days'])
+        return f"""
+            Write week {week['week_number']} of a personalized workout plan for a user with the following details:
+            {profile}
+            - Plan: {skeleton.get('plan_name', '')}
+            - Week Number: {week['week_number']}
+            - Week Focus: {week['focus']}
+            - Schedule: {schedule}
+            
+            Follow the schedule exactly. Each workout should include specific exercises
+            with sets, reps, and rest periods, plus warm-up and cool-down routines.
+            Rest days have no exercises.
+            
+            Format the response as a JSON object with the following structure:
+            {{
+                "week_number": {week['week_number']},
+                "days": [
+                    {DAY_SCHEMA}
+                ]
+            }}
+            """
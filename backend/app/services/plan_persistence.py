@@ -0,0 +1,108 @@
+from app import db
+from app.models.meal import Meal, MealPlan
+from app.models.workout import WorkoutPlan, WorkoutDay
+from app.utils.ids import new_id
+from datetime import datetime
+from typing import Dict, List, Any, Tuple
+
+def build_meal_plan_rows(user_id: str, ai_plan: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Build the meal plan row and one mapping per meal from an AI plan"""
+    now = datetime.utcnow()
+    plan_id = new_id()
+    days = ai_plan.get('days', [])
+    
+    plan_row = {
+        'id': plan_id,
+        'name': ai_plan.get('plan_name', 'AI Generated Meal Plan'),
+        'description': ai_plan.get('description', ''),
+        'user_id': user_id,
+        'days_data': None,
+        'total_days': len(days),
+        'target_calories': ai_plan.get('target_calories', 2000),
+        'dietary_preference': ai_plan.get('dietary_preference', 'balanced'),
+        'is_active': True,
+        'created_at': now,
+        'updated_at': now
+    }
+    
+    meal_rows = []
+    for day_data in days:
+        day_number = day_data.get('day_number', 1)
+        for meal_data in day_data.get('meals', []):
+            meal_rows.append({
+                'id': new_id(),
+                'plan_id': plan_id,
+                'day_number': day_number,
+                'type': meal_data.get('meal_type', 'breakfast'),
+                'name': meal_data.get('name', ''),
+                'calories': meal_data.get('calories', 0),
+                'protein': meal_data.get('protein', 0),
+                'carbs': meal_data.get('carbs', 0),
+                'fat': meal_data.get('fat', 0),
+                'ingredients': meal_data.get('ingredients', []),
+                'instructions': meal_data.get('instructions', []),
+                'prep_time': meal_data.get('prep_time', 0),
+                'cook_time': meal_data.get('cook_time', 0),
+                'created_at': now,
+                'updated_at': now
+            })
+    
+    return plan_row, meal_rows
+
+def build_workout_plan_rows(user_id: str, ai_plan: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Build the workout plan row and one mapping per workout day from an AI plan"""
+    now = datetime.utcnow()
+    plan_id = new_id()
+    
+    plan_row = {
+        'id': plan_id,
+        'name': ai_plan.get('plan_name', 'AI Generated Workout Plan'),
+        'description': ai_plan.get('description', ''),
+        'user_id': user_id,
+        'days_data': None,
+        'total_weeks': ai_plan.get('total_weeks', 4),
+        'difficulty': ai_plan.get('difficulty', 'beginner'),
+        'is_active': True,
+        'created_at': now,
+        'updated_at': now
+    }
+    
+    day_rows = []
+    for week_data in ai_plan.get('weeks', []):
+        for day_data in week_data.get('days', []):
+            day_rows.append({
+                'id': new_id(),
+                'plan_id': plan_id,
+                'day_number': day_data.get('day_number', 1),
+                'name': day_data.get('day_name', 'Workout Day'),
+                'is_rest_day': day_data.get('workout_type', '').lower() == 'rest',
+                'notes': day_data.get('exercises', []),
+                'created_at': now,
+                'updated_at': now
+            })
+    
+    return plan_row, day_rows
+
+def _insert_plan(plan_table, child_table, plan_row, child_rows):
+    """Insert a plan and its children as two statements in one transaction"""
+    try:
+        db.session.execute(plan_table.insert(), [plan_row])
+        if child_rows:
+            # A list of parameter sets runs as a single executemany
+            db.session.execute(child_table.insert(), child_rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+def persist_meal_plan(user_id: str, ai_plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Store an AI meal plan and its meals, returning the plan row"""
+    plan_row, meal_rows = build_meal_plan_rows(user_id, ai_plan)
+    _insert_plan(MealPlan.__table__, Meal.__table__, plan_row, meal_rows)
+    return plan_row
+
+def persist_workout_plan(user_id: str, ai_plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Store an AI workout plan and its days, returning the plan row"""
+    plan_row, day_rows = build_workout_plan_rows(user_id, ai_plan)
+    _insert_plan(WorkoutPlan.__table__, WorkoutDay.__table__, plan_row, day_rows)
+    return plan_row
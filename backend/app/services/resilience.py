@@ -0,0 +1,270 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+import os
+import random
+import threading
+import time
+
+try:
+    from google.api_core import exceptions as google_exceptions
+    _UPSTREAM_ERRORS = (
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+        google_exceptions.TooManyRequests,
+    )
+except ImportError:
+    _UPSTREAM_ERRORS = ()
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a Gemini call does not finish within its deadline"""
+
+class CallPoolFullError(DeadlineExceededError):
+    """Raised when every call thread is still busy, usually with calls past their deadline"""
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Gemini while the circuit breaker is open"""
+
+# Errors that say the upstream is slow or unhealthy, not that the request is bad
+RETRYABLE_ERRORS = (TimeoutError, ConnectionError) + _UPSTREAM_ERRORS
+
+class CircuitBreaker:
+    """Opens after consecutive upstream failures and fails fast until reset_timeout passes
+    
+    After the timeout one trial call is let through (half-open); its outcome
+    closes the breaker again or reopens it. on_change, if set, is called with
+    a snapshot whenever the state changes.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30,
+                 on_change: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._state = 'closed'
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._rejected = 0
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+    
+    def _current_state(self) -> str:
+        if self._state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = 'half_open'
+            self._trial_in_flight = False
+        return self._state
+    
+    def allow(self) -> bool:
+        """Whether a call may go upstream now"""
+        with self._lock:
+            state = self._current_state()
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            changed = self._state != 'closed'
+            self._state = 'closed'
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+        if changed:
+            self._notify()
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            changed = False
+            if self._state == 'half_open' or self._failures >= self.failure_threshold:
+                changed = self._state != 'open'
+                self._state = 'open'
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+        if changed:
+            self._notify()
+    
+    def _notify(self):
+        if self.on_change is None:
+            return
+        try:
+            self.on_change(self.snapshot())
+        except Exception as e:
+            print(f"Error publishing circuit breaker state: {e}")
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state for /api/ai/health"""
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == 'open':
+                retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 1)
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'failure_threshold': self.failure_threshold,
+                'rejected_calls': self._rejected,
+                'retry_in_seconds': retry_in
+            }
+
+class ResilientModel:
+    """Wraps a Gemini model with a per-call deadline, jittered retries and a circuit breaker
+    
+    Calls run on a bounded thread pool so the caller stops waiting at the
+    deadline; the SDK gets the same timeout so the thread is freed soon after.
+    A thread is only counted free once its call has really returned, and a
+    call that finds every thread busy fails at once instead of queueing
+    behind calls that already timed out. A streamed call (stream=True)
+    returns a DeadlineStream, so reading the chunks is bounded by the same
+    deadline and reported to the breaker.
+    """
+    
+    def __init__(self, model, breaker: CircuitBreaker, executor: ThreadPoolExecutor, timeout: float = 30,
+                 max_retries: int = 2, backoff_base: float = 0.5, backoff_max: float = 8,
+                 slots: Optional[threading.BoundedSemaphore] = None):
+        self.model = model
+        self.breaker = breaker
+        self.executor = executor
+        # One slot per executor thread, shared by every model on the executor
+        self.slots = slots
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+    
+    def generate_content(self, prompt, **kwargs):
+        """Same signature as GenerativeModel.generate_content"""
+        if not self.breaker.allow():
+            raise CircuitOpenError('Gemini circuit breaker is open')
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._call_with_deadline(prompt, **kwargs)
+            except RETRYABLE_ERRORS:
+                if attempt == self.max_retries:
+                    self.breaker.record_failure()
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            except Exception:
+                # The upstream answered, the request itself was rejected
+                self.breaker.record_success()
+                raise
+            if kwargs.get('stream'):
+                # The breaker hears about a stream once it has been read
+                return DeadlineStream(self, response, time.monotonic() + self.timeout)
+            self.breaker.record_success()
+            return response
+    
+    def _call_with_deadline(self, prompt, **kwargs):
+        # google.generativeai gives up on the HTTP request itself at this timeout
+        kwargs.setdefault('request_options', {'timeout': self.timeout})
+        return self._run_with_deadline(self.timeout, self.model.generate_content, prompt, **kwargs)
+    
+    def _run_with_deadline(self, timeout: float, fn, *args, **kwargs):
+        if self.slots is not None:
+            if not self.slots.acquire(blocking=False):
+                raise CallPoolFullError('Every Gemini call thread is busy')
+            try:
+                future = self.executor.submit(fn, *args, **kwargs)
+            except Exception:
+                self.slots.release()
+                raise
+            # The slot frees when the call returns, not when the caller gives up on it
+            future.add_done_callback(lambda _: self.slots.release())
+        else:
+            future = self.executor.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceededError(f'Gemini call exceeded {self.timeout}s deadline')
+    
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: spread retries so workers do not hit the upstream in lockstep"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+_END_OF_STREAM = object()
+
+class DeadlineStream:
+    """Chunks of a streamed Gemini response, read under the call's deadline
+    
+    Each chunk is pulled on the call pool and the stream as a whole must
+    finish within the model's timeout, so a stalled stream frees the caller
+    instead of holding it. The outcome goes to the breaker once: a failure
+    when the stream breaks with an upstream error or runs out of time, a
+    success when it ends or the caller closes (or drops) it early.
+    """
+    
+    def __init__(self, owner: ResilientModel, response, deadline: float):
+        self._finished = False
+        self._owner = owner
+        self._deadline = deadline
+        self._chunks = iter(response)
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+        try:
+            remaining = self._deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceededError(f'Gemini call exceeded {self._owner.timeout}s deadline')
+            chunk = self._owner._run_with_deadline(remaining, next, self._chunks, _END_OF_STREAM)
+        except RETRYABLE_ERRORS:
+            self._finish(failed=True)
+            raise
+        except Exception:
+            self._finish(failed=False)
+            raise
+        if chunk is _END_OF_STREAM:
+            self._finish(failed=False)
+            raise StopIteration
+        return chunk
+    
+    def close(self):
+        """Stop reading; the chunks so far count as a healthy upstream"""
+        if not self._finished:
+            self._finish(failed=False)
+    
+    def __del__(self):
+        self.close()
+    
+    def _finish(self, failed: bool):
+        self._finished = True
+        if failed:
+            self._owner.breaker.record_failure()
+        else:
+            self._owner.breaker.record_success()
+
+# One breaker and one call pool per process, shared by every AIService instance
+GEMINI_BREAKER = CircuitBreaker(
+    failure_threshold=int(os.getenv('AI_BREAKER_FAILURES', '5')),
+    reset_timeout=float(os.getenv('AI_BREAKER_RESET_SECONDS', '30'))
+)
+_MAX_CONCURRENT_CALLS = int(os.getenv('AI_MAX_CONCURRENT_CALLS', '8'))
+GEMINI_EXECUTOR = ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_CALLS, thread_name_prefix='gemini')
+GEMINI_CALL_SLOTS = threading.BoundedSemaphore(_MAX_CONCURRENT_CALLS)
+
+def make_resilient(model) -> ResilientModel:
+    """Wrap a model using the AI_* environment settings and the shared breaker"""
+    return ResilientModel(
+        model,
+        breaker=GEMINI_BREAKER,
+        executor=GEMINI_EXECUTOR,
+        slots=GEMINI_CALL_SLOTS,
+        timeout=float(os.getenv('AI_TIMEOUT_SECONDS', '30')),
+        max_retries=int(os.getenv('AI_MAX_RETRIES', '2')),
+        backoff_base=float(os.getenv('AI_RETRY_BACKOFF_SECONDS', '0.5'))
+    )
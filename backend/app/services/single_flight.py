@@ -0,0 +1,67 @@
+from typing import Any, Callable, Dict, Optional
+import os
+import threading
+import time
+import uuid
+
+class SingleFlight:
+    """Collapses concurrent calls that share a key into one upstream call
+    
+    Plans are generated by the job workers, each running one job at a time,
+    so identical requests meet in different processes. The first caller
+    takes a lease on the key in the lease store (the shared AI cache); the
+    others wait for the lease to clear and then read the leader's result
+    from the cache, so a burst of identical requests across the worker pool
+    still costs one Gemini call. A waiter gets the finished plan at once and
+    none of the leader's partial progress. Without a lease store every call
+    runs fn.
+    """
+    
+    def __init__(self, lease_store=None, lease_seconds: float = 120, poll_interval: float = 0.05):
+        self.lease_store = lease_store
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._leaders = 0
+        self._coalesced = 0
+    
+    def do(self, key: str, fn: Callable[[], Any], lookup: Optional[Callable[[], Any]] = None) -> Any:
+        """Run fn unless another caller holds the lease on key
+        
+        lookup is how a waiter fetches the result once the leader finishes;
+        if it returns None the waiter calls fn itself.
+        """
+        if self.lease_store is None:
+            return self._call_upstream(fn)
+        
+        owner = f'{os.getpid()}-{uuid.uuid4().hex}'
+        if not self.lease_store.acquire_lease(key, owner, self.lease_seconds):
+            # Another caller is generating this key; wait for it to finish
+            deadline = time.monotonic() + self.lease_seconds
+            while self.lease_store.lease_active(key) and time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+            result = lookup() if lookup else None
+            if result is not None:
+                with self._lock:
+                    self._coalesced += 1
+                return result
+            # The leader failed or its result was not cacheable
+            return self._call_upstream(fn)
+        
+        try:
+            return self._call_upstream(fn)
+        finally:
+            self.lease_store.release_lease(key, owner)
+    
+    def _call_upstream(self, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._leaders += 1
+        return fn()
+    
+    def stats(self) -> Dict[str, int]:
+        """Calls that ran fn vs calls served by another caller's result, in this process"""
+        with self._lock:
+            return {
+                'leader_calls': self._leaders,
+                'coalesced': self._coalesced
+            }
@@ -0,0 +1,312 @@
+from app import db
+from app.models.workout import Exercise
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import threading
+import time
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Keywords in Exercise.muscles mapped to the groups weekly volume is balanced over
+# (checked in order, so 'lateral deltoid' is a shoulder muscle before 'lat' matches)
+MUSCLE_GROUPS = {
+    'chest': 'chest', 'pec': 'chest',
+    'shoulder': 'shoulders', 'delt': 'shoulders',
+    'back': 'back', 'lat': 'back', 'trap': 'back', 'rhomboid': 'back',
+    'bicep': 'arms', 'tricep': 'arms', 'forearm': 'arms', 'arm': 'arms',
+    'quad': 'legs', 'hamstring': 'legs', 'glute': 'legs', 'calf': 'legs', 'calves': 'legs', 'leg': 'legs',
+    'core': 'core', 'abs': 'core', 'abdominal': 'core', 'oblique': 'core',
+}
+
+# Muscle groups each session type trains, in priority order
+SESSION_GROUPS = {
+    'Full Body': ['legs', 'chest', 'back', 'shoulders', 'core', 'arms'],
+    'Upper Body': ['chest', 'back', 'shoulders', 'arms'],
+    'Lower Body': ['legs', 'core'],
+    'Push': ['chest', 'shoulders', 'arms'],
+    'Pull': ['back', 'arms', 'core'],
+    'Legs': ['legs', 'core'],
+}
+
+# Weekly split by training days; beginners stay on full-body sessions up to three days
+SPLITS = {
+    1: ['Full Body'],
+    2: ['Full Body', 'Full Body'],
+    3: ['Push', 'Pull', 'Legs'],
+    4: ['Upper Body', 'Lower Body', 'Upper Body', 'Lower Body'],
+    5: ['Push', 'Pull', 'Legs', 'Upper Body', 'Lower Body'],
+    6: ['Push', 'Pull', 'Legs', 'Push', 'Pull', 'Legs'],
+}
+
+# Weekly hard sets per muscle group and sets per exercise
+WEEKLY_SETS = {'beginner': 8, 'intermediate': 12, 'advanced': 16}
+SETS_PER_EXERCISE = {'beginner': 3, 'intermediate': 3, 'advanced': 4}
+
+# (reps, rest seconds) by fitness goal
+REP_SCHEMES = {
+    'strength': ('4-6', 150),
+    'muscle_gain': ('8-12', 90),
+    'weight_loss': ('12-15', 45),
+    'endurance': ('15-20', 45),
+}
+DEFAULT_REP_SCHEME = ('10-12', 60)
+
+BODYWEIGHT = {'', 'none', 'bodyweight', 'body weight', 'mat'}
+
+class CatalogExercise(NamedTuple):
+    name: str
+    groups: Tuple[str, ...]
+    muscles: Tuple[str, ...]
+    equipment: str
+    exercise_type: str
+    instructions: str
+
+def _groups(muscles) -> Tuple[str, ...]:
+    groups = []
+    for muscle in muscles:
+        muscle = str(muscle).lower()
+        for keyword, group in MUSCLE_GROUPS.items():
+            if keyword in muscle and group not in groups:
+                groups.append(group)
+                break
+    return tuple(groups)
+
+def _entry(name, muscles, equipment, exercise_type, instructions='') -> CatalogExercise:
+    return CatalogExercise(name, _groups(muscles), tuple(muscles), equipment, exercise_type, instructions)
+
+# Bodyweight catalog used when the Exercise table has nothing that fits
+BUILTIN_CATALOG = [
+    _entry('Push-ups', ['chest', 'triceps', 'shoulders'], 'bodyweight', 'strength',
+           'Keep your body straight and lower until chest nearly touches floor'),
+    _entry('Incline Push-ups', ['chest', 'shoulders'], 'bodyweight', 'strength', 'Hands on a bench, body in one line'),
+    _entry('Pike Push-ups', ['shoulders', 'triceps'], 'bodyweight', 'strength', 'Hips high, lower the head toward the floor'),
+    _entry('Inverted Rows', ['back', 'biceps'], 'bodyweight', 'strength', 'Pull the chest to a sturdy table edge'),
+    _entry('Superman Hold', ['lower back', 'glutes'], 'bodyweight', 'strength', 'Lift arms and legs, hold, lower slowly'),
+    _entry('Bench Dips', ['triceps', 'chest'], 'bodyweight', 'strength', 'Lower until elbows reach 90 degrees'),
+    _entry('Squats', ['quadriceps', 'glutes'], 'bodyweight', 'strength', 'Lower until thighs are parallel to floor'),
+    _entry('Reverse Lunges', ['quadriceps', 'glutes', 'hamstrings'], 'bodyweight', 'strength',
+           'Step back and lower the back knee toward the floor'),
+    _entry('Glute Bridges', ['glutes', 'hamstrings'], 'bodyweight', 'strength', 'Drive through the heels, squeeze at the top'),
+    _entry('Calf Raises', ['calves'], 'bodyweight', 'strength', 'Rise onto the toes, lower under control'),
+    _entry('Plank', ['core', 'abs'], 'bodyweight', 'strength', 'Hold a straight line from head to heels'),
+    _entry('Dead Bugs', ['core', 'abs'], 'bodyweight', 'strength', 'Keep the lower back pressed to the floor'),
+    _entry('Side Plank', ['obliques', 'core'], 'bodyweight', 'strength', 'Stack the feet and lift the hips'),
+    _entry('Jumping Jacks', ['full body'], 'bodyweight', 'cardio', 'Keep a steady rhythm'),
+    _entry('Mountain Climbers', ['core', 'shoulders'], 'bodyweight', 'cardio', 'Drive the knees toward the chest quickly'),
+    _entry('High Knees', ['legs'], 'bodyweight', 'cardio', 'Run in place lifting the knees to hip height'),
+]
+
+CATALOG_TTL_SECONDS = 300
+
+_catalog_lock = threading.Lock()
+_catalog: Optional[List[CatalogExercise]] = None
+_catalog_loaded_at = 0.0
+
+def load_catalog() -> List[CatalogExercise]:
+    """Distinct exercises from the Exercise table, cached per process for a few minutes"""
+    global _catalog, _catalog_loaded_at
+    with _catalog_lock:
+        if _catalog is not None and time.monotonic() - _catalog_loaded_at < CATALOG_TTL_SECONDS:
+            return _catalog
+        
+        rows = db.session.query(
+            Exercise.name, Exercise.muscles, Exercise.equipment, Exercise.exercise_type, Exercise.instructions
+        ).all()
+        catalog, seen = [], set()
+        for name, muscles, equipment, exercise_type, instructions in rows:
+            if name.lower() in seen:
+                continue
+            seen.add(name.lower())
+            steps = instructions or []
+            catalog.append(_entry(
+                name, muscles or [], (equipment or '').lower(),
+                (exercise_type or '').lower(), ' '.join(steps) if isinstance(steps, list) else str(steps)
+            ))
+        _catalog = catalog
+        _catalog_loaded_at = time.monotonic()
+        return catalog
+
+def user_data_from_preferences(preferences) -> Dict[str, Any]:
+    """Engine inputs stored on UserPreferences"""
+    if preferences is None:
+        return {}
+    return {
+        'available_equipment': preferences.get_available_equipment(),
+        'workout_types': preferences.get_workout_types(),
+        'workout_duration': preferences.workout_duration,
+        'difficulty': preferences.difficulty_level,
+    }
+
+class WorkoutPlanEngine:
+    """Deterministic rule-based workout plans from the exercise catalog
+    
+    Picks a split for the number of training days, allots each session's
+    exercise slots to whichever of its muscle groups is furthest below the
+    weekly set target, and rotates through the exercises the user's
+    equipment allows. Weeks 2 and 3 add volume and week 4 is a deload.
+    The same inputs and catalog always give the same plan.
+    """
+    
+    def __init__(self, catalog: Optional[List[CatalogExercise]] = None):
+        self._catalog = catalog
+    
+    def catalog(self) -> List[CatalogExercise]:
+        if self._catalog is not None:
+            return self._catalog
+        try:
+            return load_catalog()
+        except Exception as e:
+            # No app context or no table yet; the builtin catalog still gives a plan
+            print(f"Error loading exercise catalog: {e}")
+            return []
+    
+    def generate(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a 4-week plan in the same shape as the AI plans"""
+        days_per_week = max(1, min(7, int(user_data.get('days_per_week') or 3)))
+        difficulty = user_data.get('difficulty') or 'beginner'
+        if difficulty not in WEEKLY_SETS:
+            difficulty = 'beginner'
+        duration = int(user_data.get('workout_duration') or user_data.get('duration') or 30)
+        goal = user_data.get('fitness_goal') or 'general_fitness'
+        equipment = user_data.get('available_equipment') or user_data.get('equipment') or []
+        workout_types = [str(t).lower() for t in user_data.get('workout_types') or []]
+        
+        candidates = self._candidates(equipment)
+        sessions = self._split(days_per_week, difficulty)
+        training_days = sorted({round(i * 7 / days_per_week) for i in range(days_per_week)})
+        reps, rest_seconds = REP_SCHEMES.get(goal, DEFAULT_REP_SCHEME)
+        finisher = goal in ('weight_loss', 'endurance') or 'cardio' in workout_types
+        layout = self._allocate(sessions, duration, SETS_PER_EXERCISE[difficulty], difficulty)
+        
+        weeks = []
+        for week_number in range(1, 5):
+            # Weeks 2-3 add a set to the first exercise of each session, week 4 deloads
+            sets = SETS_PER_EXERCISE[difficulty] - (1 if week_number == 4 else 0)
+            rotation: Dict[str, int] = {}
+            days = []
+            for index, day_name in enumerate(DAY_NAMES):
+                if index not in training_days:
+                    days.append({
+                        'day_number': index + 1, 'day_name': day_name, 'workout_type': 'rest',
+                        'duration_minutes': 0, 'exercises': [], 'warm_up': [], 'cool_down': []
+                    })
+                    continue
+                
+                session = training_days.index(index)
+                exercises = []
+                used = set()
+                for slot, group in enumerate(layout[session]):
+                    pick = self._pick(candidates['strength'], group, rotation, used, week_number)
+                    used.add(pick.name)
+                    exercises.append(self._prescribe(
+                        pick, sets + (1 if slot == 0 and week_number in (2, 3) else 0), reps, rest_seconds
+                    ))
+                if finisher and candidates['cardio']:
+                    pick = candidates['cardio'][(week_number + session) % len(candidates['cardio'])]
+                    exercises.append(self._prescribe(pick, 3, '40 seconds', 20))
+                
+                days.append({
+                    'day_number': index + 1,
+                    'day_name': day_name,
+                    'workout_type': sessions[session],
+                    'duration_minutes': duration,
+                    'exercises': exercises,
+                    'warm_up': ['5 minutes light cardio', 'Dynamic stretches', 'Mobility for the muscles trained today'],
+                    'cool_down': ['Static stretching', 'Deep breathing']
+                })
+            weeks.append({'week_number': week_number, 'days': days})
+        
+        return {
+            'plan_name': f"{goal.replace('_', ' ').title()} {days_per_week}-Day Plan",
+            'description': f"A {difficulty} {days_per_week}-day split built from the exercise library, "
+                           f"balanced for weekly volume per muscle group.",
+            'total_weeks': 4,
+            'difficulty': difficulty,
+            'weeks': weeks
+        }
+    
+    def _candidates(self, equipment) -> Dict[str, Dict[str, List[CatalogExercise]]]:
+        """Allowed exercises by type and muscle group, falling back to the builtin catalog per group"""
+        available = {str(item).lower().rstrip('s') for item in equipment}
+        
+        def allowed(exercise: CatalogExercise) -> bool:
+            gear = exercise.equipment.rstrip('s')
+            return gear in BODYWEIGHT or any(gear in item or item in gear for item in available if item)
+        
+        strength: Dict[str, List[CatalogExercise]] = {}
+        for source in (self.catalog(), BUILTIN_CATALOG):
+            primary: Dict[str, List[CatalogExercise]] = {}
+            secondary: Dict[str, List[CatalogExercise]] = {}
+            for exercise in source:
+                if exercise.exercise_type == 'cardio' or not allowed(exercise):
+                    continue
+                for position, group in enumerate(exercise.groups):
+                    (secondary if position else primary).setdefault(group, []).append(exercise)
+            # Exercises that mainly train the group come before ones that also hit it
+            for group in set(primary) | set(secondary):
+                strength.setdefault(group, primary.get(group, []) + secondary.get(group, []))
+        
+        cardio = [e for e in self.catalog() if e.exercise_type == 'cardio' and allowed(e)]
+        return {
+            'strength': strength,
+            'cardio': cardio or [e for e in BUILTIN_CATALOG if e.exercise_type == 'cardio']
+        }
+    
+    @staticmethod
+    def _split(days_per_week: int, difficulty: str) -> List[str]:
+        if difficulty == 'beginner' and days_per_week <= 3:
+            return ['Full Body'] * days_per_week
+        if days_per_week == 7:
+            return SPLITS[6] + ['Full Body']
+        return list(SPLITS[days_per_week])
+    
+    @staticmethod
+    def _allocate(sessions: List[str], duration: int, sets: int, difficulty: str) -> List[List[str]]:
+        """Muscle group for every exercise slot, filling the largest weekly deficit first
+        
+        A session stops short of its time budget (but keeps three exercises)
+        once every group it trains has reached the weekly target.
+        """
+        # Warm-up and cool-down take ten minutes; each set is about 45s of work plus rest
+        slots = max(3, min(8, int((duration - 10) // (sets * 2))))
+        target = WEEKLY_SETS[difficulty]
+        volume = {group: 0 for group in SESSION_GROUPS['Full Body']}
+        layout = []
+        for session in sessions:
+            groups = SESSION_GROUPS[session]
+            chosen = []
+            for _ in range(slots):
+                # Ties go to the group listed first for the session
+                group = max(groups, key=lambda g: (target - volume[g] - sets * chosen.count(g), -groups.index(g)))
+                if len(chosen) >= 3 and target - volume[group] - sets * chosen.count(group) <= 0:
+                    break
+                chosen.append(group)
+            for group in chosen:
+                volume[group] += sets
+            layout.append(chosen)
+        return layout
+    
+    @staticmethod
+    def _pick(candidates: Dict[str, List[CatalogExercise]], group: str, rotation: Dict[str, int],
+              used: set, week_number: int) -> CatalogExercise:
+        """Next exercise for the group, skipping ones already in this session"""
+        options = candidates.get(group) or [e for e in BUILTIN_CATALOG if group in e.groups]
+        start = rotation.get(group, 0) + (week_number - 1) // 2
+        for offset in range(len(options)):
+            exercise = options[(start + offset) % len(options)]
+            if exercise.name not in used:
+                rotation[group] = rotation.get(group, 0) + offset + 1
+                return exercise
+        rotation[group] = rotation.get(group, 0) + 1
+        return options[start % len(options)]
+    
+    @staticmethod
+    def _prescribe(exercise: CatalogExercise, sets: int, reps: str, rest_seconds: int) -> Dict[str, Any]:
+        return {
+            'name': exercise.name,
+            'sets': sets,
+            'reps': reps,
+            'rest_seconds': rest_seconds,
+            'instructions': exercise.instructions,
+            'muscles_targeted': list(exercise.muscles),
+            'equipment': exercise.equipment or 'bodyweight'
+        }
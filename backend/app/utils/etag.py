@@ -0,0 +1,60 @@
+from flask import request, make_response
+from sqlalchemy import func, select
+from app import db
+import hashlib
+
+# Bump when a response shape changes so clients drop their old copies
+ETAG_VERSION = 1
+
+def make_etag(kind: str, row_id: str, version: int, updated_at, child_count=None, children_updated_at=None) -> str:
+    """Strong ETag for one row's representation
+    
+    Built from the row's version and updated_at and, for a row served with
+    its children, their count and latest updated_at, so adding, editing or
+    deleting a child changes it too.
+    """
+    stamp = updated_at.isoformat() if updated_at else ''
+    if child_count is not None:
+        latest = children_updated_at.isoformat() if children_updated_at else ''
+        stamp = f'{stamp}:{child_count}:{latest}'
+    return hashlib.sha1(f'{ETAG_VERSION}:{kind}:{row_id}:{version}:{stamp}'.encode()).hexdigest()
+
+def not_modified(kind: str, model, child_key=None, **filters):
+    """A 304 response if the client's If-None-Match still matches the row, else None
+    
+    Reads only the id, version and updated_at columns, plus the count and
+    latest updated_at of the children whose foreign key is child_key, so a
+    revalidation that hits skips loading the row, its children and the
+    serialization.
+    """
+    if not request.if_none_match:
+        return None
+    columns = [model.id, model.version, model.updated_at]
+    if child_key is not None:
+        child = child_key.class_
+        columns += [
+            select(func.count()).select_from(child).where(child_key == model.id).scalar_subquery(),
+            select(func.max(child.updated_at)).where(child_key == model.id).scalar_subquery()
+        ]
+    stamp = db.session.query(*columns).filter_by(**filters).first()
+    if stamp is None:
+        return None
+    etag = make_etag(kind, *stamp)
+    if not request.if_none_match.contains(etag):
+        return None
+    response = make_response('', 304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def with_etag(response, kind: str, row, children=None):
+    """Tag a full response with the row's ETag; clients must revalidate before reuse
+    
+    Pass every child row served with it when the 304 check uses child_key.
+    """
+    stamp = (row.id, row.version, row.updated_at)
+    if children is not None:
+        stamp += (len(children), max((child.updated_at for child in children if child.updated_at), default=None))
+    response.set_etag(make_etag(kind, *stamp))
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+import os
+import time
+import uuid
+
+# Crockford base32, the ULID alphabet
+_CROCKFORD = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+def _timestamp_ms(when: Optional[datetime] = None) -> int:
+    """Milliseconds since the epoch; naive datetimes are treated as UTC"""
+    if when is None:
+        return time.time_ns() // 1_000_000
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return int(when.timestamp() * 1000)
+
+def ulid(when: Optional[datetime] = None) -> str:
+    """26 character ULID: 48-bit millisecond timestamp + 80 random bits
+    
+    Sorts lexicographically by creation time, so new rows land at the
+    right-hand edge of the primary key index.
+    """
+    value = (_timestamp_ms(when) << 80) | int.from_bytes(os.urandom(10), 'big')
+    chars = []
+    for _ in range(26):
+        chars.append(_CROCKFORD[value & 0x1F])
+        value >>= 5
+    return ''.join(reversed(chars))
+
+def uuid7(when: Optional[datetime] = None) -> str:
+    """RFC 9562 UUIDv7 in canonical 36 character form"""
+    value = (_timestamp_ms(when) & 0xFFFFFFFFFFFF) << 80
+    value |= int.from_bytes(os.urandom(10), 'big') & ((1 << 80) - 1)
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
+
+def uuid4(when: Optional[datetime] = None) -> str:
+    """Random UUID, the previous ID scheme"""
+    return str(uuid.uuid4())
+
+ID_GENERATORS: Dict[str, Callable[[Optional[datetime]], str]] = {
+    'ulid': ulid,
+    'uuid7': uuid7,
+    'uuid4': uuid4
+}
+
+_generator = ulid
+
+def set_id_generator(name: str) -> None:
+    """Switch the generator used by new_id()"""
+    global _generator
+    if name not in ID_GENERATORS:
+        raise ValueError(f"Unknown ID generator '{name}', expected one of {sorted(ID_GENERATORS)}")
+    _generator = ID_GENERATORS[name]
+
+set_id_generator(os.getenv('ID_GENERATOR', 'ulid'))
+
+def new_id(when: Optional[datetime] = None) -> str:
+    """Generate a primary key with the configured generator"""
+    return _generator(when)
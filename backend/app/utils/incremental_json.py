@@ -0,0 +1,163 @@
+from typing import Any, Iterable, List, Optional, Tuple, Union
+import json
+
+Path = Tuple[Union[str, int], ...]
+
+class _Frame:
+    __slots__ = ('kind', 'start', 'path', 'key', 'index', 'expect_key')
+    
+    def __init__(self, kind: str, start: int, path: Path):
+        self.kind = kind
+        self.start = start
+        self.path = path
+        self.key: Optional[str] = None
+        self.index = 0
+        self.expect_key = kind == '{'
+    
+    def child_path(self) -> Path:
+        return self.path + ((self.key,) if self.kind == '{' else (self.index,))
+
+def _matches(path: Path, pattern: Path) -> bool:
+    return len(path) == len(pattern) and all(p == '*' or p == s for s, p in zip(path, pattern))
+
+class IncrementalJSONParser:
+    """Parses one JSON value from LLM output as it streams in
+    
+    feed() returns (path, value) for every object or array whose path
+    matches one of the emit patterns as soon as it closes, e.g.
+    ('weeks', '*') yields each week of a plan. Text around the value
+    (```json fences, chatter) is skipped, trailing commas are dropped,
+    and finish() closes whatever a truncated stream left open.
+    """
+    
+    def __init__(self, emit: Iterable[Path] = ()):
+        self.emit = tuple(emit)
+        self.started = False
+        self.done = False
+        self.repaired = False
+        self._out: List[str] = []
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._pending_comma = False
+        self._root: Any = None
+        # Longest prefix known to be valid once the open containers are closed
+        self._safe: Tuple[int, str] = (0, '')
+    
+    def _closers(self) -> str:
+        return ''.join('}' if frame.kind == '{' else ']' for frame in reversed(self._stack))
+    
+    def _mark_safe(self):
+        self._safe = (len(self._out), self._closers())
+    
+    def feed(self, chunk: str) -> List[Tuple[Path, Any]]:
+        """Consume more text and return the values completed by it"""
+        events: List[Tuple[Path, Any]] = []
+        out = self._out
+        for c in chunk:
+            if self.done:
+                break
+            if not self.started:
+                if c not in '{[':
+                    continue
+                self.started = True
+                self._stack.append(_Frame(c, 0, ()))
+                out.append(c)
+                self._mark_safe()
+                continue
+            
+            if self._in_string:
+                out.append(c)
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._string_is_key:
+                        self._stack[-1].key = json.loads(''.join(out[self._string_start:]))
+                    else:
+                        self._mark_safe()
+                continue
+            
+            if c in ' \t\r\n':
+                continue
+            if c == ',':
+                self._pending_comma = True
+                self._mark_safe()
+                continue
+            if c in '}]':
+                # A comma right before a closer is dropped
+                self._pending_comma = False
+                self._close(events)
+                continue
+            
+            if self._pending_comma:
+                out.append(',')
+                self._pending_comma = False
+                frame = self._stack[-1]
+                if frame.kind == '[':
+                    frame.index += 1
+                else:
+                    frame.expect_key = True
+            
+            frame = self._stack[-1]
+            if c == ':':
+                frame.expect_key = False
+                out.append(c)
+            elif c == '"':
+                self._in_string = True
+                self._string_is_key = frame.kind == '{' and frame.expect_key
+                self._string_start = len(out)
+                out.append(c)
+            elif c in '{[':
+                self._stack.append(_Frame(c, len(out), frame.child_path()))
+                out.append(c)
+                self._mark_safe()
+            else:
+                out.append(c)
+        return events
+    
+    def _close(self, events: List[Tuple[Path, Any]]):
+        frame = self._stack.pop()
+        # Close with the right bracket even if the model used the wrong one
+        self._out.append('}' if frame.kind == '{' else ']')
+        if not self._stack:
+            self.done = True
+            self._root = json.loads(''.join(self._out))
+            return
+        if any(_matches(frame.path, pattern) for pattern in self.emit):
+            events.append((frame.path, json.loads(''.join(self._out[frame.start:]))))
+        self._mark_safe()
+    
+    def finish(self) -> Any:
+        """The parsed value, repairing a truncated stream; ValueError if nothing was found"""
+        if self.done:
+            return self._root
+        if not self.started:
+            raise ValueError('No JSON value in AI response')
+        
+        self.repaired = True
+        text = ''.join(self._out)
+        candidates = []
+        if self._in_string and not self._string_is_key:
+            # Keep a cut-off string value, minus any dangling escape
+            candidates.append(text[:-1] + '"' if self._escape else text + '"')
+        elif not self._in_string:
+            candidates.append(text)
+        for candidate in candidates:
+            try:
+                return json.loads(candidate + self._closers())
+            except ValueError:
+                pass
+        # Fall back to the last point where every value was complete
+        length, closers = self._safe
+        return json.loads(''.join(self._out[:length]) + closers)
+
+def repair_json(text: str) -> Any:
+    """Parse the first JSON value in text, closing it if the text was truncated"""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.finish()
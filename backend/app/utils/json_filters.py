@@ -0,0 +1,29 @@
+from sqlalchemy import func, cast, Text
+from app import db
+from typing import List
+import json
+
+def json_array_contains(column, value: str):
+    """SQL predicate: the JSON list in column has value as an element (case-insensitive)
+    
+    Expands the list with json_each (SQLite JSON1) or
+    json_array_elements_text (PostgreSQL) in a correlated EXISTS, so the
+    database filters rows without shipping them to Python. Negate with ~
+    for "does not contain"; a NULL list contains nothing.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        elements = func.json_each(column).table_valued('value')
+    elif dialect == 'postgresql':
+        elements = func.json_array_elements_text(column).table_valued('value')
+    else:
+        # No table-valued JSON function; match the encoded element in the text
+        return func.lower(cast(column, Text)).contains(json.dumps(value.lower()))
+    return db.select(1).select_from(elements).where(func.lower(elements.c.value) == value.lower()).exists()
+
+def list_arg(args, name: str) -> List[str]:
+    """Values of a list query argument, given repeated or comma-separated"""
+    values = []
+    for raw in args.getlist(name):
+        values.extend(item.strip() for item in raw.split(',') if item.strip())
+    return values
@@ -0,0 +1,82 @@
+from sqlalchemy import tuple_
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import json
+
+# Page sizes outside 1..MAX_PER_PAGE are clamped
+MAX_PER_PAGE = 100
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+def encode_cursor(sort_value: datetime, row_id: str) -> str:
+    """Encode the last row's (sort value, id) pair as an opaque cursor"""
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), str(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError('Invalid cursor') from e
+
+def keyset_paginate(query, model, sort_attr: str, cursor: Optional[str], per_page: int) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page newest-first, seeking past the cursor instead of using OFFSET
+    
+    Orders by (sort_attr, id) descending and reads one extra row to learn
+    whether another page exists, so no COUNT(*) is issued.
+    """
+    sort_column = getattr(model, sort_attr)
+    per_page = clamp_per_page(per_page)
+    
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(sort_column, model.id) < tuple_(sort_value, row_id))
+    
+    rows = query.order_by(sort_column.desc(), model.id.desc()).limit(per_page + 1).all()
+    items = rows[:per_page]
+    
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_attr), last.id)
+    
+    return items, next_cursor
+
+def clamp_per_page(per_page: int) -> int:
+    """Keep a requested page size within 1..MAX_PER_PAGE"""
+    return max(1, min(per_page, MAX_PER_PAGE))
+
+def paginate_query(query, model, sort_attr: str, args) -> Tuple[List[Any], Dict[str, Any]]:
+    """Paginate a list query using cursor mode when a cursor argument is given
+    
+    Without a cursor the classic page/per_page mode (OFFSET plus COUNT) is
+    kept for existing clients. Pass cursor= (empty) to request the first
+    cursor page. per_page is clamped to 1..MAX_PER_PAGE in both modes.
+    """
+    per_page = clamp_per_page(args.get('per_page', 10, type=int))
+    
+    if 'cursor' in args:
+        items, next_cursor = keyset_paginate(query, model, sort_attr, args.get('cursor'), per_page)
+        return items, {
+            'per_page': per_page,
+            'next_cursor': next_cursor,
+            'has_next': next_cursor is not None
+        }
+    
+    page = args.get('page', 1, type=int)
+    pages = query.order_by(getattr(model, sort_attr).desc())\
+        .paginate(page=page, per_page=per_page, error_out=False)
+    
+    return pages.items, {
+        'page': page,
+        'per_page': per_page,
+        'total': pages.total,
+        'pages': pages.pages,
+        'has_next': pages.has_next,
+        'has_prev': pages.has_prev
+    }
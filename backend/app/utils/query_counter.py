@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from typing import Iterator, List, Optional
+
+class QueryCountError(AssertionError):
+    """Raised when a block issues a different number of queries than expected"""
+
+class QueryCounter:
+    """Records every statement executed on an engine while it is active"""
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: List[str] = []
+    
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+    
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+    
+    def __enter__(self) -> 'QueryCounter':
+        event.listen(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return False
+
+@contextmanager
+def assert_num_queries(engine, expected: Optional[int] = None, max_queries: Optional[int] = None) -> Iterator[QueryCounter]:
+    """Fail if the block issues other than `expected` (or more than `max_queries`) statements
+    
+    Usage:
+        with assert_num_queries(db.engine, expected=2):
+            client.get('/api/workouts/library', headers=headers)
+    """
+    with QueryCounter(engine) as counter:
+        yield counter
+    
+    if expected is not None and counter.count != expected:
+        raise QueryCountError(_describe(counter, f'expected {expected}'))
+    if max_queries is not None and counter.count > max_queries:
+        raise QueryCountError(_describe(counter, f'expected at most {max_queries}'))
+
+def _describe(counter: QueryCounter, expectation: str) -> str:
+    """Build a failure message listing the statements that ran"""
+    lines = [f'{counter.count} queries executed, {expectation}:']
+    lines.extend(f'  {i}. {statement}' for i, statement in enumerate(counter.statements, 1))
+    return '\n'.join(lines)
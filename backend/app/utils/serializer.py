@@ -0,0 +1,76 @@
+from flask import current_app
+from sqlalchemy import inspect
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class FieldPlan:
+    """Which fields of a model to serialize, compiled once on first use
+    
+    Rows are read as plain column tuples (no ORM instances) and zipped
+    with the field names; computed fields reuse the model's own
+    properties, evaluated against the row. datetime and date values are
+    left as they are for dumps() to encode.
+    """
+    
+    def __init__(self, model, fields: Optional[Sequence[str]] = None, computed: Sequence[str] = ()):
+        self.model = model
+        self.fields = tuple(fields) if fields else None
+        self.computed = tuple(computed)
+        self._compiled = None
+    
+    def _compile(self):
+        if self._compiled is None:
+            keys = self.fields or tuple(attr.key for attr in inspect(self.model).column_attrs)
+            columns = tuple(getattr(self.model, key) for key in keys)
+            properties = tuple((name, getattr(self.model, name).fget) for name in self.computed)
+            self._compiled = (keys, columns, properties)
+        return self._compiled
+    
+    def rows(self, query) -> List[Dict[str, Any]]:
+        """Run a query over the model and return its rows as dicts"""
+        keys, columns, properties = self._compile()
+        rows = query.with_entities(*columns).all()
+        if not properties:
+            return [dict(zip(keys, row)) for row in rows]
+        items = []
+        for row in rows:
+            item = dict(zip(keys, row))
+            # Properties read plain attributes off a view sharing the item's dict
+            view = _RowView()
+            view.__dict__ = item
+            for name, compute in properties:
+                item[name] = compute(view)
+            items.append(item)
+        return items
+    
+    def dump(self, instance) -> Dict[str, Any]:
+        """One loaded instance as a dict, with the same fields as rows()"""
+        keys, _, properties = self._compile()
+        item = {key: getattr(instance, key) for key in keys}
+        for name, compute in properties:
+            item[name] = compute(instance)
+        return item
+
+class _RowView:
+    """Attribute access over a row dict, for evaluating model properties"""
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+def dumps(payload) -> bytes:
+    """Compact JSON bytes; datetimes and dates as ISO 8601, like isoformat()"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':'), default=_default).encode()
+
+def json_response(payload, status: int = 200):
+    """jsonify() replacement that encodes with dumps()"""
+    return current_app.response_class(dumps(payload), status=status, mimetype='application/json')
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Parse, persist and serialize timings for recorded Gemini responses
+
+Record a cassette against the real API with AI_BACKEND=record, or build
+one offline with --record-fake, then replay every recorded plan through
+the same code the job workers run.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+import statistics
+
+# Every call must reach the model so it is recorded
+os.environ['AI_CACHE_ENABLED'] = 'false'
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database, create_user
+from app.models.meal import MealPlan
+from app.models.workout import WorkoutPlan
+from app.services.ai_service import AIService
+from app.services.ai_cassette import Cassette, CassetteModel
+from app.services.fake_gemini import FakeGenerativeModel
+from app.services.plan_persistence import persist_meal_plan, persist_workout_plan
+from app.services.single_flight import SingleFlight
+
+def record_fake(cassette, count):
+    """Record workout and meal plans for varied inputs from the offline stand-in"""
+    service = AIService()
+    service.flights = SingleFlight()
+    service.model = CassetteModel(cassette, 'record', model=FakeGenerativeModel('fixed:0', token_ms=0, seed=1))
+    for i in range(count):
+        if i % 2:
+            service.generate_meal_plan({'target_calories': 1800 + i * 10, 'days': 7})
+        else:
+            service.generate_workout_plan({'days_per_week': 3 + i % 4, 'workout_duration': 30 + i})
+
+def check_replay(cassette, entries):
+    """Replaying each prompt must return exactly the recorded text"""
+    model = CassetteModel(cassette, 'replay', latency_scale=0)
+    return sum(1 for entry in entries if model.generate_content(entry['prompt']).text != entry['text'])
+
+def run_benchmark(cassette, repeats):
+    service = AIService()
+    entries = list(cassette.entries())
+    mismatches = check_replay(cassette, entries)
+    
+    reset_database()
+    user_id = create_user()
+    timings = {'parse': [], 'persist': [], 'serialize': []}
+    sizes = []
+    skipped = 0
+    
+    for entry in entries:
+        try:
+            plan = service._extract_json(entry['text'])
+        except ValueError:
+            skipped += 1
+            continue
+        if 'weeks' in plan:
+            persist, model = persist_workout_plan, WorkoutPlan
+        elif 'days' in plan:
+            persist, model = persist_meal_plan, MealPlan
+        else:
+            skipped += 1
+            continue
+        sizes.append(len(entry['text']))
+        
+        for _ in range(repeats):
+            started = time.perf_counter()
+            plan = service._extract_json(entry['text'])
+            parsed = time.perf_counter()
+            row = persist(user_id, plan)
+            persisted = time.perf_counter()
+            app.json.dumps(db.session.get(model, row['id']).to_dict())
+            serialized = time.perf_counter()
+            
+            timings['parse'].append(parsed - started)
+            timings['persist'].append(persisted - parsed)
+            timings['serialize'].append(serialized - persisted)
+            db.session.expunge_all()
+    
+    recorded = [sum(entry['delays']) for entry in entries]
+    print(f"{len(entries)} recordings ({len(sizes)} plans, {skipped} other), "
+          f"median payload {statistics.median(sizes) / 1024 if sizes else 0:.1f} KiB, "
+          f"recorded latency p50 {statistics.median(recorded) * 1000 if recorded else 0:.0f}ms")
+    print(f"{'stage':>10} {'p50 ms':>8} {'max ms':>8}")
+    for stage, values in timings.items():
+        if values:
+            print(f"{stage:>10} {statistics.median(values) * 1000:>8.2f} {max(values) * 1000:>8.2f}")
+    
+    if mismatches:
+        print(f"\n❌ {mismatches} recordings did not replay byte for byte")
+        sys.exit(1)
+    print('\n✅ Every recording replayed byte for byte')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cassette replay benchmark')
+    parser.add_argument('--cassette', help='Cassette file (default: a throwaway one)')
+    parser.add_argument('--record-fake', type=int, default=0, help='Record this many plans from the offline stand-in first')
+    parser.add_argument('--repeats', type=int, default=5, help='Times each recording is processed')
+    
+    args = parser.parse_args()
+    path = args.cassette or os.path.join(tempfile.gettempdir(), 'fitai_cassette.db')
+    with app.app_context():
+        cassette = Cassette(path)
+        if args.record_fake:
+            record_fake(cassette, args.record_fake)
+        if not len(cassette):
+            print(f"❌ {path} has no recordings; use --record-fake or AI_BACKEND=record")
+            sys.exit(1)
+        run_benchmark(cassette, args.repeats)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-byte of the blocking chat call vs the SSE chat stream
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app
+from app.api import ai_simple
+
+class ScriptedChunk:
+    def __init__(self, text):
+        self.text = text
+
+class ScriptedResponse:
+    """Stands in for a streamed GenerateContentResponse"""
+    
+    def __init__(self, chunks, first_token_delay, token_delay):
+        self.chunks = chunks
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+    
+    def __iter__(self):
+        for i, text in enumerate(self.chunks):
+            time.sleep(self.first_token_delay if i == 0 else self.token_delay)
+            yield ScriptedChunk(text)
+    
+    @property
+    def text(self):
+        return ''.join(chunk.text for chunk in self)
+
+class ScriptedModel:
+    """Gemini model that replays fixed timings instead of calling the API"""
+    
+    def __init__(self, chunk_count, first_token_delay, token_delay):
+        self.chunks = [f'token{i} ' for i in range(chunk_count)]
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+    
+    def generate_content(self, prompt, stream=False):
+        return ScriptedResponse(self.chunks, self.first_token_delay, self.token_delay)
+
+def blocking_ttfb():
+    """Seconds until the blocking call has anything to send"""
+    started = time.perf_counter()
+    ai_simple.ai_service.chat_with_ai('How many rest days do I need?')
+    return time.perf_counter() - started
+
+def streaming_ttfb(client):
+    """Seconds until the first SSE frame arrives, plus the total stream time"""
+    started = time.perf_counter()
+    response = client.post('/api/ai/chat/stream', json={'message': 'How many rest days do I need?'},
+                           buffered=False)
+    frames = iter(response.response)
+    next(frames)
+    first = time.perf_counter() - started
+    for _ in frames:
+        pass
+    response.close()
+    return first, time.perf_counter() - started
+
+def run_benchmark(chunk_count, first_token_ms, token_ms, repeats):
+    """Compare both paths against the same scripted model"""
+    ai_simple.ai_service.model = ScriptedModel(chunk_count, first_token_ms / 1000, token_ms / 1000)
+    client = app.test_client()
+    
+    blocking = [blocking_ttfb() for _ in range(repeats)]
+    streaming = [streaming_ttfb(client) for _ in range(repeats)]
+    
+    print(f"model: {chunk_count} chunks, first after {first_token_ms}ms, then every {token_ms}ms")
+    print(f"{'path':>10} {'TTFB ms':>10} {'total ms':>10}")
+    print(f"{'blocking':>10} {statistics.median(blocking) * 1000:>10.1f} {statistics.median(blocking) * 1000:>10.1f}")
+    print(f"{'stream':>10} {statistics.median(s[0] for s in streaming) * 1000:>10.1f} "
+          f"{statistics.median(s[1] for s in streaming) * 1000:>10.1f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Chat time-to-first-byte benchmark')
+    parser.add_argument('--chunks', type=int, default=40, help='Chunks in each scripted reply')
+    parser.add_argument('--first-token-ms', type=int, default=400, help='Delay before the first chunk')
+    parser.add_argument('--token-ms', type=int, default=25, help='Delay between later chunks')
+    parser.add_argument('--repeats', type=int, default=5, help='Runs per path')
+    
+    args = parser.parse_args()
+    run_benchmark(args.chunks, args.first_token_ms, args.token_ms, args.repeats)
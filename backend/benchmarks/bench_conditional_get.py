@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Full responses vs 304 revalidations for the plan endpoints: latency,
+queries and bytes per poll, and that writes change the ETag
+
+The profile, goals and preferences endpoints are tagged the same way but
+their full responses read fields the user models do not have (age,
+workout_frequency, dietary_preference, ...), so they are not measured.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database, create_user
+from app.models.user import UserGoals, UserPreferences
+from app.models.meal import Meal
+from app.models.workout import WorkoutPlan, WorkoutDay
+from app.services.plan_persistence import persist_meal_plan, persist_workout_plan
+from app.services.workout_engine import WorkoutPlanEngine
+from app.utils.ids import new_id
+from app.utils.query_counter import QueryCounter
+from flask_jwt_extended import create_access_token
+
+def seed_user_data(user_id, days):
+    """Goals, preferences, a 4-week workout plan and a meal plan with wordy recipes"""
+    db.session.add(UserGoals(
+        id=new_id(), user_id=user_id, fitness_goal='muscle_gain', current_weight=75, target_weight=80,
+        height=180, body_type='ectomorph', target_calories=2800, target_protein=160, target_carbs=330,
+        target_fat=90, activity_level='active', target_date=date.today() + timedelta(days=120)
+    ))
+    db.session.add(UserPreferences(id=new_id(), user_id=user_id, allergies=['nuts']))
+    db.session.commit()
+    
+    workout_plan = persist_workout_plan(user_id, WorkoutPlanEngine(catalog=[]).generate({'days_per_week': 5}))
+    meal_plan = persist_meal_plan(user_id, {
+        'plan_name': 'Bulk', 'target_calories': 2800,
+        'days': [
+            {
+                'day_number': day,
+                'meals': [
+                    {
+                        'meal_type': meal_type, 'name': f'{meal_type.title()} {day}', 'calories': 700,
+                        'protein': 40, 'carbs': 80, 'fat': 22,
+                        'ingredients': [f'{100 + i} g ingredient {i}' for i in range(12)],
+                        'instructions': [f'Step {i}: prepare and cook with care' for i in range(8)],
+                        'prep_time': 15, 'cook_time': 20
+                    }
+                    for meal_type in ('breakfast', 'lunch', 'snack', 'dinner')
+                ]
+            }
+            for day in range(1, days + 1)
+        ]
+    })
+    return workout_plan['id'], meal_plan['id']
+
+def poll(client, url, headers, repeats):
+    """Mean ms, queries and body bytes per request"""
+    latencies, queries = [], []
+    for _ in range(repeats):
+        with QueryCounter(db.engine) as counter:
+            started = time.perf_counter()
+            response = client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - started)
+        queries.append(counter.count)
+        db.session.expunge_all()
+    return response, statistics.mean(latencies) * 1000, statistics.mean(queries), len(response.data)
+
+def run_benchmark(days, repeats):
+    with app.app_context():
+        reset_database()
+        user_id = create_user()
+        workout_id, meal_plan_id = seed_user_data(user_id, days)
+        headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+        client = app.test_client()
+        
+        urls = [f'/api/workouts/{workout_id}', f'/api/meals/{meal_plan_id}']
+        print(f"{'endpoint':<24} {'200 ms':>7} {'304 ms':>7} {'queries':>8} {'bytes':>13}")
+        failures = 0
+        for url in urls:
+            full, full_ms, full_queries, full_bytes = poll(client, url, headers, repeats)
+            etag = full.headers.get('ETag')
+            if full.status_code != 200 or not etag:
+                print(f"❌ {url} returned {full.status_code} without an ETag: {full.get_json()}")
+                failures += 1
+                continue
+            revalidated, ms, queries, body = poll(client, url, dict(headers, **{'If-None-Match': etag}), repeats)
+            if revalidated.status_code != 304 or revalidated.headers.get('ETag') != etag:
+                print(f"❌ {url} revalidation returned {revalidated.status_code}")
+                failures += 1
+                continue
+            name = url if len(url) < 24 else url[:url.rindex('/')] + '/<id>'
+            print(f"{name:<24} {full_ms:>7.2f} {ms:>7.2f} {full_queries:>3.0f} -> {queries:<2.0f} "
+                  f"{full_bytes:>6} -> {body:<3}")
+        
+        # A write to the plan or to any of its days or meals must invalidate the client's copy
+        workout_url, meal_url = f'/api/workouts/{workout_id}', f'/api/meals/{meal_plan_id}'
+        first_day = lambda: WorkoutDay.query.filter_by(plan_id=workout_id).first()
+        first_meal = lambda: Meal.query.filter_by(plan_id=meal_plan_id).first()
+        writes = [
+            ('workout plan update', workout_url,
+             lambda: setattr(db.session.get(WorkoutPlan, workout_id), 'description', 'Renamed plan')),
+            ('workout day update', workout_url, lambda: setattr(first_day(), 'name', 'Renamed day')),
+            ('meal bulk update', meal_url, lambda: Meal.query.filter_by(id=first_meal().id)
+                .update({'calories': 650}, synchronize_session=False)),
+            ('meal delete', meal_url, lambda: db.session.delete(first_meal())),
+        ]
+        for label, url, write in writes:
+            etag = client.get(url, headers=headers).headers['ETag']
+            write()
+            db.session.commit()
+            after = client.get(url, headers=dict(headers, **{'If-None-Match': etag}))
+            if after.status_code != 200 or after.headers['ETag'] == etag:
+                print(f"❌ {label} kept the old ETag ({after.status_code})")
+                failures += 1
+            db.session.expunge_all()
+        
+        if failures:
+            sys.exit(1)
+        print("\n✅ Every endpoint revalidates with 304 and a write changes its ETag")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Conditional GET benchmark')
+    parser.add_argument('--days', type=int, default=7, help='Days in the seeded meal plan')
+    parser.add_argument('--repeats', type=int, default=200, help='Requests per endpoint and mode')
+    
+    args = parser.parse_args()
+    run_benchmark(args.days, args.repeats)
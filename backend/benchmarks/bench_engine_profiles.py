@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Concurrent read/write benchmark comparing SQLite engine profiles
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+import tempfile
+import threading
+import argparse
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from db_profiles import SQLITE_PROFILES, get_engine_options, configure_engine
+
+SCHEMA = """
+CREATE TABLE nutrition_logs (
+    id VARCHAR(50) PRIMARY KEY,
+    user_id VARCHAR(50) NOT NULL,
+    calories INTEGER NOT NULL,
+    protein INTEGER NOT NULL,
+    logged_at DATETIME
+)
+"""
+
+def build_engine(profile, path):
+    """Create an engine for a fresh database file using the profile"""
+    if os.path.exists(path):
+        os.remove(path)
+    uri = f'sqlite:///{path}'
+    engine = create_engine(uri, **get_engine_options(uri, profile))
+    configure_engine(engine, profile)
+    with engine.begin() as conn:
+        conn.execute(text(SCHEMA))
+        conn.execute(text('CREATE INDEX ix_logs_user ON nutrition_logs (user_id, logged_at)'))
+    return engine
+
+def writer(engine, stop, results, users):
+    """Insert a few log rows per transaction, like a burst of meal logging"""
+    stats = {'writes': 0, 'write_errors': 0}
+    while not stop.is_set():
+        try:
+            with engine.begin() as conn:
+                user_id = random.choice(users)
+                for _ in range(5):
+                    conn.execute(text(
+                        'INSERT INTO nutrition_logs (id, user_id, calories, protein, logged_at) '
+                        'VALUES (:id, :user_id, :calories, :protein, :logged_at)'
+                    ), {
+                        'id': str(uuid.uuid4()),
+                        'user_id': user_id,
+                        'calories': random.randint(50, 800),
+                        'protein': random.randint(0, 60),
+                        'logged_at': datetime.utcnow()
+                    })
+            stats['writes'] += 1
+        except OperationalError:
+            stats['write_errors'] += 1
+    results.append(stats)
+
+def reader(engine, stop, results, users):
+    """Run the dashboard's per-user aggregate"""
+    stats = {'reads': 0, 'read_errors': 0}
+    while not stop.is_set():
+        try:
+            with engine.connect() as conn:
+                conn.execute(text(
+                    'SELECT SUM(calories), SUM(protein), COUNT(*) FROM nutrition_logs WHERE user_id = :user_id'
+                ), {'user_id': random.choice(users)}).fetchone()
+            stats['reads'] += 1
+        except OperationalError:
+            stats['read_errors'] += 1
+    results.append(stats)
+
+def run_profile(profile, writers, readers, seconds):
+    """Run the mixed workload against one profile and return its counters"""
+    path = os.path.join(tempfile.gettempdir(), f'fitai_profile_{profile}.db')
+    engine = build_engine(profile, path)
+    users = [str(uuid.uuid4()) for _ in range(20)]
+    stop = threading.Event()
+    results = []
+    
+    threads = [threading.Thread(target=writer, args=(engine, stop, results, users)) for _ in range(writers)]
+    threads += [threading.Thread(target=reader, args=(engine, stop, results, users)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    
+    engine.dispose()
+    
+    stats = {'writes': 0, 'reads': 0, 'write_errors': 0, 'read_errors': 0}
+    for thread_stats in results:
+        for key, value in thread_stats.items():
+            stats[key] += value
+    return stats
+
+def run_benchmark(writers, readers, seconds):
+    """Compare every profile under the same workload"""
+    print(f"⚙️  {writers} writers, {readers} readers, {seconds}s per profile")
+    print(f"{'profile':>12} {'writes/s':>10} {'reads/s':>10} {'write errs':>11} {'read errs':>10}")
+    for profile in SQLITE_PROFILES:
+        stats = run_profile(profile, writers, readers, seconds)
+        print(f"{profile:>12} {stats['writes'] / seconds:>10,.0f} {stats['reads'] / seconds:>10,.0f} "
+              f"{stats['write_errors']:>11} {stats['read_errors']:>10}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='SQLite engine profile benchmark')
+    parser.add_argument('--writers', type=int, default=4, help='Concurrent writer threads')
+    parser.add_argument('--readers', type=int, default=8, help='Concurrent reader threads')
+    parser.add_argument('--seconds', type=int, default=10, help='Duration per profile')
+    
+    args = parser.parse_args()
+    run_benchmark(args.writers, args.readers, args.seconds)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Insert and lookup benchmark for random vs time-ordered primary keys
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import argparse
+from datetime import datetime
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app
+from sqlalchemy import create_engine, select
+from app.models.meal import NutritionLog
+from app.utils.ids import ID_GENERATORS
+
+def make_rows(generator, count):
+    """Build nutrition log rows keyed by the generator"""
+    now = datetime.utcnow()
+    return [
+        {
+            'id': generator(None),
+            'user_id': 'bench-user',
+            'meal_name': 'Benchmark Meal',
+            'meal_type': 'snack',
+            'quantity': 1.0,
+            'unit': 'serving',
+            'calories': random.randint(50, 800),
+            'protein': random.randint(0, 60),
+            'carbs': random.randint(0, 100),
+            'fat': random.randint(0, 40),
+            'logged_at': now,
+            'created_at': now,
+            'updated_at': now
+        }
+        for _ in range(count)
+    ]
+
+def run_generator(name, rows, batch_size, lookups):
+    """Insert rows in committed batches, then time random point lookups"""
+    path = os.path.join(tempfile.gettempdir(), f'fitai_ids_{name}.db')
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f'sqlite:///{path}')
+    table = NutritionLog.__table__
+    table.create(engine)
+    
+    data = make_rows(ID_GENERATORS[name], rows)
+    started = time.perf_counter()
+    for start in range(0, rows, batch_size):
+        with engine.begin() as conn:
+            conn.execute(table.insert(), data[start:start + batch_size])
+    insert_seconds = time.perf_counter() - started
+    
+    sample = random.sample([row['id'] for row in data], lookups)
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        for row_id in sample:
+            conn.execute(select(table.c.id).where(table.c.id == row_id)).fetchone()
+    lookup_seconds = time.perf_counter() - started
+    
+    engine.dispose()
+    return {
+        'inserts_per_second': rows / insert_seconds,
+        'lookups_per_second': lookups / lookup_seconds,
+        'file_mb': os.path.getsize(path) / 1024 / 1024,
+        'key_length': len(data[0]['id'])
+    }
+
+def run_benchmark(rows, batch_size, lookups):
+    """Compare every registered ID generator"""
+    print(f"🔑 {rows:,} rows in batches of {batch_size}, {lookups:,} lookups")
+    print(f"{'generator':>10} {'key len':>8} {'inserts/s':>11} {'lookups/s':>11} {'file MB':>8}")
+    for name in ID_GENERATORS:
+        stats = run_generator(name, rows, batch_size, lookups)
+        print(f"{name:>10} {stats['key_length']:>8} {stats['inserts_per_second']:>11,.0f} "
+              f"{stats['lookups_per_second']:>11,.0f} {stats['file_mb']:>8.1f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Primary key generator benchmark')
+    parser.add_argument('--rows', type=int, default=500000, help='Rows inserted per generator')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per committed transaction')
+    parser.add_argument('--lookups', type=int, default=20000, help='Random point lookups per generator')
+    
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.batch_size, args.lookups)
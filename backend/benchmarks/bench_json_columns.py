@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Load and to_dict throughput for models with JSON-in-TEXT list columns:
+the old mapping (plain TEXT, getters that json.loads on every call)
+against the JSONText column type, which decodes once when a row loads,
+on a first (load + to_dict) and a repeated to_dict pass
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import uuid
+import argparse
+from types import FunctionType
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database, create_user
+from app.models.meal import Meal
+from app.models.workout import Workout, Exercise, WorkoutPlan
+from sqlalchemy import MetaData, Text
+from sqlalchemy.orm import registry
+
+# Getter name -> TEXT column for the JSON lists the benchmarked to_dict methods decode
+GETTERS = {
+    Meal: {'get_ingredients': 'ingredients', 'get_instructions': 'instructions'},
+    Exercise: {'get_instructions': 'instructions', 'get_tips': 'tips'},
+    WorkoutPlan: {'get_days_data': 'days_data'},
+}
+
+def legacy_getter(column):
+    """The getter every model used before JSONText"""
+    def getter(self):
+        raw = getattr(self, column)
+        if raw:
+            return json.loads(raw)
+        return []
+    return getter
+
+def legacy_model(model, getters, mapper_registry):
+    """The model mapped the old way: its JSON list columns as plain TEXT"""
+    table = model.__table__.to_metadata(MetaData())
+    for column in getters.values():
+        table.c[column].type = Text()
+    methods = {name: value for name, value in vars(model).items()
+               if isinstance(value, (FunctionType, property, staticmethod, classmethod)) and not name.startswith('_')}
+    methods.update({name: legacy_getter(column) for name, column in getters.items()})
+    legacy = type(f'Legacy{model.__name__}', (), methods)
+    mapper_registry.map_imperatively(legacy, table)
+    return legacy
+
+def seed(rows):
+    user_id = create_user()
+    now_rows = {'meals': [], 'exercises': [], 'plans': []}
+    workout_id = str(uuid.uuid4())
+    db.session.add(Workout(id=workout_id, name='Full body', type='strength', difficulty='beginner', duration=45))
+    for i in range(rows):
+        now_rows['meals'].append({
+            'id': str(uuid.uuid4()), 'name': f'Meal {i}', 'type': 'lunch', 'calories': 600, 'protein': 40,
+            'carbs': 60, 'fat': 20, 'prep_time': 10, 'cook_time': 20, 'is_custom': False,
+            'ingredients': [f'{50 + j} g ingredient {j}' for j in range(12)],
+            'instructions': [f'Step {j}: prepare and cook with care' for j in range(8)],
+            'dietary_tags': ['high_protein', 'gluten_free'],
+            'allergens': ['dairy']
+        })
+        now_rows['exercises'].append({
+            'id': str(uuid.uuid4()), 'workout_id': workout_id, 'name': f'Exercise {i}', 'category': 'strength',
+            'equipment': 'dumbbells', 'exercise_type': 'strength',
+            'instructions': [f'Cue {j}: keep the core braced' for j in range(6)],
+            'tips': ['Breathe out on the way up', 'Control the negative'],
+            'muscles': ['chest', 'triceps', 'shoulders']
+        })
+        if i % 20 == 0:
+            now_rows['plans'].append({
+                'id': str(uuid.uuid4()), 'name': f'Plan {i}', 'user_id': user_id, 'total_weeks': 4,
+                'difficulty': 'intermediate', 'version': 1,
+                'days_data': [
+                    {'day': day, 'exercises': [{'name': f'Exercise {j}', 'sets': 4, 'reps': '8-10'}
+                                               for j in range(6)]}
+                    for day in range(28)
+                ]
+            })
+    db.session.execute(Meal.__table__.insert(), now_rows['meals'])
+    db.session.execute(Exercise.__table__.insert(), now_rows['exercises'])
+    db.session.execute(WorkoutPlan.__table__.insert(), now_rows['plans'])
+    db.session.commit()
+
+def time_passes(model, passes):
+    """Rows per second for loading plus a first to_dict pass, and for a repeated pass"""
+    db.session.expunge_all()
+    gc.collect()
+    started = time.perf_counter()
+    rows = db.session.query(model).all()
+    first = [row.to_dict() for row in rows]
+    cold = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(passes):
+        again = [row.to_dict() for row in rows]
+    warm = (time.perf_counter() - started) / passes
+    if json.dumps(first, sort_keys=True) != json.dumps(again, sort_keys=True):
+        raise AssertionError(f'{model.__name__}.to_dict changed between passes')
+    return len(rows), len(rows) / cold, len(rows) / warm, first
+
+def run_benchmark(rows, passes):
+    with app.app_context():
+        reset_database()
+        seed(rows)
+        mapper_registry = registry()
+        print(f"{'model':<12} {'rows':>6} {'load + first pass rows/s':>25} {'repeat pass rows/s':>21}")
+        print(f"{'':<12} {'':>6} {'legacy':>12} {'JSONText':>12} {'legacy':>10} {'JSONText':>10}")
+        for model, getters in GETTERS.items():
+            legacy = legacy_model(model, getters, mapper_registry)
+            count, legacy_cold, legacy_warm, legacy_dicts = time_passes(legacy, passes)
+            count, cold, warm, dicts = time_passes(model, passes)
+            if json.dumps(dicts, sort_keys=True) != json.dumps(legacy_dicts, sort_keys=True):
+                print(f"❌ {model.__name__}.to_dict output differs from the legacy getters")
+                sys.exit(1)
+            print(f"{model.__name__:<12} {count:>6} {legacy_cold:>12,.0f} {cold:>12,.0f} "
+                  f"{legacy_warm:>10,.0f} {warm:>10,.0f}")
+        
+        # In-place edits must reach the column and flush like any other change
+        meal = Meal.query.first()
+        meal.get_ingredients().append('1 pinch salt')
+        db.session.commit()
+        meal_id = meal.id
+        db.session.expunge_all()
+        if db.session.get(Meal, meal_id).get_ingredients()[-1] != '1 pinch salt':
+            print("❌ Appending to a decoded list was not saved")
+            sys.exit(1)
+        print("\n✅ Same to_dict output as the legacy getters, and in-place edits are saved")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='JSON column to_dict benchmark')
+    parser.add_argument('--rows', type=int, default=5000, help='Meals and exercises to seed')
+    parser.add_argument('--passes', type=int, default=5, help='Repeated to_dict passes per model')
+    
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.passes)
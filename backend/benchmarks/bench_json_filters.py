@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tag, allergen and muscle filters on the library endpoints: decoding every
+row in Python against json_each predicates in SQL, checking both return
+the same meals and workouts
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database, create_user
+from app.models.meal import Meal
+from app.models.workout import Workout, Exercise
+from app.utils.ids import new_id
+from app.utils.json_filters import json_array_contains
+from flask_jwt_extended import create_access_token
+
+TAGS = ['vegan', 'vegetarian', 'high_protein', 'low_carb', 'gluten_free', 'keto', 'paleo']
+ALLERGENS = ['nuts', 'dairy', 'gluten', 'soy', 'eggs', 'shellfish']
+MUSCLES = ['chest', 'back', 'glutes', 'quadriceps', 'hamstrings', 'shoulders', 'biceps', 'triceps', 'core']
+
+def seed(meal_count, workout_count, rng):
+    now = datetime.utcnow()
+    meals = [{
+        'id': new_id(), 'name': f'Meal {i}', 'type': rng.choice(['breakfast', 'lunch', 'dinner', 'snack']),
+        'calories': 500, 'protein': 30, 'carbs': 50, 'fat': 20, 'prep_time': 10, 'cook_time': 10,
+        'ingredients': ['oats', 'milk'], 'instructions': ['Mix', 'Serve'],
+        'dietary_tags': [tag for tag in TAGS if rng.random() < 0.25],
+        'allergens': [allergen for allergen in ALLERGENS if rng.random() < 0.2],
+        'is_custom': False, 'created_at': now - timedelta(seconds=i), 'updated_at': now
+    } for i in range(meal_count)]
+    db.session.execute(Meal.__table__.insert(), meals)
+    
+    workouts, exercises = [], []
+    for i in range(workout_count):
+        workout_id = new_id()
+        workouts.append({
+            'id': workout_id, 'name': f'Workout {i}', 'type': 'strength', 'difficulty': 'beginner',
+            'duration': 40, 'body_parts': rng.sample(['upper', 'lower', 'core', 'full'], 2), 'is_custom': False,
+            'created_at': now - timedelta(seconds=i), 'updated_at': now
+        })
+        exercises.extend({
+            'id': new_id(), 'workout_id': workout_id, 'name': f'Exercise {i}.{j}', 'category': 'strength',
+            'equipment': 'dumbbells', 'exercise_type': 'strength', 'muscles': rng.sample(MUSCLES, 2),
+            'created_at': now, 'updated_at': now
+        } for j in range(5))
+    db.session.execute(Workout.__table__.insert(), workouts)
+    db.session.execute(Exercise.__table__.insert(), exercises)
+    db.session.commit()
+
+def timed(fn, repeats):
+    latencies = []
+    for _ in range(repeats):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        result = fn()
+        latencies.append(time.perf_counter() - started)
+    return result, statistics.median(latencies) * 1000
+
+def meals_in_python(tag, allergen):
+    """The old way: load the whole library and decode every row"""
+    return {
+        meal.id for meal in Meal.query.filter(Meal.plan_id.is_(None)).all()
+        if tag in meal.get_dietary_tags() and allergen not in meal.get_allergens()
+    }
+
+def meals_in_sql(tag, allergen):
+    query = Meal.query.filter(
+        Meal.plan_id.is_(None),
+        json_array_contains(Meal.dietary_tags, tag),
+        ~json_array_contains(Meal.allergens, allergen)
+    )
+    return {meal_id for meal_id, in query.with_entities(Meal.id)}
+
+def workouts_in_python(muscle):
+    return {
+        workout.id for workout in Workout.query.all()
+        if any(muscle in exercise.get_muscles() for exercise in workout.exercises)
+    }
+
+def workouts_in_sql(muscle):
+    query = Workout.query.filter(Workout.exercises.any(json_array_contains(Exercise.muscles, muscle)))
+    return {workout_id for workout_id, in query.with_entities(Workout.id)}
+
+def run_benchmark(meal_count, workout_count, repeats):
+    with app.app_context():
+        reset_database()
+        user_id = create_user()
+        seed(meal_count, workout_count, random.Random(1))
+        
+        print(f"{meal_count} meals, {workout_count} workouts with 5 exercises each")
+        print(f"{'filter':<32} {'matches':>8} {'python ms':>10} {'sql ms':>8}")
+        cases = [
+            ('vegan meals without nuts', meals_in_python, meals_in_sql, ('vegan', 'nuts')),
+            ('keto meals without dairy', meals_in_python, meals_in_sql, ('keto', 'dairy')),
+            ('workouts for glutes', workouts_in_python, workouts_in_sql, ('glutes',)),
+        ]
+        for name, in_python, in_sql, args in cases:
+            expected, python_ms = timed(lambda: in_python(*args), repeats)
+            found, sql_ms = timed(lambda: in_sql(*args), repeats)
+            if found != expected:
+                print(f"❌ {name}: SQL returned {len(found)} rows, Python {len(expected)}")
+                sys.exit(1)
+            print(f"{name:<32} {len(found):>8} {python_ms:>10.1f} {sql_ms:>8.1f}")
+        
+        # The endpoints apply the same predicates and report the filtered total
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+        response = client.get('/api/meals/library?tags=VEGAN&exclude_allergens=nuts&per_page=20', headers=headers)
+        total = response.get_json()['data']['pagination']['total']
+        if response.status_code != 200 or total != len(meals_in_python('vegan', 'nuts')):
+            print(f"❌ /api/meals/library returned {response.status_code} with total {total}")
+            sys.exit(1)
+        response = client.get('/api/workouts/library?muscles=glutes&include_exercises=false', headers=headers)
+        total = response.get_json()['data']['pagination']['total']
+        if response.status_code != 200 or total != len(workouts_in_python('glutes')):
+            print(f"❌ /api/workouts/library returned {response.status_code} with total {total}")
+            sys.exit(1)
+        print("\n✅ SQL filters match the Python filters on the models and the library endpoints")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='JSON list filter benchmark')
+    parser.add_argument('--meals', type=int, default=20000, help='Library meals to seed')
+    parser.add_argument('--workouts', type=int, default=2000, help='Library workouts to seed')
+    parser.add_argument('--repeats', type=int, default=5, help='Runs per filter, median reported')
+    
+    args = parser.parse_args()
+    run_benchmark(args.meals, args.workouts, args.repeats)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+7-day meal plan latency, macro accuracy and variety of the catalog
+meal plan optimizer at several catalog sizes
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database
+from app.models.meal import Meal
+from app.services import meal_optimizer
+from app.services.meal_optimizer import MealPlanOptimizer, macro_targets
+from app.services.plan_persistence import build_meal_plan_rows
+from app.utils.ids import new_id
+
+TAGS = ['vegetarian', 'vegan', 'gluten-free', 'dairy-free', 'high-protein', 'low-carb', 'keto']
+ALLERGENS = ['nuts', 'dairy', 'gluten', 'eggs', 'soy', 'shellfish', 'fish']
+# Meal type, share of the catalog and typical calories
+TYPES = [('breakfast', 25, 450), ('lunch', 30, 650), ('dinner', 30, 750), ('snack', 15, 200)]
+
+SCENARIOS = [
+    ('2000 kcal, 3 meals', {'target_calories': 2000, 'meal_types': 3}),
+    ('2600 kcal, 4 meals, vegetarian, no nuts', {
+        'target_calories': 2600, 'target_protein': 170, 'target_carbs': 290, 'target_fat': 85,
+        'meal_types': 4, 'dietary_preference': ['vegetarian'], 'allergies': ['nuts']
+    }),
+    ('1800 kcal, 5 meals, dairy-free, 30 min', {
+        'target_calories': 1800, 'meal_types': 5, 'dietary_preference': 'dairy-free',
+        'cooking_time': '30 minutes'
+    }),
+]
+
+def seed_catalog(size, seed=1):
+    """Insert size library meals with random macros, tags and allergens"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(size):
+        meal_type, _, calories = rng.choices(TYPES, weights=[share for _, share, _ in TYPES])[0]
+        calories *= rng.uniform(0.5, 1.5)
+        protein_share, fat_share = rng.uniform(0.1, 0.45), rng.uniform(0.15, 0.45)
+        carbs_share = max(0.05, 1 - protein_share - fat_share)
+        rows.append({
+            'id': new_id(), 'name': f'{meal_type.title()} {i + 1}', 'type': meal_type,
+            'calories': int(calories), 'protein': int(calories * protein_share / 4),
+            'carbs': int(calories * carbs_share / 4), 'fat': int(calories * fat_share / 9),
+            'ingredients': [f'ingredient {rng.randrange(200)}' for _ in range(4)],
+            'instructions': ['Prepare', 'Cook', 'Serve'],
+            'prep_time': rng.randrange(5, 25), 'cook_time': rng.randrange(0, 40),
+            'dietary_tags': [tag for tag in TAGS if rng.random() < 0.25],
+            'allergens': [allergen for allergen in ALLERGENS if rng.random() < 0.15],
+            'is_custom': False, 'created_at': now, 'updated_at': now
+        })
+    db.session.execute(Meal.__table__.insert(), rows)
+    db.session.commit()
+
+def check_constraints(plan, user_data, meals):
+    """Every meal respects the allergies and dietary tags"""
+    allergies = set(user_data.get('allergies', []))
+    preference = user_data.get('dietary_preference') or []
+    required = {preference} if isinstance(preference, str) else set(preference)
+    for day in plan['days']:
+        for meal in day['meals']:
+            tags, allergens = meals[meal['meal_id']]
+            assert not allergies & allergens, f"{meal['name']} contains {allergies & allergens}"
+            assert required <= tags, f"{meal['name']} is not {required - tags}"
+
+def plan_quality(plan, user_data):
+    """Mean absolute daily deviation from the targets in percent, and share of distinct meals"""
+    targets = macro_targets(user_data)
+    deviation = {
+        macro: statistics.mean(abs(day[f'total_{macro}'] - targets[macro]) / targets[macro] * 100
+                               for day in plan['days'])
+        for macro in ('calories', 'protein', 'carbs', 'fat')
+    }
+    picks = [meal['meal_id'] for day in plan['days'] for meal in day['meals']]
+    return deviation, len(set(picks)) / len(picks)
+
+def run_size(size, repeats):
+    reset_database()
+    seed_catalog(size)
+    meals = {
+        meal_id: (set(tags), set(allergens))
+        for meal_id, tags, allergens in db.session.query(Meal.id, Meal.dietary_tags, Meal.allergens)
+    }
+    
+    meal_optimizer._catalog = None
+    started = time.perf_counter()
+    meal_optimizer.load_meal_catalog()
+    load_ms = (time.perf_counter() - started) * 1000
+    optimizer = MealPlanOptimizer()
+    
+    print(f"\ncatalog of {size} meals: arrays built in {load_ms:.0f}ms (cached for "
+          f"{meal_optimizer.CATALOG_TTL_SECONDS}s)")
+    print(f"  {'scenario':<40} {'p50 ms':>7} {'max ms':>7} {'kcal %':>7} {'prot %':>7} "
+          f"{'carb %':>7} {'fat %':>7} {'distinct':>9}")
+    for label, scenario in SCENARIOS:
+        user_data = dict(scenario, days=7)
+        latencies = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            plan = optimizer.generate(user_data)
+            latencies.append(time.perf_counter() - started)
+        
+        assert plan is not None, f'no plan for {label}'
+        assert plan == optimizer.generate(dict(user_data)), 'optimizer is not deterministic'
+        check_constraints(plan, user_data, meals)
+        _, meal_rows = build_meal_plan_rows('bench-user', plan)
+        assert len(meal_rows) == sum(len(day['meals']) for day in plan['days'])
+        
+        deviation, distinct = plan_quality(plan, user_data)
+        print(f"  {label:<40} {statistics.median(latencies) * 1000:>7.2f} {max(latencies) * 1000:>7.2f} "
+              f"{deviation['calories']:>7.1f} {deviation['protein']:>7.1f} {deviation['carbs']:>7.1f} "
+              f"{deviation['fat']:>7.1f} {distinct:>8.0%}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Catalog meal plan optimizer benchmark')
+    parser.add_argument('--sizes', default='1000,10000,50000', help='Comma-separated catalog sizes')
+    parser.add_argument('--repeats', type=int, default=20, help='Plans per scenario')
+    
+    args = parser.parse_args()
+    if meal_optimizer.np is None:
+        print('❌ NumPy is not installed; the optimizer is disabled')
+        sys.exit(1)
+    with app.app_context():
+        for size in (int(size) for size in args.sizes.split(',')):
+            run_size(size, args.repeats)
+    print('\n✅ All plans respect allergies and dietary tags')
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark Python-side, SQL-side and rollup daily nutrition totals
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import datetime, date, timedelta
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database, create_user, create_meal, seed_nutrition_logs
+from sqlalchemy import func
+from app.models.meal import NutritionLog
+from app.api.nutrition import _get_daily_totals
+from app.services.nutrition_rollup import rebuild_rollups
+
+def python_totals(user_id, start_datetime, end_datetime):
+    """Previous implementation: load every row and sum in Python"""
+    logs = NutritionLog.query.filter(
+        NutritionLog.user_id == user_id,
+        NutritionLog.consumed_at >= start_datetime,
+        NutritionLog.consumed_at < end_datetime
+    ).all()
+    return {
+        'calories': sum(log.calories for log in logs),
+        'protein': sum(log.protein for log in logs),
+        'carbs': sum(log.carbs for log in logs),
+        'fat': sum(log.fat for log in logs),
+        'entries': len(logs)
+    }
+
+def sql_totals(user_id, start_datetime, end_datetime):
+    """Single SUM ... GROUP BY over the day's log rows"""
+    totals = db.session.query(
+        func.coalesce(func.sum(NutritionLog.calories), 0).label('calories'),
+        func.coalesce(func.sum(NutritionLog.protein), 0).label('protein'),
+        func.coalesce(func.sum(NutritionLog.carbs), 0).label('carbs'),
+        func.coalesce(func.sum(NutritionLog.fat), 0).label('fat'),
+        func.count(NutritionLog.id).label('entries')
+    ).filter(
+        NutritionLog.user_id == user_id,
+        NutritionLog.consumed_at >= start_datetime,
+        NutritionLog.consumed_at < end_datetime
+    ).group_by(NutritionLog.user_id).first()
+    return dict(totals._mapping)
+
+def rollup_totals(user_id, start_datetime, end_datetime):
+    """Read the maintained rollup row used by the API"""
+    return _get_daily_totals(user_id, start_datetime.date())
+
+def time_call(func, iterations, *args):
+    """Return the mean time per call in milliseconds"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        result = func(*args)
+        db.session.expunge_all()
+    elapsed = time.perf_counter() - started
+    return elapsed / iterations * 1000, result
+
+def run_benchmark(rows_per_day, days, iterations):
+    """Seed a heavy logger and compare both aggregation paths"""
+    with app.app_context():
+        reset_database()
+        user_id = create_user()
+        meal_id = create_meal(user_id)
+        
+        today = date.today()
+        print(f"🌱 Seeding {rows_per_day} logs/day for {days} days...")
+        for offset in range(days):
+            seed_nutrition_logs(user_id, meal_id, today - timedelta(days=offset), rows_per_day)
+        
+        rebuild_rollups(user_id)
+        
+        start_datetime = datetime.combine(today, datetime.min.time())
+        end_datetime = start_datetime + timedelta(days=1)
+        
+        python_ms, python_result = time_call(python_totals, iterations, user_id, start_datetime, end_datetime)
+        sql_ms, sql_result = time_call(sql_totals, iterations, user_id, start_datetime, end_datetime)
+        rollup_ms, rollup_result = time_call(rollup_totals, iterations, user_id, start_datetime, end_datetime)
+        
+        if not python_result == sql_result == rollup_result:
+            print(f"❌ Results differ: python={python_result} sql={sql_result} rollup={rollup_result}")
+            sys.exit(1)
+        
+        print(f"📊 Rows for the day: {sql_result['entries']}")
+        print(f"   🐍 Python sum:   {python_ms:8.2f} ms/call")
+        print(f"   🗄️  SQL SUM:      {sql_ms:8.2f} ms/call ({python_ms / sql_ms:.1f}x)")
+        print(f"   📦 Rollup row:   {rollup_ms:8.2f} ms/call ({python_ms / rollup_ms:.1f}x)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Daily nutrition aggregation benchmark')
+    parser.add_argument('--rows-per-day', type=int, default=5000, help='Log rows seeded per day')
+    parser.add_argument('--days', type=int, default=7, help='Number of days to seed')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed calls per implementation')
+    
+    args = parser.parse_args()
+    run_benchmark(args.rows_per_day, args.days, args.iterations)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Hit rate, latency and query count of the per-user nutrition summary
+cache under a mixed read/write workload, checking every read against
+the database; some writes skip this process's invalidation, as writes
+handled by another worker process would
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database, create_user, create_meal
+from app.models.user import UserGoals
+from app.models.meal import NutritionLog, DailyNutritionRollup
+from app.api.nutrition import _get_daily_totals, _get_daily_targets
+from app.services.nutrition_cache import NUTRITION_CACHE
+from app.utils.ids import new_id
+from app.utils.query_counter import QueryCounter
+from flask_jwt_extended import create_access_token
+
+READS = ['/api/nutrition/daily?include_meals=false', '/api/nutrition/macros']
+
+def create_goals(user_id, rng):
+    db.session.add(UserGoals(
+        id=new_id(), user_id=user_id, fitness_goal='weight_loss', current_weight=80, target_weight=72,
+        height=178, body_type='mesomorph', target_calories=rng.choice([1800, 2000, 2400]),
+        target_protein=140, target_carbs=200, target_fat=60, activity_level='moderate',
+        target_date=date.today() + timedelta(days=90)
+    ))
+
+def write_elsewhere(user_id, entry, rng):
+    """A log or goals write committed by another worker process, which cannot drop this process's entries"""
+    now = datetime.utcnow()
+    if rng.random() < 0.5:
+        db.session.add(NutritionLog(id=new_id(), user_id=user_id, consumed_at=now, created_at=now, **entry))
+        DailyNutritionRollup.record(user_id, now.date(), entry['calories'], entry['protein'],
+                                    entry['carbs'], entry['fat'])
+    else:
+        UserGoals.query.filter_by(user_id=user_id).update(
+            {'target_calories': rng.randrange(1600, 2800), 'updated_at': now}, synchronize_session=False
+        )
+    db.session.commit()
+
+def write(client, headers, user_id, meal_id, rng):
+    """One of the writes that must invalidate the user's summary"""
+    kind = rng.choice(['log', 'batch', 'meal', 'goals', 'elsewhere'])
+    entry = {'calories': rng.randrange(100, 700), 'protein': 20, 'carbs': 40, 'fat': 10}
+    if kind == 'elsewhere':
+        write_elsewhere(user_id, entry, rng)
+        return
+    if kind == 'log':
+        response = client.post('/api/nutrition/log', json=entry, headers=headers)
+    elif kind == 'batch':
+        response = client.post('/api/nutrition/log/batch', json={'entries': [entry, entry]}, headers=headers)
+    elif kind == 'meal':
+        response = client.post(f'/api/meals/{meal_id}/log', json={'serving_size': 1}, headers=headers)
+    else:
+        # The response echoes workout_frequency and preferred_workout_types, which are only set when sent
+        response = client.put('/api/user/goals', json={
+            'target_calories': rng.randrange(1600, 2800), 'workout_frequency': 4,
+            'preferred_workout_types': ['strength']
+        }, headers=headers)
+    if response.status_code not in (200, 201):
+        raise RuntimeError(f'{kind} write returned {response.status_code}: {response.get_json()}')
+
+def check(response, user_id):
+    """A cached read must match what the database says right now"""
+    data = response.get_json()['data']
+    totals = _get_daily_totals(user_id, date.today())
+    if 'nutrition' in data:
+        targets = _get_daily_targets(user_id)
+        consumed = data['nutrition']['calories']['consumed']
+        target = data['nutrition']['calories']['target']
+        assert (consumed, target) == (totals['calories'], targets['calories']), \
+            f"stale daily summary: {(consumed, target)} != {(totals['calories'], targets['calories'])}"
+    else:
+        assert data['total_calories'] == totals['calories'], 'stale macro breakdown'
+
+def run_workload(users, operations, write_ratio, seed):
+    rng = random.Random(seed)
+    client = app.test_client()
+    latencies, queries = [], []
+    for _ in range(operations):
+        user_id, headers, meal_id = rng.choice(users)
+        if rng.random() < write_ratio:
+            write(client, headers, user_id, meal_id, rng)
+            continue
+        url = rng.choice(READS)
+        with QueryCounter(db.engine) as counter:
+            started = time.perf_counter()
+            response = client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f'{url} returned {response.status_code}: {response.get_json()}')
+        queries.append(counter.count)
+        check(response, user_id)
+        db.session.expunge_all()
+    return latencies, queries
+
+def run_benchmark(user_count, operations, write_ratio):
+    with app.app_context():
+        reset_database()
+        rng = random.Random(1)
+        users = []
+        for i in range(user_count):
+            user_id = create_user(f'bench{i}@example.com')
+            create_goals(user_id, rng)
+            users.append((user_id, {'Authorization': f'Bearer {create_access_token(identity=user_id)}'},
+                          create_meal(user_id)))
+        db.session.commit()
+        
+        ttl = NUTRITION_CACHE.ttl_seconds
+        print(f"{user_count} users, {operations} requests, {write_ratio:.0%} writes "
+              f"(nutrition log, batch log, meal log, goals update, "
+              f"and log or goals writes from another process)")
+        print(f"{'cache':>6} {'reads':>6} {'mean ms':>8} {'p95 ms':>7} {'queries/read':>13} {'hit rate':>9}")
+        for enabled in (False, True):
+            NUTRITION_CACHE.clear()
+            NUTRITION_CACHE.ttl_seconds = ttl if enabled else 0
+            latencies, queries = run_workload(users, operations, write_ratio, seed=2)
+            stats = app.test_client().get('/api/health').get_json()['nutrition_cache']
+            ordered = sorted(latencies)
+            print(f"{'on' if enabled else 'off':>6} {len(latencies):>6} {statistics.mean(latencies) * 1000:>8.2f} "
+                  f"{ordered[int(len(ordered) * 0.95)] * 1000:>7.2f} {statistics.mean(queries):>13.2f} "
+                  f"{stats['hit_rate']:>8.1%}")
+        print(f"\nhealth endpoint: {stats}")
+        print("✅ Every read matched the database")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Nutrition summary cache benchmark')
+    parser.add_argument('--users', type=int, default=20, help='Users sharing the process')
+    parser.add_argument('--operations', type=int, default=3000, help='Requests in the workload')
+    parser.add_argument('--write-ratio', type=float, default=0.1, help='Share of requests that write')
+    
+    args = parser.parse_args()
+    run_benchmark(args.users, args.operations, args.write_ratio)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+End-to-end workout plan latency: one 4-week prompt vs a skeleton plus
+concurrent per-week prompts, against the offline Gemini stand-in
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+# Every run must reach the model
+os.environ['AI_CACHE_ENABLED'] = 'false'
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app
+from app.services.ai_service import AIService
+from app.services.fake_gemini import FakeGenerativeModel
+from app.services.plan_fanout import WorkoutPlanFanout
+from app.services.plan_persistence import build_workout_plan_rows
+from app.services.single_flight import SingleFlight
+
+class CountingModel:
+    """Counts calls and returned characters on the way through"""
+    
+    def __init__(self, model):
+        self.model = model
+        self.calls = 0
+        self.chars = 0
+    
+    def generate_content(self, prompt, **kwargs):
+        response = self.model.generate_content(prompt, **kwargs)
+        self.calls += 1
+        self.chars += len(response.text)
+        return response
+
+def validate(plan, days_per_week):
+    """The merged plan must persist exactly like a single-shot plan"""
+    assert len(plan['weeks']) == 4
+    for week in plan['weeks']:
+        assert [day['day_number'] for day in week['days']] == list(range(1, 8))
+        training = [day for day in week['days'] if day['workout_type'] != 'rest']
+        assert len(training) == days_per_week
+        assert all(day['exercises'] for day in training)
+    _, day_rows = build_workout_plan_rows('bench-user', plan)
+    assert len(day_rows) == 28
+
+def run_mode(fanout, model_args, days_per_week, repeats, pool_size):
+    service = AIService()
+    service.flights = SingleFlight()
+    service.model = CountingModel(FakeGenerativeModel(**model_args))
+    service.plan_fanout = None
+    if fanout:
+        executor = ThreadPoolExecutor(max_workers=pool_size)
+        service.plan_fanout = WorkoutPlanFanout(service.model, service._parse_json, executor)
+    
+    latencies = []
+    for i in range(repeats):
+        # Vary the input so nothing is shared between runs
+        user_data = {'fitness_goal': 'muscle_gain', 'days_per_week': days_per_week, 'workout_duration': 40 + i}
+        started = time.perf_counter()
+        plan = service.generate_workout_plan(user_data)
+        latencies.append(time.perf_counter() - started)
+        validate(plan, days_per_week)
+    return latencies, service.model.calls / repeats, service.model.chars / repeats
+
+def run_benchmark(latency, token_ms, days_per_week, repeats, pool_size):
+    model_args = {'latency': latency, 'token_ms': token_ms, 'seed': 3}
+    print(f"fake Gemini: {latency}, {token_ms}ms per 32-char chunk; {days_per_week} training days, "
+          f"fan-out pool of {pool_size}")
+    print(f"{'mode':>12} {'calls':>6} {'chars':>7} {'p50 ms':>9} {'max ms':>9}")
+    results = {}
+    for fanout in (False, True):
+        latencies, calls, chars = run_mode(fanout, model_args, days_per_week, repeats, pool_size)
+        label = 'fan-out' if fanout else 'single-shot'
+        results[label] = statistics.median(latencies)
+        print(f"{label:>12} {calls:>6.0f} {chars:>7.0f} {statistics.median(latencies) * 1000:>9.1f} "
+              f"{max(latencies) * 1000:>9.1f}")
+    print(f"\nfan-out speedup: {results['single-shot'] / results['fan-out']:.2f}x")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Workout plan fan-out benchmark')
+    parser.add_argument('--latency', default='lognormal:800:0.3', help='Fake first-token latency spec')
+    parser.add_argument('--token-ms', type=float, default=10, help='Fake generation time per chunk')
+    parser.add_argument('--days-per-week', type=int, default=4, help='Training days per week')
+    parser.add_argument('--repeats', type=int, default=5, help='Plans per mode')
+    parser.add_argument('--pool-size', type=int, default=4, help='Concurrent week calls')
+    
+    args = parser.parse_args()
+    with app.app_context():
+        run_benchmark(args.latency, args.token_ms, args.days_per_week, args.repeats, args.pool_size)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-row ORM inserts vs bulk executemany for generated plans
+"""
+
+import os
+import sys
+import time
+import uuid
+import argparse
+from datetime import datetime
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database, create_user
+from app.models.meal import Meal, MealPlan
+from app.services.plan_persistence import persist_meal_plan
+
+def make_ai_plan(days, meals_per_day):
+    """Build a meal plan shaped like the AI service output"""
+    return {
+        'plan_name': 'Benchmark Plan',
+        'description': 'Synthetic plan',
+        'target_calories': 2000,
+        'dietary_preference': 'balanced',
+        'days': [
+            {
+                'day_number': day + 1,
+                'meals': [
+                    {
+                        'meal_type': ['breakfast', 'lunch', 'dinner', 'snack'][meal % 4],
+                        'name': f'Meal {day + 1}.{meal + 1}',
+                        'calories': 400,
+                        'protein': 25,
+                        'carbs': 45,
+                        'fat': 12,
+                        'ingredients': ['Oats', 'Milk', 'Berries'],
+                        'instructions': ['Mix', 'Cook', 'Serve'],
+                        'prep_time': 5,
+                        'cook_time': 10
+                    }
+                    for meal in range(meals_per_day)
+                ]
+            }
+            for day in range(days)
+        ]
+    }
+
+def persist_with_orm(user_id, ai_plan):
+    """Previous implementation: one session.add() per meal"""
+    meal_plan = MealPlan(
+        id=str(uuid.uuid4()),
+        name=ai_plan.get('plan_name', 'AI Generated Meal Plan'),
+        description=ai_plan.get('description', ''),
+        user_id=user_id,
+        target_calories=ai_plan.get('target_calories', 2000),
+        dietary_preference=ai_plan.get('dietary_preference', 'balanced'),
+        total_days=len(ai_plan.get('days', [])),
+        created_at=datetime.utcnow(),
+        is_active=True
+    )
+    db.session.add(meal_plan)
+    db.session.flush()
+    for day_data in ai_plan.get('days', []):
+        for meal_data in day_data.get('meals', []):
+            db.session.add(Meal(
+                id=str(uuid.uuid4()),
+                plan_id=meal_plan.id,
+                day_number=day_data.get('day_number', 1),
+                meal_type=meal_data.get('meal_type', 'breakfast'),
+                name=meal_data.get('name', ''),
+                calories=meal_data.get('calories', 0),
+                protein=meal_data.get('protein', 0),
+                carbs=meal_data.get('carbs', 0),
+                fat=meal_data.get('fat', 0),
+                ingredients=meal_data.get('ingredients', []),
+                instructions=meal_data.get('instructions', []),
+                prep_time=meal_data.get('prep_time', 0),
+                cook_time=meal_data.get('cook_time', 0),
+                created_at=datetime.utcnow()
+            ))
+    db.session.commit()
+
+def rows_per_second(func, user_id, ai_plan, repeats):
+    """Persist the plan repeatedly and return inserted rows per second"""
+    rows = 1 + sum(len(day['meals']) for day in ai_plan['days'])
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func(user_id, ai_plan)
+        db.session.expunge_all()
+    elapsed = time.perf_counter() - started
+    return rows * repeats / elapsed
+
+def run_benchmark(sizes, repeats):
+    """Compare both paths on plans of increasing size"""
+    with app.app_context():
+        reset_database()
+        user_id = create_user()
+        
+        print(f"{'plan':>12} {'rows':>6} {'ORM rows/s':>12} {'bulk rows/s':>12} {'speedup':>8}")
+        for days, meals_per_day in sizes:
+            ai_plan = make_ai_plan(days, meals_per_day)
+            rows = 1 + days * meals_per_day
+            orm_rate = rows_per_second(persist_with_orm, user_id, ai_plan, repeats)
+            bulk_rate = rows_per_second(persist_meal_plan, user_id, ai_plan, repeats)
+            label = f"{days}d x {meals_per_day}m"
+            print(f"{label:>12} {rows:>6} {orm_rate:>12,.0f} {bulk_rate:>12,.0f} {bulk_rate / orm_rate:>7.1f}x")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generated plan persistence benchmark')
+    parser.add_argument('--repeats', type=int, default=20, help='Plans persisted per size and path')
+    
+    args = parser.parse_args()
+    run_benchmark([(7, 3), (14, 4), (28, 5), (90, 6)], args.repeats)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Time to the first completed week vs the whole plan when a workout plan is
+streamed through the incremental parser, and how much of a truncated
+plan survives repair
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+os.environ['AI_CACHE_ENABLED'] = 'false'
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app
+from app.services.ai_service import AIService
+from app.services.fake_gemini import FakeGenerativeModel
+from app.services.single_flight import SingleFlight
+from app.utils.incremental_json import repair_json
+
+USER_DATA = {'fitness_goal': 'muscle_gain', 'days_per_week': 4, 'difficulty': 'intermediate'}
+WORKOUT_PROMPT = 'Create a personalized workout plan\n- Days Per Week: 4'
+
+class TruncatingModel:
+    """Cuts every reply off at a random point, like a hit max_output_tokens"""
+    
+    def __init__(self, model, seed):
+        self.model = model
+        self.rng = random.Random(seed)
+    
+    def generate_content(self, prompt, **kwargs):
+        text = self.model.generate_content(prompt).text
+        
+        class Response:
+            pass
+        response = Response()
+        response.text = text[:self.rng.randint(len(text) // 10, len(text) - 1)]
+        return response
+
+def time_streaming(service, repeats):
+    """Seconds to the first week and to the finished plan"""
+    first_week, finished = [], []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        seen = []
+        
+        def on_progress(path, value):
+            if len(path) == 2 and not seen:
+                seen.append(time.perf_counter() - started)
+        
+        plan = service.generate_workout_plan(USER_DATA, on_progress=on_progress)
+        finished.append(time.perf_counter() - started)
+        first_week.append(seen[0])
+        assert len(plan['weeks']) == 4
+    return first_week, finished
+
+def truncation_survival(trials):
+    """Fraction of truncated replies that still yield at least one full week"""
+    strict, repaired, weeks = 0, 0, []
+    model = TruncatingModel(FakeGenerativeModel('fixed:0', token_ms=0, seed=7), seed=7)
+    for _ in range(trials):
+        text = model.generate_content(WORKOUT_PROMPT).text
+        start, end = text.find('{'), text.rfind('}') + 1
+        try:
+            json.loads(text[start:end])
+            strict += 1
+        except ValueError:
+            pass
+        plan = repair_json(text)
+        complete = [w for w in plan.get('weeks', []) if len(w.get('days', [])) == 7]
+        if complete:
+            repaired += 1
+        weeks.append(len(complete))
+    return strict, repaired, weeks
+
+def run_benchmark(latency_ms, token_ms, repeats, trials):
+    service = AIService()
+    service.flights = SingleFlight()
+    service.model = FakeGenerativeModel(f'fixed:{latency_ms}', token_ms=token_ms, seed=1)
+    
+    first_week, finished = time_streaming(service, repeats)
+    print(f"fake Gemini: first token after {latency_ms}ms, {token_ms}ms per chunk")
+    print(f"{'first week ms':>14} {'full plan ms':>13}")
+    print(f"{statistics.median(first_week) * 1000:>14.1f} {statistics.median(finished) * 1000:>13.1f}")
+    
+    strict, repaired, weeks = truncation_survival(trials)
+    print(f"\n{trials} truncated replies: {strict} parse strictly, {repaired} keep at least one full week "
+          f"after repair (median {statistics.median(weeks):.0f} of 4 weeks)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Incremental plan parsing benchmark')
+    parser.add_argument('--latency-ms', type=int, default=500, help='Fake first-token latency')
+    parser.add_argument('--token-ms', type=float, default=4, help='Fake delay between chunks')
+    parser.add_argument('--repeats', type=int, default=3, help='Streamed plans to time')
+    parser.add_argument('--trials', type=int, default=200, help='Truncated replies to repair')
+    
+    args = parser.parse_args()
+    with app.app_context():
+        run_benchmark(args.latency_ms, args.token_ms, args.repeats, args.trials)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Progress list endpoints at 10k rows: ORM instances + to_dict + jsonify
+against FieldPlan rows encoded by dumps(), with orjson and with the
+stdlib fallback, checking every endpoint returns the same data
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database, create_user
+from app.api import progress as progress_api
+from app.models.progress import WeightProgress, BmiProgress, CalorieProgress
+from app.models.meal import DailyNutritionRollup
+from app.utils import serializer
+from app.utils.ids import new_id
+from flask import jsonify
+from flask_jwt_extended import create_access_token
+
+ENDPOINTS = [
+    ('/api/progress/weight', 'weight_progress', WeightProgress, progress_api.WEIGHT_PROGRESS),
+    ('/api/progress/bmi', 'bmi_progress', BmiProgress, progress_api.BMI_PROGRESS),
+    ('/api/progress/calories', 'calorie_progress', CalorieProgress, progress_api.CALORIE_PROGRESS),
+    ('/api/progress/nutrition', 'nutrition_progress', DailyNutritionRollup, progress_api.NUTRITION_PROGRESS),
+]
+
+def seed(user_id, rows, rng):
+    now = datetime.utcnow()
+    days = [date.today() - timedelta(days=i) for i in range(rows)]
+    db.session.execute(WeightProgress.__table__.insert(), [{
+        'id': new_id(), 'user_id': user_id, 'date': day, 'weight': round(rng.uniform(60, 90), 1),
+        'body_fat': round(rng.uniform(10, 30), 1), 'muscle_mass': None, 'notes': 'Morning weigh-in',
+        'created_at': now
+    } for day in days])
+    db.session.execute(BmiProgress.__table__.insert(), [{
+        'id': new_id(), 'user_id': user_id, 'date': day, 'weight': 75.0, 'height': 178.0, 'bmi': 23.67,
+        'category': 'Normal weight', 'created_at': now
+    } for day in days])
+    db.session.execute(CalorieProgress.__table__.insert(), [{
+        'id': new_id(), 'user_id': user_id, 'date': day, 'calories_consumed': rng.randrange(1500, 3000),
+        'calories_burned': rng.randrange(200, 800), 'target_calories': 2200, 'net_calories': 1600,
+        'created_at': now
+    } for day in days])
+    db.session.execute(DailyNutritionRollup.__table__.insert(), [{
+        'user_id': user_id, 'date': day, 'calories': 2100.0, 'protein': 140.0, 'carbs': 220.0, 'fat': 70.0,
+        'entry_count': 4, 'updated_at': now
+    } for day in days])
+    db.session.commit()
+
+def legacy_response(model, key, user_id):
+    """What each endpoint did before FieldPlan"""
+    rows = model.query.filter(model.user_id == user_id).order_by(model.date.desc()).all()
+    return jsonify({key: [row.to_dict() for row in rows]})
+
+def plan_response(model, key, plan, user_id):
+    """What each endpoint does now"""
+    query = model.query.filter(model.user_id == user_id).order_by(model.date.desc())
+    return serializer.json_response({key: plan.rows(query)})
+
+def timed(fn, repeats):
+    latencies = []
+    for _ in range(repeats):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        body = fn()
+        latencies.append(time.perf_counter() - started)
+    return body, statistics.median(latencies) * 1000
+
+def run_benchmark(rows, repeats):
+    with app.app_context():
+        reset_database()
+        user_id = create_user()
+        seed(user_id, rows, random.Random(1))
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+        encoder = 'orjson' if serializer.orjson is not None else 'json'
+        
+        print(f"{rows} rows per endpoint, median of {repeats}")
+        print(f"{'endpoint':<26} {'to_dict ms':>11} {'json ms':>8} {encoder + ' ms':>10} {'speedup':>8} {'bytes':>9}")
+        for url, key, model, plan in ENDPOINTS:
+            with app.test_request_context():
+                legacy, legacy_ms = timed(lambda: legacy_response(model, key, user_id).get_data(), repeats)
+                fast, fast_ms = timed(lambda: plan_response(model, key, plan, user_id).get_data(), repeats)
+                saved, serializer.orjson = serializer.orjson, None
+                try:
+                    stdlib, stdlib_ms = timed(lambda: plan_response(model, key, plan, user_id).get_data(), repeats)
+                finally:
+                    serializer.orjson = saved
+            
+            expected = json.loads(legacy)
+            served = client.get(url, headers=headers).get_data()
+            for body in (fast, stdlib, served):
+                if json.loads(body) != expected:
+                    print(f"❌ {url} returned different data than to_dict + jsonify")
+                    sys.exit(1)
+            print(f"{url:<26} {legacy_ms:>11.1f} {stdlib_ms:>8.1f} {fast_ms:>10.1f} "
+                  f"{legacy_ms / fast_ms:>7.1f}x {len(fast):>9,}")
+        print("\n✅ Every endpoint returns the same data as to_dict + jsonify")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serializer benchmark')
+    parser.add_argument('--rows', type=int, default=10000, help='Rows per progress table')
+    parser.add_argument('--repeats', type=int, default=5, help='Runs per endpoint and path, median reported')
+    
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.repeats)
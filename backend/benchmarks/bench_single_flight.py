@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Upstream calls and latency for a burst of identical plan requests,
+with and without single-flight coalescing
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+import threading
+import statistics
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app
+from app.services.ai_service import AIService
+from app.services.ai_cache import AIResponseCache
+from app.services.single_flight import SingleFlight
+
+class SlowModel:
+    """Gemini stand-in that takes a fixed time per call and counts calls"""
+    
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def generate_content(self, prompt, stream=False):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        
+        class Response:
+            text = '{"plan_name": "Burst Plan", "total_weeks": 4, "weeks": []}'
+        return Response()
+
+def run_burst(service, concurrency):
+    """Fire identical requests at once and return per-request latencies"""
+    user_data = {'fitness_goal': 'weight_loss', 'difficulty': 'beginner',
+                 'available_equipment': ['mat'], 'days_per_week': 3}
+    barrier = threading.Barrier(concurrency)
+    latencies = []
+    results = []
+    
+    def request():
+        barrier.wait()
+        started = time.perf_counter()
+        results.append(service.generate_workout_plan(user_data))
+        latencies.append(time.perf_counter() - started)
+    
+    threads = [threading.Thread(target=request) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # Every caller must own its result
+    assert len({id(result) for result in results}) == len(results)
+    return latencies
+
+def make_service(latency, coalesce, cache_dir):
+    """AIService with a slow stand-in model and a private cache file"""
+    service = AIService()
+    service.model = SlowModel(latency)
+    service.cache = AIResponseCache(os.path.join(cache_dir, f'cache-{coalesce}.db'))
+    # Each request takes its own lease, as a job in another worker process would
+    service.flights = SingleFlight(lease_store=service.cache)
+    if not coalesce:
+        service.flights.do = lambda key, fn, lookup=None: fn()
+    return service
+
+def run_benchmark(concurrency, latency_ms):
+    """Compare one burst with coalescing on and off"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        print(f"{concurrency} identical requests, upstream latency {latency_ms}ms")
+        print(f"{'mode':>12} {'upstream':>9} {'p50 ms':>8} {'max ms':>8}")
+        for coalesce in (False, True):
+            service = make_service(latency_ms / 1000, coalesce, cache_dir)
+            latencies = run_burst(service, concurrency)
+            label = 'coalesced' if coalesce else 'independent'
+            print(f"{label:>12} {service.model.calls:>9} {statistics.median(latencies) * 1000:>8.1f} "
+                  f"{max(latencies) * 1000:>8.1f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Single-flight coalescing benchmark')
+    parser.add_argument('--concurrency', type=int, default=32, help='Identical requests in the burst')
+    parser.add_argument('--latency-ms', type=int, default=500, help='Simulated Gemini latency')
+    
+    args = parser.parse_args()
+    run_benchmark(args.concurrency, args.latency_ms)
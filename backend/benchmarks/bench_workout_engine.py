@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Latency, determinism and weekly volume balance of the rule-based
+workout plan engine over a seeded exercise catalog
+"""
+
+import os
+import sys
+import time
+import json
+import random
+import argparse
+import itertools
+import statistics
+from datetime import datetime
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database
+from app.models.workout import Workout, Exercise
+from app.services import workout_engine
+from app.services.workout_engine import WorkoutPlanEngine
+from app.services.plan_persistence import build_workout_plan_rows
+from app.utils.ids import new_id
+
+MUSCLES = {
+    'chest': ['chest', 'triceps'],
+    'back': ['lats', 'biceps'],
+    'shoulders': ['deltoids'],
+    'arms': ['biceps', 'triceps'],
+    'legs': ['quadriceps', 'glutes', 'hamstrings'],
+    'core': ['abs', 'obliques'],
+}
+EQUIPMENT = ['bodyweight', 'dumbbell', 'barbell', 'kettlebell', 'resistance band', 'cable machine']
+
+def seed_catalog(size, seed=1):
+    """Insert size exercises spread over muscle groups and equipment"""
+    rng = random.Random(seed)
+    workout = Workout(id=new_id(), name='Catalog', type='strength', difficulty='beginner', duration=30)
+    db.session.add(workout)
+    groups = list(MUSCLES)
+    for i in range(size):
+        group = groups[i % len(groups)]
+        exercise = Exercise(
+            id=new_id(),
+            workout_id=workout.id,
+            name=f'{group.title()} Exercise {i + 1}',
+            category='cardio' if i % 10 == 9 else 'strength',
+            equipment=rng.choice(EQUIPMENT),
+            exercise_type='cardio' if i % 10 == 9 else 'strength',
+            created_at=datetime.utcnow()
+        )
+        exercise.set_muscles(MUSCLES[group])
+        exercise.set_instructions(['Set up', 'Move with control'])
+        db.session.add(exercise)
+    db.session.commit()
+
+def inputs():
+    """Every combination of the engine's main knobs"""
+    for days, difficulty, goal, equipment, duration in itertools.product(
+        range(1, 8), ['beginner', 'intermediate', 'advanced'],
+        ['muscle_gain', 'weight_loss', 'strength'], [[], ['dumbbells'], ['dumbbells', 'barbell']], [30, 60]
+    ):
+        yield {'days_per_week': days, 'difficulty': difficulty, 'fitness_goal': goal,
+               'available_equipment': equipment, 'workout_duration': duration}
+
+def weekly_sets(plan):
+    """Sets per muscle group in week 1"""
+    volume = {group: 0 for group in MUSCLES}
+    for day in plan['weeks'][0]['days']:
+        for exercise in day['exercises']:
+            if exercise['reps'].endswith('seconds'):
+                continue
+            for group in workout_engine._groups(exercise['muscles_targeted'])[:1]:
+                volume[group] = volume.get(group, 0) + exercise['sets']
+    return volume
+
+def run_benchmark(catalog_size):
+    reset_database()
+    seed_catalog(catalog_size)
+    engine = WorkoutPlanEngine()
+    
+    started = time.perf_counter()
+    engine.catalog()
+    load_ms = (time.perf_counter() - started) * 1000
+    
+    latencies, spreads = [], []
+    for user_data in inputs():
+        started = time.perf_counter()
+        plan = engine.generate(user_data)
+        latencies.append(time.perf_counter() - started)
+        
+        assert plan == engine.generate(dict(user_data)), 'engine is not deterministic'
+        assert len(build_workout_plan_rows('bench-user', plan)[1]) == 28
+        if user_data['days_per_week'] >= 3:
+            volume = weekly_sets(plan)
+            spreads.append(max(volume.values()) - min(volume.values()))
+    
+    ordered = sorted(latencies)
+    print(f"catalog of {catalog_size} exercises loaded in {load_ms:.1f}ms (cached for "
+          f"{workout_engine.CATALOG_TTL_SECONDS}s)")
+    print(f"{len(latencies)} plans: p50 {statistics.median(latencies) * 1000:.2f}ms, "
+          f"p99 {ordered[int(len(ordered) * 0.99)] * 1000:.2f}ms, max {ordered[-1] * 1000:.2f}ms")
+    print(f"week-1 sets per muscle group, max - min across groups (3+ days): "
+          f"median {statistics.median(spreads):.0f}, worst {max(spreads)}")
+    
+    sample = engine.generate({'days_per_week': 4, 'difficulty': 'intermediate', 'fitness_goal': 'muscle_gain',
+                              'available_equipment': ['dumbbells'], 'workout_duration': 45})
+    print(f"\nsample 4-day intermediate plan, week 1 sets: {json.dumps(weekly_sets(sample))}")
+    for day in sample['weeks'][0]['days']:
+        if day['exercises']:
+            print(f"  {day['day_name']:<10} {day['workout_type']:<11} "
+                  f"{', '.join(e['name'] for e in day['exercises'])}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rule-based workout plan engine benchmark')
+    parser.add_argument('--catalog-size', type=int, default=300, help='Exercises in the seeded catalog')
+    
+    args = parser.parse_args()
+    with app.app_context():
+        run_benchmark(args.catalog_size)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Check that ai_worker.py starts and runs queued jobs to completion, both
+with --drain and as a supervised pool of worker processes
+"""
+
+import os
+import sys
+import time
+import signal
+import argparse
+import subprocess
+
+# The workers are separate processes; point them at the offline model too
+os.environ.setdefault('AI_BACKEND', 'fake')
+os.environ.setdefault('AI_FAKE_LATENCY', 'fixed:50')
+os.environ.setdefault('AI_FAKE_TOKEN_MS', '0')
+os.environ['AI_CACHE_ENABLED'] = 'false'
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database, create_user, BACKEND_DIR
+from app.models.job import AIJob
+from app.services.job_queue import enqueue_job
+
+WORKER = os.path.join(BACKEND_DIR, 'ai_worker.py')
+
+USER_DATA = {
+    'fitness_goal': 'muscle_gain', 'current_weight': 75, 'target_weight': 80, 'height': 180,
+    'activity_level': 'active', 'days_per_week': 3, 'difficulty': 'beginner',
+    'target_calories': 2600, 'dietary_preference': 'balanced', 'days': 3
+}
+
+def enqueue_batch(user_id):
+    """One job of every kind; returns their IDs"""
+    jobs = [
+        enqueue_job('chat', {'message': 'How much protein do I need?', 'context': 'fitness_nutrition_assistant'},
+                    user_id=user_id),
+        enqueue_job('nutrition_analysis', {'nutrition_data': {'calories_consumed': 1800, 'protein': 120}},
+                    user_id=user_id),
+        enqueue_job('workout_plan', {'user_data': USER_DATA, 'persist': True}, user_id=user_id),
+        enqueue_job('meal_plan', {'user_data': USER_DATA, 'persist': True}, user_id=user_id),
+    ]
+    return [job.id for job in jobs]
+
+def job_statuses(job_ids):
+    db.session.expire_all()
+    return {job.id: job for job in AIJob.query.filter(AIJob.id.in_(job_ids))}
+
+def report(label, job_ids, elapsed):
+    """Print each job and return how many did not succeed"""
+    jobs = job_statuses(job_ids)
+    failed = 0
+    print(f"\n{label} ({elapsed:.1f}s)")
+    for job_id in job_ids:
+        job = jobs[job_id]
+        ok = job.status == 'succeeded' and job.get_result() is not None
+        failed += not ok
+        print(f"  {'✅' if ok else '❌'} {job.kind:<20} {job.status:<10} attempts={job.attempts}"
+              f"{'' if ok else f' error={job.error}'}")
+    return failed
+
+def run_drain(user_id):
+    """python ai_worker.py --drain, started from outside the backend directory"""
+    job_ids = enqueue_batch(user_id)
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, WORKER, '--drain'], cwd='/', env=os.environ.copy(),
+                            capture_output=True, text=True, timeout=300)
+    if result.returncode != 0:
+        print(f"❌ ai_worker.py --drain exited with {result.returncode}:\n{result.stderr[-2000:]}")
+        sys.exit(1)
+    return report('ai_worker.py --drain', job_ids, time.perf_counter() - started)
+
+def run_pool(user_id, workers, timeout):
+    """python ai_worker.py --workers N until the batch finishes, then SIGTERM"""
+    job_ids = enqueue_batch(user_id)
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, WORKER, '--workers', str(workers), '--interactive-workers', '1',
+         '--poll-interval', '0.1'],
+        cwd='/', env=os.environ.copy(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                print(f"❌ ai_worker.py exited early with {process.returncode}:\n{process.stdout.read()[-2000:]}")
+                sys.exit(1)
+            if all(job.status in ('succeeded', 'failed') for job in job_statuses(job_ids).values()):
+                break
+            time.sleep(0.2)
+        elapsed = time.perf_counter() - started
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return report(f'ai_worker.py --workers {workers}', job_ids, elapsed)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='AI worker entry point check')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes in the pool run')
+    parser.add_argument('--timeout', type=float, default=120, help='Seconds to wait for the pool')
+    
+    args = parser.parse_args()
+    with app.app_context():
+        reset_database()
+        user_id = create_user()
+        failures = run_drain(user_id) + run_pool(user_id, args.workers, args.timeout)
+    
+    if failures:
+        print(f"\n❌ {failures} job(s) did not succeed")
+        sys.exit(1)
+    print("\n✅ ai_worker.py ran every queued job, drained and as a pool")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Check that list endpoints issue a constant number of queries per page
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime, date, timedelta
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database, create_user, create_meal, seed_nutrition_logs
+from app.models.user import User
+from app.models.workout import Workout, Exercise, WorkoutPlan
+from app.utils.ids import new_id
+from app.utils.query_counter import QueryCounter, QueryCountError, assert_num_queries
+from flask_jwt_extended import create_access_token
+
+# Endpoint -> queries allowed for one page, whatever its size
+QUERY_BUDGETS = {
+    '/api/workouts/library?cursor=': 2,
+    '/api/workouts/library?cursor=&include_exercises=false': 1,
+    '/api/workouts/?cursor=': 1,
+    '/api/meals/logs?cursor=': 1,
+}
+
+def seed_workouts(user_id, count, exercises_per_workout=5):
+    """Insert catalog workouts with their exercises"""
+    now = datetime.utcnow()
+    for i in range(count):
+        workout = Workout(
+            id=new_id(),
+            name=f'Workout {i + 1}',
+            type='strength',
+            difficulty='beginner',
+            duration=30,
+            created_at=now - timedelta(minutes=i)
+        )
+        db.session.add(workout)
+        for j in range(exercises_per_workout):
+            db.session.add(Exercise(
+                id=new_id(),
+                workout_id=workout.id,
+                name=f'Exercise {i + 1}.{j + 1}',
+                category='strength',
+                equipment='bodyweight',
+                exercise_type='strength'
+            ))
+        db.session.add(WorkoutPlan(
+            id=new_id(),
+            name=f'Plan {i + 1}',
+            user_id=user_id,
+            total_weeks=4,
+            difficulty='beginner',
+            created_at=now - timedelta(minutes=i)
+        ))
+    db.session.commit()
+
+def count_page_queries(client, headers, url, per_page):
+    """Issue one request and return how many statements it ran"""
+    with QueryCounter(db.engine) as counter:
+        response = client.get(f'{url}&per_page={per_page}', headers=headers)
+    if response.status_code != 200:
+        raise RuntimeError(f'{url} returned {response.status_code}: {response.get_json()}')
+    return counter.count
+
+def run_check(small, large):
+    """Compare query counts for a small and a large page of every endpoint"""
+    with app.app_context():
+        reset_database()
+        user_id = create_user()
+        meal_id = create_meal(user_id)
+        seed_workouts(user_id, large)
+        seed_nutrition_logs(user_id, meal_id, date.today(), large)
+        headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+        client = app.test_client()
+        
+        failures = 0
+        print(f"{'endpoint':<55} {f'{small}/page':>8} {f'{large}/page':>8} {'budget':>7}")
+        for url, budget in QUERY_BUDGETS.items():
+            small_count = count_page_queries(client, headers, url, small)
+            try:
+                with assert_num_queries(db.engine, max_queries=budget) as counter:
+                    client.get(f'{url}&per_page={large}', headers=headers)
+                status = ''
+            except QueryCountError as e:
+                failures += 1
+                status = f'\n{e}'
+            print(f"{url:<55} {small_count:>8} {counter.count:>8} {budget:>7}{status}")
+            db.session.expunge_all()
+        
+        # The plan generation endpoints read goals and preferences off the user
+        db.session.expunge_all()
+        try:
+            with assert_num_queries(db.engine, expected=1) as counter:
+                user = db.session.get(User, user_id, options=User.profile_options())
+                user.goals, user.preferences
+            status = ''
+        except QueryCountError as e:
+            failures += 1
+            status = f'\n{e}'
+        print(f"{'user with User.profile_options()':<55} {'':>8} {counter.count:>8} {1:>7}{status}")
+        
+        if failures:
+            print(f"\n❌ {failures} endpoint(s) exceeded their query budget")
+            sys.exit(1)
+        print("\n✅ Every endpoint issues a constant number of queries per page")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Per-endpoint query count check')
+    parser.add_argument('--small', type=int, default=2, help='Rows on the small page')
+    parser.add_argument('--large', type=int, default=50, help='Rows on the large page')
+    
+    args = parser.parse_args()
+    run_check(args.small, args.large)
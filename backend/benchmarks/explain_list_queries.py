@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN QUERY PLAN report for the per-user list endpoints
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime, date, timedelta
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database
+from app.models.meal import MealPlan, NutritionLog
+from app.models.workout import WorkoutPlan, WorkoutSession
+from app.models.progress import WeightProgress, BmiProgress, CalorieProgress
+from app.utils.pagination import decode_cursor, encode_cursor
+from sqlalchemy import tuple_
+
+USER_ID = 'explain-user'
+
+def cursor_page(query, model, sort_attr):
+    """Build the query a cursor-mode page issues after the first page"""
+    sort_column = getattr(model, sort_attr)
+    sort_value, row_id = decode_cursor(encode_cursor(datetime.utcnow(), 'last-seen-id'))
+    return query.filter(tuple_(sort_column, model.id) < tuple_(sort_value, row_id))\
+        .order_by(sort_column.desc(), model.id.desc()).limit(11)
+
+def endpoint_queries():
+    """Build the same queries the list endpoints issue"""
+    today = date.today()
+    day_start = datetime.combine(today, datetime.min.time())
+    return {
+        'GET /api/meals/': MealPlan.query.filter_by(user_id=USER_ID)
+            .order_by(MealPlan.created_at.desc()).limit(10),
+        'GET /api/meals/logs': NutritionLog.query.filter_by(user_id=USER_ID)
+            .order_by(NutritionLog.consumed_at.desc()).limit(10),
+        'GET /api/nutrition/daily (meals)': NutritionLog.query.filter(
+                NutritionLog.user_id == USER_ID,
+                NutritionLog.consumed_at >= day_start,
+                NutritionLog.consumed_at < day_start + timedelta(days=1)
+            ).order_by(NutritionLog.consumed_at),
+        'GET /api/workouts/': WorkoutPlan.query.filter_by(user_id=USER_ID)
+            .order_by(WorkoutPlan.created_at.desc()).limit(10),
+        'GET /api/workouts/sessions': WorkoutSession.query.filter_by(user_id=USER_ID)
+            .order_by(WorkoutSession.created_at.desc()).limit(10),
+        'GET /api/meals/?cursor=': cursor_page(
+                MealPlan.query.filter_by(user_id=USER_ID), MealPlan, 'created_at'),
+        'GET /api/meals/logs?cursor=': cursor_page(
+                NutritionLog.query.filter_by(user_id=USER_ID), NutritionLog, 'consumed_at'),
+        'GET /api/workouts/?cursor=': cursor_page(
+                WorkoutPlan.query.filter_by(user_id=USER_ID), WorkoutPlan, 'created_at'),
+        'GET /api/workouts/sessions?cursor=': cursor_page(
+                WorkoutSession.query.filter_by(user_id=USER_ID), WorkoutSession, 'created_at'),
+        'GET /api/progress/weight': WeightProgress.query.filter(
+                WeightProgress.user_id == USER_ID,
+                WeightProgress.date >= today - timedelta(days=90)
+            ).order_by(WeightProgress.date.desc()),
+        'GET /api/progress/bmi': BmiProgress.query.filter(
+                BmiProgress.user_id == USER_ID,
+                BmiProgress.date >= today - timedelta(days=90)
+            ).order_by(BmiProgress.date.desc()),
+        'GET /api/progress/calories': CalorieProgress.query.filter(
+                CalorieProgress.user_id == USER_ID,
+                CalorieProgress.date >= today - timedelta(days=90)
+            ).order_by(CalorieProgress.date.desc()),
+    }
+
+def explain(query):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query"""
+    compiled = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {compiled}')).fetchall()
+    return [row[-1] for row in rows]
+
+def run_report():
+    """Print the plan for every list query and flag full table scans"""
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            print("❌ EXPLAIN QUERY PLAN report requires SQLite")
+            sys.exit(1)
+        
+        reset_database()
+        full_scans = []
+        
+        print("🔎 EXPLAIN QUERY PLAN for list endpoints")
+        print("=" * 50)
+        for endpoint, query in endpoint_queries().items():
+            plan = explain(query)
+            print(f"\n📊 {endpoint}")
+            for line in plan:
+                print(f"   {line}")
+            # "SCAN <table>" without an index means every row is visited
+            if any(line.startswith('SCAN') and 'INDEX' not in line for line in plan):
+                full_scans.append(endpoint)
+            if any('TEMP B-TREE' in line for line in plan):
+                print("   ⚠️  ORDER BY is not satisfied by the index")
+        
+        print()
+        if full_scans:
+            print(f"❌ Full table scans: {', '.join(full_scans)}")
+            sys.exit(1)
+        print("✅ Every list endpoint is served by an index")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='EXPLAIN QUERY PLAN report for list endpoints')
+    parser.parse_args()
+    run_report()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Fault-injection harness for the Gemini deadline, retry and circuit breaker layer
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+# The harness measures the resilience layer, not the response cache
+os.environ['AI_CACHE_ENABLED'] = 'false'
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db
+from app.services.ai_service import AIService
+from app.services.resilience import CircuitBreaker, ResilientModel
+from app.services.single_flight import SingleFlight
+
+USER_DATA = {'fitness_goal': 'weight_loss', 'difficulty': 'beginner', 'days_per_week': 3}
+AI_PLAN_NAME = 'Injected Plan'
+
+class Chunk:
+    """A reply, or one piece of a streamed reply"""
+    
+    def __init__(self, text):
+        self.text = text
+
+class FaultyModel:
+    """Gemini stand-in with configurable latency and failure rate
+    
+    Streamed replies go quiet for stall_ms after stall_after chunks.
+    """
+    
+    def __init__(self, latency_ms=50, jitter_ms=10, failure_rate=0.0, error=ConnectionError,
+                 stall_after=None, stall_ms=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.error = error
+        self.stall_after = stall_after
+        self.stall_ms = stall_ms
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def generate_content(self, prompt, stream=False, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000)
+        if random.random() < self.failure_rate:
+            raise self.error('injected upstream failure')
+        
+        text = f'{{"plan_name": "{AI_PLAN_NAME}", "total_weeks": 4, "weeks": []}}'
+        if stream:
+            return self._stream(text)
+        return Chunk(text)
+    
+    def _stream(self, text, size=16):
+        for index, start in enumerate(range(0, len(text), size)):
+            if index == self.stall_after:
+                time.sleep(self.stall_ms / 1000)
+            yield Chunk(text[start:start + size])
+
+def make_service(model, breaker, timeout, max_retries, pool_size=16):
+    """AIService whose model is the faulty stand-in behind the resilience layer"""
+    service = AIService()
+    service.flights = SingleFlight()
+    service.model = ResilientModel(
+        model, breaker=breaker, executor=ThreadPoolExecutor(max_workers=pool_size),
+        timeout=timeout, max_retries=max_retries, backoff_base=0.02, backoff_max=0.1,
+        slots=threading.BoundedSemaphore(pool_size)
+    )
+    return service
+
+def run_calls(service, count, stream=False):
+    """Call generate_workout_plan count times; return latencies and fallback count"""
+    latencies = []
+    fallbacks = 0
+    # With on_progress the plan is read from a streamed reply
+    on_progress = (lambda path, value: None) if stream else None
+    for _ in range(count):
+        started = time.perf_counter()
+        plan = service.generate_workout_plan(USER_DATA, on_progress=on_progress)
+        latencies.append(time.perf_counter() - started)
+        if plan.get('plan_name') != AI_PLAN_NAME:
+            fallbacks += 1
+    return latencies, fallbacks
+
+def report(name, model, breaker, latencies, fallbacks):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{name:>10} {len(latencies):>6} {model.calls:>9} {fallbacks:>10} "
+          f"{statistics.median(latencies) * 1000:>8.1f} {p99 * 1000:>8.1f} {breaker.state:>10}")
+
+def run_scenarios(calls, timeout, max_retries, threshold, reset_timeout):
+    """Run each fault scenario against a fresh breaker and check the expected behaviour"""
+    failures = []
+    print(f"deadline {timeout * 1000:.0f}ms, {max_retries} retries, breaker opens after {threshold} failures")
+    print(f"{'scenario':>10} {'calls':>6} {'upstream':>9} {'fallbacks':>10} {'p50 ms':>8} {'p99 ms':>8} {'breaker':>10}")
+    
+    # Healthy upstream: every call is served by the model
+    model = FaultyModel(latency_ms=20)
+    breaker = CircuitBreaker(threshold, reset_timeout)
+    latencies, fallbacks = run_calls(make_service(model, breaker, timeout, max_retries), calls)
+    report('healthy', model, breaker, latencies, fallbacks)
+    if fallbacks:
+        failures.append('healthy: expected no fallbacks')
+    
+    # Flaky upstream: jittered retries hide most failures
+    model = FaultyModel(latency_ms=20, failure_rate=0.3)
+    breaker = CircuitBreaker(threshold, reset_timeout)
+    latencies, fallbacks = run_calls(make_service(model, breaker, timeout, max_retries), calls)
+    report('flaky', model, breaker, latencies, fallbacks)
+    if fallbacks > calls * 0.1:
+        failures.append('flaky: retries should absorb most failures')
+    
+    # Slow upstream: deadlines cap latency, then the breaker stops calling it
+    model = FaultyModel(latency_ms=timeout * 4000, jitter_ms=0)
+    breaker = CircuitBreaker(threshold, reset_timeout)
+    latencies, fallbacks = run_calls(make_service(model, breaker, timeout, max_retries), calls)
+    report('slow', model, breaker, latencies, fallbacks)
+    if max(latencies) > timeout * (max_retries + 1) + 0.5:
+        failures.append('slow: a call ran past its deadlines')
+    if breaker.state != 'open':
+        failures.append('slow: breaker should be open')
+    
+    # Outage: after the breaker opens calls fall back without waiting
+    model = FaultyModel(latency_ms=20, failure_rate=1.0)
+    breaker = CircuitBreaker(threshold, reset_timeout)
+    service = make_service(model, breaker, timeout, max_retries)
+    latencies, fallbacks = run_calls(service, calls)
+    report('outage', model, breaker, latencies, fallbacks)
+    if model.calls > threshold * (max_retries + 1):
+        failures.append('outage: breaker should stop upstream calls')
+    if statistics.median(latencies[threshold:]) > 0.005:
+        failures.append('outage: open breaker should fail fast')
+    
+    # Recovery: after reset_timeout one trial call closes the breaker again
+    time.sleep(reset_timeout)
+    model.failure_rate = 0.0
+    model.calls = 0
+    latencies, fallbacks = run_calls(service, calls)
+    report('recovery', model, breaker, latencies, fallbacks)
+    if breaker.state != 'closed' or fallbacks:
+        failures.append('recovery: breaker should close after a successful trial call')
+    
+    # Hung upstream: calls past their deadline keep their threads, so once
+    # every thread is taken new calls fail at once instead of queueing behind them
+    pool_size = 4
+    model = FaultyModel(latency_ms=timeout * 5000, jitter_ms=0)
+    breaker = CircuitBreaker(calls * (max_retries + 1) + 1, reset_timeout)
+    service = make_service(model, breaker, timeout, max_retries, pool_size=pool_size)
+    latencies, fallbacks = run_calls(service, calls)
+    report('hung', model, breaker, latencies, fallbacks)
+    if statistics.median(latencies) > timeout:
+        failures.append('hung: calls should not wait for a thread held by a timed-out call')
+    if fallbacks != calls:
+        failures.append('hung: every call should fall back')
+    
+    # Once the hung calls return their threads serve new calls again
+    model.latency_ms = 20
+    time.sleep(timeout * 5 + 0.2)
+    latencies, fallbacks = run_calls(service, calls)
+    report('unhung', model, breaker, latencies, fallbacks)
+    if fallbacks:
+        failures.append('unhung: threads should be free once the hung calls return')
+    
+    # Stalled stream: the deadline covers reading the chunks, and the breaker counts the stall
+    model = FaultyModel(latency_ms=20, stall_after=2, stall_ms=timeout * 10000)
+    breaker = CircuitBreaker(threshold, reset_timeout)
+    latencies, fallbacks = run_calls(make_service(model, breaker, timeout, max_retries), calls, stream=True)
+    report('stalled', model, breaker, latencies, fallbacks)
+    if max(latencies) > timeout + 0.5:
+        failures.append('stalled: a streamed call ran past its deadline')
+    if breaker.state != 'open':
+        failures.append('stalled: breaker should be open')
+    
+    # The chat stream gets the same deadline
+    breaker = CircuitBreaker(threshold, reset_timeout)
+    service = make_service(model, breaker, timeout, max_retries)
+    started = time.perf_counter()
+    ''.join(service.stream_chat_with_ai('How many rest days do I need?'))
+    elapsed = time.perf_counter() - started
+    print(f"{'chat':>10} {1:>6} {'':>9} {'':>10} {elapsed * 1000:>8.1f} {'':>8} {breaker.state:>10}")
+    if elapsed > timeout + 0.5:
+        failures.append('chat: a streamed reply ran past its deadline')
+    if breaker.snapshot()['consecutive_failures'] != 1:
+        failures.append('chat: the stalled stream should count as a breaker failure')
+    
+    if failures:
+        print('\n❌ ' + '\n❌ '.join(failures))
+        sys.exit(1)
+    print('\n✅ Deadlines, retries, the call pool and the circuit breaker behaved as expected, streamed or not')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gemini fault-injection harness')
+    parser.add_argument('--calls', type=int, default=40, help='Calls per scenario')
+    parser.add_argument('--timeout', type=float, default=0.2, help='Per-call deadline in seconds')
+    parser.add_argument('--retries', type=int, default=2, help='Retries per call')
+    parser.add_argument('--threshold', type=int, default=5, help='Failures before the breaker opens')
+    parser.add_argument('--reset-timeout', type=float, default=1.0, help='Seconds the breaker stays open')
+    
+    args = parser.parse_args()
+    with app.app_context():
+        # Fallback plans read the exercise catalog, which may be empty
+        db.create_all()
+        run_scenarios(args.calls, args.timeout, args.retries, args.threshold, args.reset_timeout)
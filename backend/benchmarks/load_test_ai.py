@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Offline load test for the AI endpoints against the fake Gemini backend
+
+Clients hit /api/ai/* concurrently while in-process workers drain the job
+queue, then a second phase opens concurrent /api/ai/chat/stream connections.
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+# Serve every AI call from the offline stand-in and measure it, not the cache
+os.environ['AI_BACKEND'] = 'fake'
+os.environ['AI_CACHE_ENABLED'] = 'false'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Offline AI load test')
+    parser.add_argument('--requests', type=int, default=200, help='Requests across the /api/ai endpoints')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent clients')
+    parser.add_argument('--workers', type=int, default=4, help='Job workers draining the queue')
+    parser.add_argument('--streams', type=int, default=16, help='Concurrent chat streams')
+    parser.add_argument('--latency', default='lognormal:300:0.5', help='Fake first-token latency spec')
+    parser.add_argument('--token-ms', type=float, default=5, help='Fake delay between streamed chunks')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='Fraction of fake calls that fail')
+    parser.add_argument('--seed', type=int, default=42, help='Fake model seed')
+    return parser.parse_args()
+
+args = parse_args() if __name__ == '__main__' else None
+if args:
+    os.environ['AI_FAKE_LATENCY'] = args.latency
+    os.environ['AI_FAKE_TOKEN_MS'] = str(args.token_ms)
+    os.environ['AI_FAKE_ERROR_RATE'] = str(args.error_rate)
+    os.environ['AI_FAKE_SEED'] = str(args.seed)
+    os.environ.setdefault('AI_MAX_CHAT_STREAMS', str(args.streams))
+    os.environ.setdefault('AI_RETRY_BACKOFF_SECONDS', '0.05')
+    os.environ.setdefault('AI_JOB_RETRY_BACKOFF_SECONDS', '0.05')
+
+sys.path.append(os.path.dirname(__file__))
+from seed_data import app, db, reset_database, create_user
+from app.models.job import AIJob
+from app.services.job_queue import claim_next_job, enqueue_job, run_job
+
+# (endpoint, body) pairs cycled through by the clients
+REQUESTS = [
+    ('/api/ai/chat', {'message': 'How many rest days do I need?'}),
+    ('/api/ai/workout-plan', {'fitness_goal': 'muscle_gain', 'days_per_week': 4, 'difficulty': 'intermediate'}),
+    ('/api/ai/meal-plan', {'target_calories': 2400, 'dietary_preference': 'vegetarian', 'days': 7}),
+    ('/api/ai/nutrition-analysis', {'calories_consumed': 1800, 'protein': 90, 'target_protein': 140}),
+]
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+def latency_row(label, values):
+    print(f"{label:>22} {len(values):>6} {statistics.median(values) * 1000:>9.1f} "
+          f"{percentile(values, 0.95) * 1000:>9.1f} {percentile(values, 0.99) * 1000:>9.1f}")
+
+def worker(worker_id, stop):
+    """Drain the queue like ai_worker.py does, but on a thread"""
+    with app.app_context():
+        while not stop.is_set():
+            job = claim_next_job(worker_id)
+            if job is None:
+                time.sleep(0.01)
+                continue
+            run_job(job)
+        db.session.remove()
+
+def post(index):
+    """Send one request and return (endpoint, status, seconds, job_id)"""
+    endpoint, body = REQUESTS[index % len(REQUESTS)]
+    started = time.perf_counter()
+    # Chat replies inline unless asked to queue; the plan endpoints always queue
+    response = app.test_client().post(endpoint, json=body, headers={'Prefer': 'respond-async'})
+    elapsed = time.perf_counter() - started
+    job_id = (response.get_json() or {}).get('data', {}).get('job_id')
+    return endpoint, response.status_code, elapsed, job_id
+
+def enqueue_persisted_plans(user_id, count):
+    """Plan jobs as queued by /api/workouts/generate and /api/meals/generate"""
+    jobs = []
+    for i in range(count):
+        if i % 2:
+            jobs.append(enqueue_job('meal_plan', {'user_data': dict(REQUESTS[2][1]), 'persist': True}, user_id=user_id))
+        else:
+            jobs.append(enqueue_job('workout_plan', {'user_data': dict(REQUESTS[1][1]), 'persist': True}, user_id=user_id))
+    return [job.id for job in jobs]
+
+def wait_for_jobs(job_ids, timeout=300):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        db.session.expire_all()
+        pending = AIJob.query.filter(AIJob.id.in_(job_ids), AIJob.status.in_(['queued', 'running'])).count()
+        if pending == 0:
+            return True
+        time.sleep(0.05)
+    return False
+
+def run_queue_phase(total, clients, workers):
+    """Concurrent enqueues with workers draining in the background"""
+    reset_database()
+    user_id = create_user()
+    stop = threading.Event()
+    threads = [threading.Thread(target=worker, args=(f'load-{i}', stop)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(post, range(total)))
+    job_ids = [job_id for _, status, _, job_id in results if status == 202]
+    job_ids += enqueue_persisted_plans(user_id, max(2, total // 10))
+    drained = wait_for_jobs(job_ids)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in threads:
+        thread.join()
+    
+    print(f"{total} requests from {clients} clients, {workers} workers")
+    print(f"{'enqueue':>22} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint, _ in REQUESTS:
+        latencies = [seconds for path, status, seconds, _ in results if path == endpoint]
+        latency_row(endpoint.replace('/api/ai/', ''), latencies)
+    rejected = sum(1 for _, status, _, _ in results if status != 202)
+    
+    db.session.expire_all()
+    jobs = AIJob.query.filter(AIJob.id.in_(job_ids)).all()
+    print(f"\n{'job completion':>22} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for kind in ('chat', 'workout_plan', 'meal_plan', 'nutrition_analysis'):
+        durations = [(job.finished_at - job.created_at).total_seconds() for job in jobs
+                     if job.kind == kind and job.finished_at]
+        if durations:
+            latency_row(kind, durations)
+    
+    succeeded = sum(1 for job in jobs if job.status == 'succeeded')
+    print(f"\n{succeeded}/{len(jobs)} jobs succeeded, {rejected} requests rejected, "
+          f"{len(jobs) / elapsed:.1f} jobs/s")
+    if not drained:
+        print('❌ Queue did not drain')
+        sys.exit(1)
+
+def stream_ttfb(_):
+    """Seconds to the first SSE frame and to the end of the stream"""
+    started = time.perf_counter()
+    response = app.test_client().post('/api/ai/chat/stream', json={'message': 'Best post-workout snack?'},
+                                      buffered=False)
+    if response.status_code != 200:
+        response.close()
+        return None
+    frames = iter(response.response)
+    next(frames)
+    first = time.perf_counter() - started
+    for _ in frames:
+        pass
+    response.close()
+    return first, time.perf_counter() - started
+
+def run_stream_phase(streams):
+    with ThreadPoolExecutor(max_workers=streams) as pool:
+        results = list(pool.map(stream_ttfb, range(streams)))
+    served = [r for r in results if r]
+    print(f"\n{'chat stream':>22} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    if served:
+        latency_row('first byte', [r[0] for r in served])
+        latency_row('full reply', [r[1] for r in served])
+    print(f"{streams - len(served)} streams rejected")
+
+if __name__ == '__main__':
+    print(f"fake Gemini: {args.latency}, {args.token_ms}ms/chunk, {args.error_rate:.0%} errors\n")
+    with app.app_context():
+        run_queue_phase(args.requests, args.clients, args.workers)
+        run_stream_phase(args.streams)
@@ -0,0 +1,98 @@
+"""
+Shared seeding helpers for the FitAI benchmark scripts
+"""
+
+import os
+import sys
+import importlib.util
+import tempfile
+import uuid
+import random
+from datetime import datetime, timedelta
+
+# Point the app at a throwaway database before it is imported; the
+# benchmarks drop every table so never reuse the configured DATABASE_URL
+BENCH_DB_PATH = os.path.join(tempfile.gettempdir(), 'fitai_benchmark.db')
+os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL', f'sqlite:///{BENCH_DB_PATH}')
+
+# Import the Flask app from the backend directory
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(BACKEND_DIR)
+
+# backend/app.py and the backend/app/ package share a name, and a plain
+# import picks the module, so app.models would not resolve. Load app.py as
+# the 'app' package instead; the models' `from app import db` then finds it.
+if 'app' not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        'app', os.path.join(BACKEND_DIR, 'app.py'),
+        submodule_search_locations=[os.path.join(BACKEND_DIR, 'app')]
+    )
+    sys.modules['app'] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules['app'])
+
+from app import app, db
+from app.models.user import User
+from app.models.meal import Meal, NutritionLog
+
+def reset_database():
+    """Drop and recreate every table"""
+    db.drop_all()
+    db.create_all()
+
+def create_user(email='bench@example.com'):
+    """Create a benchmark user and return its ID"""
+    user = User(
+        id=str(uuid.uuid4()),
+        email=email,
+        password_hash='benchmark',
+        name='Benchmark User',
+        created_at=datetime.utcnow()
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+def create_meal(user_id):
+    """Create a catalog meal the seeded logs can point at"""
+    meal = Meal(
+        id=str(uuid.uuid4()),
+        name='Benchmark Meal',
+        type='lunch',
+        calories=500,
+        protein=30,
+        carbs=50,
+        fat=20,
+        prep_time=10,
+        cook_time=10,
+        created_by=user_id
+    )
+    db.session.add(meal)
+    db.session.commit()
+    return meal.id
+
+def seed_nutrition_logs(user_id, meal_id, day, rows_per_day):
+    """Insert rows_per_day nutrition logs spread across the given day"""
+    start = datetime.combine(day, datetime.min.time())
+    step = timedelta(days=1) / rows_per_day
+    now = datetime.utcnow()
+    rows = []
+    for i in range(rows_per_day):
+        rows.append({
+            'id': str(uuid.uuid4()),
+            'user_id': user_id,
+            'meal_id': meal_id,
+            'meal_name': 'Benchmark Meal',
+            'meal_type': random.choice(['breakfast', 'lunch', 'dinner', 'snack']),
+            'quantity': 1.0,
+            'unit': 'serving',
+            'calories': random.randint(50, 800),
+            'protein': random.randint(0, 60),
+            'carbs': random.randint(0, 100),
+            'fat': random.randint(0, 40),
+            'logged_at': start + step * i,
+            'notes': '',
+            'created_at': now,
+            'updated_at': now
+        })
+    db.session.execute(NutritionLog.__table__.insert(), rows)
+    db.session.commit()
@@ -0,0 +1,58 @@
+"""
+Database engine profiles for FitAI Backend
+"""
+
+import os
+from sqlalchemy import event
+
+# PRAGMAs applied to every new SQLite connection, per profile
+SQLITE_PROFILES = {
+    # Stock SQLite behaviour: rollback journal, FULL sync, no busy wait
+    'default': {},
+    # Concurrent serving: readers no longer block on writers
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,  # ms to wait on a locked database before failing
+        'mmap_size': 268435456,  # 256 MB of memory-mapped reads
+        'cache_size': -65536,  # negative means KiB, so 64 MB of page cache
+        'temp_store': 'MEMORY'
+    }
+}
+
+# Pool settings per profile; SQLite file databases use a QueuePool
+POOL_OPTIONS = {
+    'default': {},
+    'production': {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_pre_ping': True,
+        'connect_args': {'check_same_thread': False, 'timeout': 5}
+    }
+}
+
+def get_profile_name():
+    """Return the configured engine profile name"""
+    profile = os.getenv('DB_ENGINE_PROFILE', 'default')
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown DB_ENGINE_PROFILE '{profile}', expected one of {sorted(SQLITE_PROFILES)}")
+    return profile
+
+def get_engine_options(database_uri, profile):
+    """SQLALCHEMY_ENGINE_OPTIONS for the profile"""
+    if not database_uri.startswith('sqlite') or database_uri in ('sqlite://', 'sqlite:///:memory:'):
+        return {}
+    return dict(POOL_OPTIONS[profile])
+
+def configure_engine(engine, profile):
+    """Apply the profile's PRAGMAs on every pooled SQLite connection"""
+    pragmas = SQLITE_PROFILES[profile]
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
@@ -0,0 +1,36 @@
+"""add run_after and heartbeat_at to ai_jobs for retry backoff and worker leases
+
+Revision ID: 0d1e2f3a4b10
+Revises: 9c0d1e2f3a09
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0d1e2f3a4b10'
+down_revision = '9c0d1e2f3a09'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    # Tables created by db.create_all() already have the columns
+    existing = _columns('ai_jobs')
+    with op.batch_alter_table('ai_jobs') as batch_op:
+        if 'run_after' not in existing:
+            batch_op.add_column(sa.Column('run_after', sa.DateTime(), nullable=True))
+        if 'heartbeat_at' not in existing:
+            batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('ai_jobs') as batch_op:
+        batch_op.drop_column('heartbeat_at')
+        batch_op.drop_column('run_after')
@@ -0,0 +1,339 @@
+"""initial schema
+
+Revision ID: 0f1a2b3c4d00
+Revises: 
+Create Date: 2026-10-18 08:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0f1a2b3c4d00'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The tables as db.create_all() built them before migrations were added;
+    # databases created that way already have them
+    op.create_table(
+        'users',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password_hash', sa.String(length=128), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('profile_image_url', sa.String(length=500), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True, if_not_exists=True)
+    op.create_table(
+        'user_goals',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('fitness_goal', sa.String(length=50), nullable=False),
+        sa.Column('current_weight', sa.Float(), nullable=False),
+        sa.Column('target_weight', sa.Float(), nullable=False),
+        sa.Column('height', sa.Float(), nullable=False),
+        sa.Column('body_type', sa.String(length=50), nullable=False),
+        sa.Column('target_calories', sa.Integer(), nullable=False),
+        sa.Column('target_protein', sa.Integer(), nullable=False),
+        sa.Column('target_carbs', sa.Integer(), nullable=False),
+        sa.Column('target_fat', sa.Integer(), nullable=False),
+        sa.Column('activity_level', sa.String(length=50), nullable=False),
+        sa.Column('target_date', sa.Date(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'user_preferences',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('dietary_preferences', sa.Text(), nullable=True),
+        sa.Column('workout_types', sa.Text(), nullable=True),
+        sa.Column('available_equipment', sa.Text(), nullable=True),
+        sa.Column('workout_duration', sa.Integer(), nullable=True),
+        sa.Column('difficulty_level', sa.String(length=50), nullable=True),
+        sa.Column('allergies', sa.Text(), nullable=True),
+        sa.Column('notifications_enabled', sa.Boolean(), nullable=True),
+        sa.Column('language', sa.String(length=10), nullable=True),
+        sa.Column('theme', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'workouts',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('difficulty', sa.String(length=20), nullable=False),
+        sa.Column('body_parts', sa.Text(), nullable=True),
+        sa.Column('duration', sa.Integer(), nullable=False),
+        sa.Column('calories_burned', sa.Integer(), nullable=True),
+        sa.Column('image_url', sa.String(length=500), nullable=True),
+        sa.Column('video_url', sa.String(length=500), nullable=True),
+        sa.Column('is_custom', sa.Boolean(), nullable=True),
+        sa.Column('created_by', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'exercises',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('workout_id', sa.String(length=50), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('image_url', sa.String(length=500), nullable=True),
+        sa.Column('video_url', sa.String(length=500), nullable=True),
+        sa.Column('instructions', sa.Text(), nullable=True),
+        sa.Column('tips', sa.Text(), nullable=True),
+        sa.Column('muscles', sa.Text(), nullable=True),
+        sa.Column('equipment', sa.String(length=100), nullable=False),
+        sa.Column('exercise_type', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['workout_id'], ['workouts.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'workout_plans',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('days_data', sa.Text(), nullable=True),
+        sa.Column('total_weeks', sa.Integer(), nullable=False),
+        sa.Column('difficulty', sa.String(length=20), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'workout_sessions',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('workout_id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=True),
+        sa.Column('duration', sa.Integer(), nullable=True),
+        sa.Column('calories_burned', sa.Integer(), nullable=True),
+        sa.Column('sets_data', sa.Text(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['workout_id'], ['workouts.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'meals',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('image_url', sa.String(length=500), nullable=True),
+        sa.Column('calories', sa.Integer(), nullable=False),
+        sa.Column('protein', sa.Integer(), nullable=False),
+        sa.Column('carbs', sa.Integer(), nullable=False),
+        sa.Column('fat', sa.Integer(), nullable=False),
+        sa.Column('fiber', sa.Integer(), nullable=True),
+        sa.Column('sugar', sa.Integer(), nullable=True),
+        sa.Column('sodium', sa.Integer(), nullable=True),
+        sa.Column('ingredients', sa.Text(), nullable=True),
+        sa.Column('instructions', sa.Text(), nullable=True),
+        sa.Column('prep_time', sa.Integer(), nullable=False),
+        sa.Column('cook_time', sa.Integer(), nullable=False),
+        sa.Column('servings', sa.Integer(), nullable=True),
+        sa.Column('dietary_tags', sa.Text(), nullable=True),
+        sa.Column('allergens', sa.Text(), nullable=True),
+        sa.Column('is_custom', sa.Boolean(), nullable=True),
+        sa.Column('created_by', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'meal_plans',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('days_data', sa.Text(), nullable=True),
+        sa.Column('total_days', sa.Integer(), nullable=False),
+        sa.Column('target_calories', sa.Integer(), nullable=False),
+        sa.Column('dietary_preference', sa.String(length=50), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'nutrition_logs',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('meal_id', sa.String(length=50), nullable=False),
+        sa.Column('meal_name', sa.String(length=200), nullable=False),
+        sa.Column('meal_type', sa.String(length=50), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('unit', sa.String(length=20), nullable=False),
+        sa.Column('calories', sa.Integer(), nullable=False),
+        sa.Column('protein', sa.Integer(), nullable=False),
+        sa.Column('carbs', sa.Integer(), nullable=False),
+        sa.Column('fat', sa.Integer(), nullable=False),
+        sa.Column('logged_at', sa.DateTime(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['meal_id'], ['meals.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'progress',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=True),
+        sa.Column('body_fat', sa.Float(), nullable=True),
+        sa.Column('muscle_mass', sa.Float(), nullable=True),
+        sa.Column('water_percentage', sa.Float(), nullable=True),
+        sa.Column('bone_density', sa.Float(), nullable=True),
+        sa.Column('calories_burned', sa.Integer(), nullable=True),
+        sa.Column('steps', sa.Integer(), nullable=True),
+        sa.Column('distance', sa.Float(), nullable=True),
+        sa.Column('active_minutes', sa.Integer(), nullable=True),
+        sa.Column('heart_rate', sa.Integer(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('images', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'weight_progress',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.Column('body_fat', sa.Float(), nullable=True),
+        sa.Column('muscle_mass', sa.Float(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'bmi_progress',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.Column('height', sa.Float(), nullable=False),
+        sa.Column('bmi', sa.Float(), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'calorie_progress',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('calories_consumed', sa.Integer(), nullable=False),
+        sa.Column('calories_burned', sa.Integer(), nullable=False),
+        sa.Column('target_calories', sa.Integer(), nullable=False),
+        sa.Column('net_calories', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'workout_progress',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('workouts_completed', sa.Integer(), nullable=False),
+        sa.Column('total_workouts', sa.Integer(), nullable=False),
+        sa.Column('total_duration', sa.Integer(), nullable=False),
+        sa.Column('total_calories_burned', sa.Integer(), nullable=False),
+        sa.Column('workout_types', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'goals',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('target_value', sa.Float(), nullable=False),
+        sa.Column('current_value', sa.Float(), nullable=False),
+        sa.Column('unit', sa.String(length=20), nullable=False),
+        sa.Column('target_date', sa.Date(), nullable=False),
+        sa.Column('is_completed', sa.Boolean(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('goals')
+    op.drop_table('workout_progress')
+    op.drop_table('calorie_progress')
+    op.drop_table('bmi_progress')
+    op.drop_table('weight_progress')
+    op.drop_table('progress')
+    op.drop_table('nutrition_logs')
+    op.drop_table('meal_plans')
+    op.drop_table('meals')
+    op.drop_table('workout_sessions')
+    op.drop_table('workout_plans')
+    op.drop_table('exercises')
+    op.drop_table('workouts')
+    op.drop_table('user_preferences')
+    op.drop_table('user_goals')
+    op.drop_index('ix_users_email', table_name='users', if_exists=True)
+    op.drop_table('users')
@@ -0,0 +1,45 @@
+"""add composite user/time indexes for per-user list queries
+
+Revision ID: 1a2b3c4d5e01
+Revises: 0f1a2b3c4d00
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1a2b3c4d5e01'
+down_revision = '0f1a2b3c4d00'
+branch_labels = None
+depends_on = None
+
+# (table, time column) pairs filtered by user_id and ordered by the time column
+USER_TIME_INDEXES = [
+    ('nutrition_logs', 'logged_at'),
+    ('meal_plans', 'created_at'),
+    ('workout_plans', 'created_at'),
+    ('workout_sessions', 'created_at'),
+    ('progress', 'date'),
+    ('weight_progress', 'date'),
+    ('bmi_progress', 'date'),
+    ('calorie_progress', 'date'),
+]
+
+
+def upgrade():
+    # Tables may already carry the indexes when created by db.create_all()
+    for table, column in USER_TIME_INDEXES:
+        op.create_index(
+            f'ix_{table}_user_id_{column}',
+            table,
+            ['user_id', column],
+            unique=False,
+            if_not_exists=True
+        )
+
+
+def downgrade():
+    for table, column in reversed(USER_TIME_INDEXES):
+        op.drop_index(f'ix_{table}_user_id_{column}', table_name=table, if_exists=True)
@@ -0,0 +1,48 @@
+"""extend list indexes with id for keyset pagination
+
+Revision ID: 2b3c4d5e6f02
+Revises: 1a2b3c4d5e01
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b3c4d5e6f02'
+down_revision = '1a2b3c4d5e01'
+branch_labels = None
+depends_on = None
+
+# Cursor pages order by (time column, id), so the index carries id as well
+KEYSET_INDEXES = [
+    ('nutrition_logs', 'logged_at'),
+    ('meal_plans', 'created_at'),
+    ('workout_plans', 'created_at'),
+    ('workout_sessions', 'created_at'),
+]
+
+
+def upgrade():
+    for table, column in KEYSET_INDEXES:
+        op.create_index(
+            f'ix_{table}_user_id_{column}_id',
+            table,
+            ['user_id', column, 'id'],
+            unique=False,
+            if_not_exists=True
+        )
+        op.drop_index(f'ix_{table}_user_id_{column}', table_name=table, if_exists=True)
+
+
+def downgrade():
+    for table, column in reversed(KEYSET_INDEXES):
+        op.create_index(
+            f'ix_{table}_user_id_{column}',
+            table,
+            ['user_id', column],
+            unique=False,
+            if_not_exists=True
+        )
+        op.drop_index(f'ix_{table}_user_id_{column}_id', table_name=table, if_exists=True)
@@ -0,0 +1,59 @@
+"""add workout_days table and plan columns on meals
+
+Revision ID: 3c4d5e6f7a03
+Revises: 2b3c4d5e6f02
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c4d5e6f7a03'
+down_revision = '2b3c4d5e6f02'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    op.create_table(
+        'workout_days',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('plan_id', sa.String(length=50), nullable=False),
+        sa.Column('day_number', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('is_rest_day', sa.Boolean(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['plan_id'], ['workout_plans.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index('ix_workout_days_plan_id_day_number', 'workout_days',
+                    ['plan_id', 'day_number'], unique=False, if_not_exists=True)
+    
+    existing = _columns('meals')
+    with op.batch_alter_table('meals') as batch_op:
+        if 'plan_id' not in existing:
+            batch_op.add_column(sa.Column('plan_id', sa.String(length=50), nullable=True))
+            batch_op.create_foreign_key('fk_meals_plan_id_meal_plans', 'meal_plans', ['plan_id'], ['id'])
+        if 'day_number' not in existing:
+            batch_op.add_column(sa.Column('day_number', sa.Integer(), nullable=True))
+    op.create_index('ix_meals_plan_id_day_number', 'meals',
+                    ['plan_id', 'day_number'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_meals_plan_id_day_number', table_name='meals', if_exists=True)
+    with op.batch_alter_table('meals') as batch_op:
+        batch_op.drop_constraint('fk_meals_plan_id_meal_plans', type_='foreignkey')
+        batch_op.drop_column('day_number')
+        batch_op.drop_column('plan_id')
+    op.drop_index('ix_workout_days_plan_id_day_number', table_name='workout_days', if_exists=True)
+    op.drop_table('workout_days')
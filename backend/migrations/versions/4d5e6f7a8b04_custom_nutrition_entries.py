@@ -0,0 +1,26 @@
+"""allow nutrition logs without a catalog meal
+
+Revision ID: 4d5e6f7a8b04
+Revises: 3c4d5e6f7a03
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d5e6f7a8b04'
+down_revision = '3c4d5e6f7a03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('nutrition_logs') as batch_op:
+        batch_op.alter_column('meal_id', existing_type=sa.String(length=50), nullable=True)
+
+
+def downgrade():
+    with op.batch_alter_table('nutrition_logs') as batch_op:
+        batch_op.alter_column('meal_id', existing_type=sa.String(length=50), nullable=False)
@@ -0,0 +1,69 @@
+"""re-key append-heavy tables with time-ordered ULIDs
+
+Revision ID: 5e6f7a8b9c05
+Revises: 4d5e6f7a8b04
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime, timezone
+import os
+
+
+# revision identifiers, used by Alembic.
+revision = '5e6f7a8b9c05'
+down_revision = '4d5e6f7a8b04'
+branch_labels = None
+depends_on = None
+
+# Tables whose primary keys are not referenced by any foreign key, so
+# existing rows can be re-keyed in place. Referenced tables (users,
+# meals, plans, ...) keep their UUIDs and receive ULIDs for new rows.
+REKEY_TABLES = [
+    'nutrition_logs',
+    'workout_sessions',
+    'weight_progress',
+    'bmi_progress',
+    'calorie_progress',
+]
+
+BATCH_SIZE = 1000
+
+_CROCKFORD = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+
+def _ulid(created_at):
+    # Self-contained copy of app.utils.ids.ulid so the migration never
+    # changes behaviour when application code does
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    if created_at is None:
+        created_at = datetime.utcnow()
+    millis = int(created_at.replace(tzinfo=timezone.utc).timestamp() * 1000)
+    value = (millis << 80) | int.from_bytes(os.urandom(10), 'big')
+    chars = []
+    for _ in range(26):
+        chars.append(_CROCKFORD[value & 0x1F])
+        value >>= 5
+    return ''.join(reversed(chars))
+
+
+def upgrade():
+    bind = op.get_bind()
+    for table in REKEY_TABLES:
+        # 36 character hyphenated values are legacy UUID4 keys
+        rows = bind.execute(sa.text(
+            f'SELECT id, created_at FROM {table} WHERE length(id) = 36 ORDER BY created_at'
+        )).fetchall()
+        updates = [{'old_id': row.id, 'new_id': _ulid(row.created_at)} for row in rows]
+        for start in range(0, len(updates), BATCH_SIZE):
+            bind.execute(
+                sa.text(f'UPDATE {table} SET id = :new_id WHERE id = :old_id'),
+                updates[start:start + BATCH_SIZE]
+            )
+
+
+def downgrade():
+    # ULIDs remain valid String(50) keys, so there is nothing to undo
+    pass
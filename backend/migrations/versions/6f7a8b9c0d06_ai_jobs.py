@@ -0,0 +1,49 @@
+"""add ai_jobs table for queued AI calls
+
+Revision ID: 6f7a8b9c0d06
+Revises: 5e6f7a8b9c05
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f7a8b9c0d06'
+down_revision = '5e6f7a8b9c05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ai_jobs',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', sa.String(length=50), nullable=True),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('worker_id', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index('ix_ai_jobs_status_priority_created_at', 'ai_jobs',
+                    ['status', 'priority', 'created_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_ai_jobs_user_id_created_at', 'ai_jobs',
+                    ['user_id', 'created_at'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_ai_jobs_user_id_created_at', table_name='ai_jobs', if_exists=True)
+    op.drop_index('ix_ai_jobs_status_priority_created_at', table_name='ai_jobs', if_exists=True)
+    op.drop_table('ai_jobs')
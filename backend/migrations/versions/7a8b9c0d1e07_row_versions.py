@@ -0,0 +1,37 @@
+"""add row versions used for ETags
+
+Revision ID: 7a8b9c0d1e07
+Revises: 6f7a8b9c0d06
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a8b9c0d1e07'
+down_revision = '6f7a8b9c0d06'
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ['users', 'user_goals', 'user_preferences', 'workout_plans', 'meal_plans']
+
+
+def _columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    # Tables created by db.create_all() already have the column
+    for table in VERSIONED_TABLES:
+        if 'version' in _columns(table):
+            continue
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    for table in reversed(VERSIONED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
@@ -0,0 +1,47 @@
+"""store tag, allergen, muscle and body part lists as native JSON
+
+Also indexes exercises.workout_id for the library's muscle filter.
+
+Revision ID: 8b9c0d1e2f08
+Revises: 7a8b9c0d1e07
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b9c0d1e2f08'
+down_revision = '7a8b9c0d1e07'
+branch_labels = None
+depends_on = None
+
+JSON_LIST_COLUMNS = {
+    'meals': ['dietary_tags', 'allergens'],
+    'exercises': ['muscles'],
+    'workouts': ['body_parts'],
+}
+
+
+def upgrade():
+    for table, columns in JSON_LIST_COLUMNS.items():
+        for column in columns:
+            # The old getters read '' as an empty list; it is not valid JSON
+            op.execute(f"UPDATE {table} SET {column} = NULL WHERE {column} = ''")
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column, existing_type=sa.Text(), type_=sa.JSON(), postgresql_using=f'{column}::json'
+                )
+    op.create_index('ix_exercises_workout_id', 'exercises', ['workout_id'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_exercises_workout_id', table_name='exercises', if_exists=True)
+    for table, columns in JSON_LIST_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column, existing_type=sa.JSON(), type_=sa.Text(), postgresql_using=f'{column}::text'
+                )
@@ -0,0 +1,54 @@
+"""add daily_nutrition_rollups table and backfill it from nutrition_logs
+
+Revision ID: 9c0d1e2f3a09
+Revises: 8b9c0d1e2f08
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c0d1e2f3a09'
+down_revision = '8b9c0d1e2f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'daily_nutrition_rollups',
+        sa.Column('user_id', sa.String(length=50), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('calories', sa.Float(), nullable=False),
+        sa.Column('protein', sa.Float(), nullable=False),
+        sa.Column('carbs', sa.Float(), nullable=False),
+        sa.Column('fat', sa.Float(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'date'),
+        if_not_exists=True
+    )
+    
+    # Same aggregate as rollup_nutrition.py --rebuild; a table made by
+    # db.create_all() may already hold rows, so rebuild it from scratch
+    op.execute("DELETE FROM daily_nutrition_rollups")
+    op.execute(
+        """
+        INSERT INTO daily_nutrition_rollups
+            (user_id, date, calories, protein, carbs, fat, entry_count, updated_at)
+        SELECT user_id, date(logged_at),
+               coalesce(sum(calories), 0), coalesce(sum(protein), 0),
+               coalesce(sum(carbs), 0), coalesce(sum(fat), 0),
+               count(id), CURRENT_TIMESTAMP
+        FROM nutrition_logs
+        WHERE logged_at IS NOT NULL
+        GROUP BY user_id, date(logged_at)
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('daily_nutrition_rollups')
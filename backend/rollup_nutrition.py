@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Daily nutrition rollup maintenance for FitAI Backend
+"""
+
+import os
+import sys
+import importlib.util
+
+# Add the current directory to Python path
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BACKEND_DIR)
+
+# backend/app.py and the backend/app/ package share a name, and a plain
+# import picks the module, so app.services would not resolve. Load app.py
+# as the 'app' package, as benchmarks/seed_data.py does.
+if 'app' not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        'app', os.path.join(BACKEND_DIR, 'app.py'),
+        submodule_search_locations=[os.path.join(BACKEND_DIR, 'app')]
+    )
+    sys.modules['app'] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(sys.modules['app'])
+
+from app import app, db
+from app.services.nutrition_rollup import rebuild_rollups, find_drift
+
+def rebuild(user_id=None):
+    """Recompute the rollup table from the nutrition log"""
+    print("🔄 Rebuilding daily nutrition rollups...")
+    with app.app_context():
+        db.create_all()
+        count = rebuild_rollups(user_id)
+    print(f"✅ Rebuilt {count} rollup rows")
+
+def check(user_id=None):
+    """Report rollup rows that no longer match the nutrition log"""
+    print("🔍 Checking daily nutrition rollups for drift...")
+    with app.app_context():
+        drift = find_drift(user_id)
+    
+    if not drift:
+        print("✅ Rollups match the nutrition log")
+        return True
+    
+    print(f"⚠️  Found {len(drift)} mismatched values:")
+    for item in drift:
+        print(f"   📊 {item['user_id']} {item['date']} {item['field']}: "
+              f"log={item['log_value']} rollup={item['rollup_value']}")
+    return False
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='FitAI Daily Nutrition Rollups')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild rollups from the nutrition log')
+    parser.add_argument('--check', action='store_true', help='Check rollups for drift')
+    parser.add_argument('--user', help='Limit to a single user ID')
+    
+    args = parser.parse_args()
+    
+    if args.rebuild:
+        rebuild(args.user)
+    
+    if args.check or not args.rebuild:
+        if not check(args.user):
+            sys.exit(1)